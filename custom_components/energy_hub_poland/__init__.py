@@ -4,11 +4,20 @@ from typing import Any
 
 import homeassistant.helpers.config_validation as cv
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
-
-from .const import DOMAIN
-from .coordinator import EnergyHubDataCoordinator
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE, Platform
+from homeassistant.core import HomeAssistant, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_MARKET_COORDINATOR, DOMAIN
+from .coordinator import (
+    EnergyHubEntryCoordinator,
+    async_get_market_coordinator,
+    entry_journal_path,
+)
+from .journal import CostJournal
+from .storage import EntryLedgerStore
+from .windows import WINDOW_CHEAPEST, WINDOW_KINDS, window_response
 
 _LOGGER = logging.getLogger(__package__)
 PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BINARY_SENSOR]
@@ -81,10 +90,17 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 _LOGGER.info("Migrating unique ID from %s to %s", old_uid, new_uid)
                 registry.async_update_entity(entity.entity_id, new_unique_id=new_uid)
 
-    coordinator = EnergyHubDataCoordinator(hass)
-    # Load cache immediately to avoid setup timeouts and provide data to sensors fast
-    await coordinator._load_cache()
-    await coordinator.async_config_entry_first_refresh()
+    # Market data is shared by all entries; only costs live per entry
+    market = await async_get_market_coordinator(hass)
+    coordinator = EnergyHubEntryCoordinator(hass, entry, market)
+    await coordinator.async_load_ledger()
+    coordinator.async_attach()
+    await coordinator.async_load_journal()
+    entry.async_on_unload(
+        hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_FINAL_WRITE, coordinator.async_handle_final_write
+        )
+    )
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
 
@@ -98,7 +114,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if entry_id == entry.entry_id:
             coordinator = hass.data[DOMAIN][entry.entry_id]
             _LOGGER.debug("Forcing price update via service call")
-            await coordinator.async_request_refresh()
+            await coordinator.market.async_request_refresh()
 
     async def handle_export_profile(call: Any) -> None:
         """Handle the service call to export a tariff profile."""
@@ -206,6 +222,21 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             )
             await hass.config_entries.async_reload(entry.entry_id)
 
+    async def handle_find_price_window(call: Any) -> dict[str, Any]:
+        """Handle the service call to find the cheapest or most expensive window."""
+        entry_id = call.data.get("entry_id", entry.entry_id)
+        coordinator = hass.data[DOMAIN].get(entry_id)
+        if coordinator is None:
+            raise HomeAssistantError(f"Unknown Energy Hub entry: {entry_id}")
+
+        hours = float(call.data.get("hours", 1))
+        kind = call.data.get("kind", WINDOW_CHEAPEST)
+        if kind not in WINDOW_KINDS or not 0 < hours <= 24:
+            raise HomeAssistantError(f"Invalid price window: {hours} h, {kind}")
+
+        window = coordinator.price_windows.find(hours, kind, dt_util.utcnow())
+        return {"hours": hours, "kind": kind, **window_response(window)}
+
     hass.services.async_register(
         DOMAIN, "update_prices", handle_update_prices, supports_response=False
     )
@@ -215,13 +246,37 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.services.async_register(
         DOMAIN, "import_tariff_profile", handle_import_profile, supports_response=False
     )
+    hass.services.async_register(
+        DOMAIN,
+        "find_price_window",
+        handle_find_price_window,
+        supports_response=SupportsResponse.ONLY,
+    )
 
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if not await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        return False
+
+    coordinator: EnergyHubEntryCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+    await coordinator.async_detach()
+
+    # Stop polling once the last entry using the shared market data is gone
+    market = coordinator.market
+    if not market.has_entries:
+        hass.data.pop(DATA_MARKET_COORDINATOR, None)
+        await market.async_shutdown()
+    return True
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the cost ledger and journal of a removed config entry."""
+    await EntryLedgerStore(hass, entry.entry_id).async_remove()
+    journal = CostJournal(entry_journal_path(hass, entry.entry_id))
+    await hass.async_add_executor_job(journal.remove)
 
 
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
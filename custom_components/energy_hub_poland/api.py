@@ -1,16 +1,208 @@
 """API client for Energy Hub Poland."""
 
 import asyncio
+import hashlib
+import json
 import logging
+import random
+import time
+from collections.abc import Hashable
 from datetime import date
 from typing import Any
 
 import async_timeout
 
-from .const import API_URL, PSE_API_URL
+from .const import (
+    API_URL,
+    BREAKER_BASE_COOLDOWN_SECONDS,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_COOLDOWN_SECONDS,
+    PSE_API_URL,
+    PSE_RESPONSE_CACHE_TTL_SECONDS,
+    RETRY_ATTEMPTS,
+    RETRY_BASE_DELAY_SECONDS,
+    RETRY_MAX_DELAY_SECONDS,
+)
 
 _LOGGER = logging.getLogger(__package__)
 
+# How many distinct queries keep their validators (a few per day and endpoint;
+# an incremental series only ever holds the one for its current filter)
+MAX_CONDITIONAL_ENTRIES = 32
+
+# Upper bound for rows returned by one incremental query (100 quarter-hours
+# on the longest day of the year)
+INCREMENTAL_PAGE_SIZE = 100
+
+# How often an incremental day series is fetched again in full, so revised
+# rows that did not get a newer dtime are picked up as well
+SERIES_FULL_REFETCH_SECONDS = 3600
+
+# (endpoint, $select, $filter, extra query options such as $orderby/$top)
+QueryKey = tuple[str, str, str, tuple[tuple[str, str], ...]]
+
+
+class ConditionalRequests:
+    """
+    Remember HTTP validators per query and detect unchanged payloads.
+    Sends If-None-Match / If-Modified-Since when validators are known. A 304,
+    or a body whose hash matches the previous one when the upstream ignores
+    validators, returns the previously decoded payload object itself, so
+    callers can skip re-processing with a simple identity check.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the validator store."""
+        self._entries: dict[Hashable, dict[str, Any]] = {}
+        self.stats: dict[str, int] = {"not_modified": 0, "unchanged_body": 0}
+
+    def headers(self, key: Hashable) -> dict[str, str]:
+        """Return conditional request headers for a query."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return {}
+        headers: dict[str, str] = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    async def async_read(self, key: Hashable, response: Any) -> Any:
+        """Decode a response, reusing the previous payload when unchanged."""
+        entry = self._entries.get(key)
+        if response.status == 304 and entry is not None:
+            self.stats["not_modified"] += 1
+            self._touch(key, entry)
+            return entry["payload"]
+
+        response.raise_for_status()
+        body = await response.read()
+        digest = hashlib.sha256(body).digest()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+
+        if entry is not None and entry["digest"] == digest:
+            self.stats["unchanged_body"] += 1
+            entry["etag"] = etag
+            entry["last_modified"] = last_modified
+            self._touch(key, entry)
+            return entry["payload"]
+
+        payload = json.loads(body)
+        self._touch(
+            key,
+            {
+                "etag": etag,
+                "last_modified": last_modified,
+                "digest": digest,
+                "payload": payload,
+            },
+        )
+        return payload
+
+    def discard(self, key: Hashable) -> None:
+        """Forget the validators of a query that will not be sent again."""
+        self._entries.pop(key, None)
+
+    def _touch(self, key: Hashable, entry: dict[str, Any]) -> None:
+        """Store an entry as most recently used, evicting the oldest ones."""
+        self._entries.pop(key, None)
+        self._entries[key] = entry
+        while len(self._entries) > MAX_CONDITIONAL_ENTRIES:
+            del self._entries[next(iter(self._entries))]
+
+
+def retry_delay(attempt: int) -> float:
+    """Return a full-jitter exponential backoff delay for a retry attempt."""
+    cap = min(RETRY_MAX_DELAY_SECONDS, RETRY_BASE_DELAY_SECONDS * 2**attempt)
+    return random.uniform(0, cap)
+
+
+class CircuitBreaker:
+    """
+    Track the health of a single API endpoint.
+    Closed: requests pass and consecutive failures are counted. Open: after
+    too many failures requests are short-circuited until a cool-down expires.
+    Half-open: one trial request decides whether to close again or re-open
+    with a longer (exponential, jittered) cool-down.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str) -> None:
+        """Initialize a closed breaker."""
+        self.name = name
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.short_circuited = 0
+        self._retry_at = 0.0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        """Return whether a request may be sent now."""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() >= self._retry_at:
+            _LOGGER.debug("Circuit for %s is half-open, sending a trial", self.name)
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        self.short_circuited += 1
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        if self.state != self.CLOSED:
+            _LOGGER.info("Circuit for %s closed, endpoint recovered", self.name)
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._trial_in_flight = False
+
+    def release(self) -> None:
+        """Free the trial of a request that ended without a result (cancelled)."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failed request and open the circuit when needed."""
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= BREAKER_FAILURE_THRESHOLD:
+            self.trips += 1
+            cooldown = min(
+                BREAKER_MAX_COOLDOWN_SECONDS,
+                BREAKER_BASE_COOLDOWN_SECONDS * 2 ** (self.trips - 1),
+            )
+            cooldown = random.uniform(cooldown / 2, cooldown)
+            self._retry_at = time.monotonic() + cooldown
+            if self.state != self.OPEN:
+                _LOGGER.warning(
+                    "Circuit for %s opened after %d failures, retrying in %.0f s",
+                    self.name,
+                    self.failures,
+                    cooldown,
+                )
+            self.state = self.OPEN
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "short_circuited": self.short_circuited,
+            "retry_in": (
+                max(0.0, round(self._retry_at - time.monotonic(), 1))
+                if self.state == self.OPEN
+                else None
+            ),
+        }
+
 
 class PSEApiClient:
     """API client from PSE."""
@@ -23,26 +215,160 @@ class PSEApiClient:
             "User-Agent": "HomeAssistant-EnergyHub-Client",
         }
         self._last_response_schema: str | None = None
+        # Responses keyed by query -> (fetched_at, rows)
+        self._response_cache: dict[QueryKey, tuple[float, list[dict[str, Any]]]] = {}
+        self._inflight: dict[QueryKey, asyncio.Future] = {}
+        # Incrementally grown day series per endpoint ->
+        # (business date, rows, monotonic time of the last full fetch)
+        self._series: dict[str, tuple[date, list[dict[str, Any]], float]] = {}
+        # Query last sent per series; older filters are dropped from the
+        # validator store so they cannot evict the stable daily queries
+        self._series_keys: dict[str, QueryKey] = {}
+        self._conditional = ConditionalRequests()
+        self.cache_stats: dict[str, int] = {"hits": 0, "misses": 0, "coalesced": 0}
+        self.breakers: dict[str, CircuitBreaker] = {}
+
+    @property
+    def conditional_stats(self) -> dict[str, int]:
+        """Return how often PSE reported a payload as unchanged."""
+        return self._conditional.stats
+
+    def _breaker(self, endpoint: str) -> CircuitBreaker:
+        """Return the circuit breaker of an endpoint."""
+        breaker = self.breakers.get(endpoint)
+        if breaker is None:
+            breaker = self.breakers[endpoint] = CircuitBreaker(endpoint)
+        return breaker
 
     async def _async_get_data(
         self, endpoint: str, select_fields: str, for_date: date
     ) -> list[dict[str, Any]] | None:
-        """Fetch generic data from PSE API with retry logic."""
+        """
+        Fetch generic data from PSE API, served from a short-lived cache.
+        Identical queries within the cache TTL are answered from memory and
+        concurrent callers share a single in-flight request. Unchanged
+        payloads come back as the very same list object as before.
+        """
         date_str = for_date.strftime("%Y-%m-%d")
-        url = f"{PSE_API_URL}/{endpoint}"
-        params = {
-            "$select": select_fields,
-            "$filter": f"business_date ge '{date_str}'",
+        return await self._async_query(
+            (endpoint, select_fields, f"business_date ge '{date_str}'", ()),
+            date_str,
+        )
+
+    async def _async_get_series(
+        self, endpoint: str, select_fields: str, for_date: date
+    ) -> list[dict[str, Any]] | None:
+        """
+        Fetch a quarter-hour day series incrementally.
+        Only rows newer than the last seen dtime are requested and appended to
+        an in-memory series for the business date, so payload size and parse
+        time stay constant through the day. The series restarts at midnight.
+        This assumes PSE publishes a revised row with a newer dtime; since
+        nothing guarantees that, the whole day is fetched again (and replaces
+        the series) every SERIES_FULL_REFETCH_SECONDS.
+        """
+        date_str = for_date.strftime("%Y-%m-%d")
+        now = time.monotonic()
+        day, rows, full_at = self._series.get(endpoint, (for_date, [], None))
+        if day != for_date:
+            rows, full_at = [], None
+        full = full_at is None or now - full_at >= SERIES_FULL_REFETCH_SECONDS
+
+        filter_str = f"business_date eq '{date_str}'"
+        if rows and not full:
+            filter_str += f" and dtime gt '{rows[-1]['dtime']}'"
+        key: QueryKey = (
+            endpoint,
+            select_fields,
+            filter_str,
+            (("$orderby", "dtime asc"), ("$top", str(INCREMENTAL_PAGE_SIZE))),
+        )
+        previous = self._series_keys.get(endpoint)
+        if previous is not None and previous != key:
+            self._conditional.discard(previous)
+        self._series_keys[endpoint] = key
+
+        new_rows = await self._async_query(key, date_str)
+        if new_rows is None:
+            return None
+
+        if full:
+            # Keep the previous list when nothing was revised
+            if new_rows != rows:
+                rows = list(new_rows)
+            self._series[endpoint] = (for_date, rows, now)
+            return rows
+
+        last_dtime = rows[-1]["dtime"] if rows else ""
+        appended = [row for row in new_rows if row.get("dtime", "") > last_dtime]
+        if appended:
+            rows = rows + appended
+            self._series[endpoint] = (for_date, rows, full_at)
+        return rows
+
+    async def _async_query(
+        self, key: QueryKey, date_str: str
+    ) -> list[dict[str, Any]] | None:
+        """Run a PSE query through the response cache and single-flight."""
+        cached = self._response_cache.get(key)
+        if cached and time.monotonic() - cached[0] < PSE_RESPONSE_CACHE_TTL_SECONDS:
+            self.cache_stats["hits"] += 1
+            return cached[1]
+
+        if (inflight := self._inflight.get(key)) is not None:
+            self.cache_stats["coalesced"] += 1
+            return await asyncio.shield(inflight)
+
+        self.cache_stats["misses"] += 1
+        task = asyncio.ensure_future(self._async_fetch(key, date_str))
+        self._inflight[key] = task
+
+        def _store_result(done: asyncio.Future) -> None:
+            self._inflight.pop(key, None)
+            if done.cancelled() or done.exception() is not None:
+                return
+            if (result := done.result()) is not None:
+                self._store_response(key, result)
+
+        task.add_done_callback(_store_result)
+        # Shield the shared request so one caller giving up does not cancel it
+        # for the others; a late result still lands in the cache.
+        return await asyncio.shield(task)
+
+    def _store_response(self, key: QueryKey, result: list[dict[str, Any]]) -> None:
+        """Cache a response and drop entries that have already expired."""
+        now = time.monotonic()
+        self._response_cache = {
+            k: v
+            for k, v in self._response_cache.items()
+            if now - v[0] < PSE_RESPONSE_CACHE_TTL_SECONDS
         }
+        self._response_cache[key] = (now, result)
+
+    async def _async_fetch(
+        self, key: QueryKey, date_str: str
+    ) -> list[dict[str, Any]] | None:
+        """Fetch a single query from PSE API with retries and a circuit breaker."""
+        endpoint, select_fields, filter_str, extra_params = key
+        breaker = self._breaker(endpoint)
+        if not breaker.allow():
+            _LOGGER.debug("Circuit for %s is open, skipping request", endpoint)
+            return None
 
-        for attempt in range(3):  # Retry up to 3 times
+        url = f"{PSE_API_URL}/{endpoint}"
+        params = {"$select": select_fields, "$filter": filter_str, **dict(extra_params)}
+        # A half-open breaker gets a single trial instead of a retry burst
+        attempts = RETRY_ATTEMPTS if breaker.state == CircuitBreaker.CLOSED else 1
+
+        for attempt in range(attempts):
             try:
                 async with async_timeout.timeout(15):
                     response = await self._session.get(
-                        url, params=params, headers=self._headers
+                        url,
+                        params=params,
+                        headers={**self._headers, **self._conditional.headers(key)},
                     )
-                    response.raise_for_status()
-                    data = await response.json()
+                    data = await self._conditional.async_read(key, response)
                     result = data.get("value", [])
 
                     # API behavior monitoring
@@ -56,9 +382,10 @@ class PSEApiClient:
                             )
                             self._last_response_schema = current_schema
 
+                    breaker.record_success()
                     return result
             except Exception as e:
-                if attempt < 2:  # Don't log on last attempt
+                if attempt < attempts - 1:  # Don't log on last attempt
                     _LOGGER.warning(
                         "Attempt %d failed for %s on %s: %s. Retrying...",
                         attempt + 1,
@@ -66,15 +393,17 @@ class PSEApiClient:
                         date_str,
                         e,
                     )
-                    await asyncio.sleep(1)  # Wait 1 second before retry
+                    await asyncio.sleep(retry_delay(attempt))
                 else:
                     _LOGGER.error(
-                        "Error fetching %s from PSE for %s after 3 attempts: %s",
+                        "Error fetching %s from PSE for %s after %d attempts: %s",
                         endpoint,
                         date_str,
+                        attempts,
                         e,
                     )
-                    return None
+        breaker.record_failure()
+        return None
 
     def _get_schema(self, record: dict[str, Any]) -> str:
         """Get a string representation of the record schema."""
@@ -99,14 +428,14 @@ class PSEApiClient:
         )
 
     async def get_load_data(self, for_date: date) -> list[dict[str, Any]] | None:
-        """Fetch KSE load data."""
-        return await self._async_get_data(
+        """Fetch KSE load data (incremental day series)."""
+        return await self._async_get_series(
             "kse-load", "business_date,dtime,load_actual,load_fcst", for_date
         )
 
     async def get_generation_plans(self, for_date: date) -> list[dict[str, Any]] | None:
-        """Fetch PV and Wind generation plans."""
-        return await self._async_get_data(
+        """Fetch PV and Wind generation plans (incremental day series)."""
+        return await self._async_get_series(
             "pdgobpkd", "business_date,dtime,gen_wi,gen_fv,kse_pow_dem", for_date
         )
 
@@ -117,10 +446,18 @@ class EnergyHubApiClient:
     def __init__(self, session: Any) -> None:
         """Initialize the API client with an aiohttp session."""
         self._session = session
+        self._conditional = ConditionalRequests()
+        self.breaker = CircuitBreaker("pge")
+
+    @property
+    def conditional_stats(self) -> dict[str, int]:
+        """Return how often PGE reported a payload as unchanged."""
+        return self._conditional.stats
 
     async def async_get_prices(self, for_date: date) -> list[dict[str, Any]] | None:
         """
         Fetch energy prices for a specific date.
+        An unchanged payload is returned as the same list object as before.
 
         Note: The API usually returns prices for 'today' when queried with 'yesterday' date
         due to how TGE Fixings are published.
@@ -132,14 +469,28 @@ class EnergyHubApiClient:
             f"&date_to={date_str} 23:59:59&limit=100"
         )
 
+        if not self.breaker.allow():
+            _LOGGER.debug("Circuit for PGE is open, skipping %s", date_str)
+            return None
+
         try:
             async with async_timeout.timeout(20):
                 response = await self._session.get(
                     url,
-                    headers={"User-Agent": "HomeAssistant/EnergyHubPoland"},
+                    headers={
+                        "User-Agent": "HomeAssistant/EnergyHubPoland",
+                        **self._conditional.headers(url),
+                    },
                 )
-                response.raise_for_status()
-                return await response.json()
+                data = await self._conditional.async_read(url, response)
+        except asyncio.CancelledError:
+            # Not shielded like the PSE requests: a cancelled caller must not
+            # leave a half-open breaker waiting for its trial forever
+            self.breaker.release()
+            raise
         except Exception as e:
             _LOGGER.error("Error communicating with API for date %s: %s", date_str, e)
+            self.breaker.record_failure()
             return None
+        self.breaker.record_success()
+        return data
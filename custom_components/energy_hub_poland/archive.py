@@ -0,0 +1,200 @@
+"""On-disk archive of quarter-hour prices for Energy Hub Poland."""
+
+from __future__ import annotations
+
+import math
+import mmap
+import os
+import struct
+import threading
+from array import array
+from datetime import UTC, date, datetime, time
+
+from .prices import DayPrices
+from .slots import SLOT_SECONDS, WARSAW_TZ
+
+ARCHIVE_MAGIC = b"EHPRCE\x00\x00"
+ARCHIVE_VERSION = 1
+
+# magic, version, year, record size, slot seconds, first slot (UTC epoch)
+HEADER = struct.Struct("<8sHHHHq8x")
+RECORD = struct.Struct("<d")
+NAN_RECORD = RECORD.pack(math.nan)
+
+
+def _year_start(year: int) -> datetime:
+    """Return the UTC instant of local midnight on January 1st."""
+    return datetime.combine(date(year, 1, 1), time(), WARSAW_TZ).astimezone(UTC)
+
+
+class _YearFile:
+    """One archive file holding every quarter-hour of a local year."""
+
+    def __init__(self, path: str, year: int) -> None:
+        """Open (or create) the file of a year."""
+        self.path = path
+        self.year = year
+        self.start = _year_start(year)
+        self._map: mmap.mmap | None = None
+        self._mapped_size = 0
+
+        if not os.path.exists(path):
+            with open(path, "wb") as file:
+                file.write(
+                    HEADER.pack(
+                        ARCHIVE_MAGIC,
+                        ARCHIVE_VERSION,
+                        year,
+                        RECORD.size,
+                        SLOT_SECONDS,
+                        int(self.start.timestamp()),
+                    )
+                )
+        with open(path, "rb") as file:
+            header = file.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise ValueError(f"Truncated price archive {path}")
+        magic, version, file_year, record_size, slot_seconds, _ = HEADER.unpack(header)
+        if (magic, version, file_year, record_size, slot_seconds) != (
+            ARCHIVE_MAGIC,
+            ARCHIVE_VERSION,
+            year,
+            RECORD.size,
+            SLOT_SECONDS,
+        ):
+            raise ValueError(f"Incompatible price archive {path}")
+
+    def index_of(self, when: datetime) -> int:
+        """Return the record index of an instant of this year."""
+        return int((when - self.start).total_seconds()) // SLOT_SECONDS
+
+    def write(self, first: int, values: array) -> None:
+        """Write records from an index on, padding any gap before it with NaN."""
+        offset = HEADER.size + first * RECORD.size
+        with open(self.path, "r+b") as file:
+            size = file.seek(0, os.SEEK_END)
+            if size < offset:
+                gap = (offset - size) // RECORD.size
+                file.write(NAN_RECORD * gap)
+            file.seek(offset)
+            file.write(values.tobytes())
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _mapping(self) -> mmap.mmap | None:
+        """Return a read-only mapping covering the current file size."""
+        size = os.path.getsize(self.path)
+        if self._map is None or size != self._mapped_size:
+            self.close()
+            if size <= HEADER.size:
+                return None
+            with open(self.path, "rb") as file:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mapped_size = size
+        return self._map
+
+    def read(self, first: int, last: int) -> array:
+        """Return records [first, last), NaN where nothing was written."""
+        result = array("d", [math.nan]) * (last - first)
+        mapping = self._mapping()
+        if mapping is None:
+            return result
+        stored = (len(mapping) - HEADER.size) // RECORD.size
+        end = min(last, stored)
+        if end > first:
+            start_offset = HEADER.size + first * RECORD.size
+            chunk = array("d")
+            chunk.frombytes(mapping[start_offset : HEADER.size + end * RECORD.size])
+            result[: end - first] = chunk
+        return result
+
+    def close(self) -> None:
+        """Release the mapping."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            self._mapped_size = 0
+
+
+class PriceArchive:
+    """
+    Append-only archive of quarter-hour prices, one binary file per year.
+    Each file is a small header followed by one little-endian float64 per
+    quarter-hour of the local year (NaN for unknown), so the record of any
+    instant is found by arithmetic and read through a memory map without
+    loading the file. All methods do blocking I/O; call them from the
+    executor.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """Initialize the archive in a directory."""
+        self.directory = directory
+        self._files: dict[int, _YearFile] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, year: int) -> str:
+        """Return the file path of a year."""
+        return os.path.join(self.directory, f"rce_{year}.bin")
+
+    def _file(self, year: int, create: bool = False) -> _YearFile | None:
+        """Return the file of a year, None if it does not exist yet."""
+        if (year_file := self._files.get(year)) is None:
+            path = self._path(year)
+            if not create and not os.path.exists(path):
+                return None
+            os.makedirs(self.directory, exist_ok=True)
+            year_file = self._files[year] = _YearFile(path, year)
+        return year_file
+
+    def _year_of(self, when: datetime) -> int:
+        """Return the local year of an instant."""
+        return when.astimezone(WARSAW_TZ).year
+
+    def append_day(self, prices: DayPrices) -> None:
+        """Store every quarter-hour of a day (unknown ones as NaN)."""
+        values = array("d", [math.nan if v is None else v for v in prices.to_slots()])
+        with self._lock:
+            year_file = self._file(prices.day.year, create=True)
+            year_file.write(year_file.index_of(prices.slots.start), values)
+
+    def price_at(self, when: datetime) -> float | None:
+        """Return the archived price of the quarter-hour containing an instant."""
+        with self._lock:
+            if (year_file := self._file(self._year_of(when))) is None:
+                return None
+            index = year_file.index_of(when)
+            value = year_file.read(index, index + 1)[0]
+        return None if math.isnan(value) else value
+
+    def range(self, start: datetime, end: datetime) -> array:
+        """Return the quarter-hour prices in [start, end), NaN for gaps."""
+        result = array("d")
+        with self._lock:
+            while start < end:
+                year = self._year_of(start)
+                year_end = min(end, _year_start(year + 1))
+                count = int((year_end - start).total_seconds()) // SLOT_SECONDS
+                if (year_file := self._file(year)) is None:
+                    result.extend(array("d", [math.nan]) * count)
+                else:
+                    first = year_file.index_of(start)
+                    result.extend(year_file.read(first, first + count))
+                start = year_end
+        return result
+
+    def years(self) -> list[int]:
+        """Return the years that have an archive file."""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            int(name[4:8])
+            for name in os.listdir(self.directory)
+            if name.startswith("rce_") and name.endswith(".bin") and name[4:8].isdigit()
+        )
+
+    def close(self) -> None:
+        """Release all memory maps."""
+        with self._lock:
+            for year_file in self._files.values():
+                year_file.close()
+            self._files.clear()
@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import logging
 from typing import Any
-from zoneinfo import ZoneInfo
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
@@ -22,8 +21,14 @@ from .const import (
     ICONS,
     MODE_DYNAMIC,
 )
-from .coordinator import EnergyHubDataCoordinator
+from .coordinator import (
+    TOPIC_PRICES,
+    EnergyHubEntryCoordinator,
+    price_topic,
+)
 from .entity import EnergyHubEntity as EnergyHubBaseEntity
+from .prices import price_at
+from .slots import SLOT_CALENDAR
 
 _LOGGER = logging.getLogger(__package__)
 
@@ -34,7 +39,7 @@ async def async_setup_entry(
     async_add_entities: Any,
 ) -> None:
     """Set up the binary sensor platform."""
-    coordinator: EnergyHubDataCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator: EnergyHubEntryCoordinator = hass.data[DOMAIN][entry.entry_id]
     config = {**entry.data, **entry.options}
     mode = config.get(CONF_OPERATION_MODE)
     _LOGGER.debug(
@@ -57,9 +62,10 @@ class ApiStatusBinarySensor(EnergyHubBaseEntity, BinarySensorEntity):
 
     _attr_device_class = BinarySensorDeviceClass.CONNECTIVITY
     _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _topics = ()
 
     def __init__(
-        self, coordinator: EnergyHubDataCoordinator, entry: ConfigEntry
+        self, coordinator: EnergyHubEntryCoordinator, entry: ConfigEntry
     ) -> None:
         """Initialize the API status binary sensor."""
         super().__init__(coordinator, entry)
@@ -72,12 +78,19 @@ class ApiStatusBinarySensor(EnergyHubBaseEntity, BinarySensorEntity):
         """Return true if the API is currently reported as connected."""
         return self.coordinator.api_connected
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return whether the data is still served from the cache."""
+        return {"stale": self.coordinator.stale}
+
 
 class PriceSpikeBinarySensor(EnergyHubBaseEntity, BinarySensorEntity):
     """Binary sensor that turns ON when current price is significantly above average."""
 
+    _topics = (TOPIC_PRICES, price_topic("dynamic"))
+
     def __init__(
-        self, coordinator: EnergyHubDataCoordinator, entry: ConfigEntry
+        self, coordinator: EnergyHubEntryCoordinator, entry: ConfigEntry
     ) -> None:
         """Initialize the price spike binary sensor."""
         super().__init__(coordinator, entry)
@@ -98,10 +111,9 @@ class PriceSpikeBinarySensor(EnergyHubBaseEntity, BinarySensorEntity):
             if today_prices:
                 today_avg = sum(today_prices.values()) / len(today_prices)
         now = dt_util.now()
-        poland_tz = ZoneInfo("Europe/Warsaw")
-        poland_now = now.astimezone(poland_tz)
+        poland_now = SLOT_CALENDAR.to_local(now)
 
-        current_price = self.coordinator.data.get("today", {}).get(poland_now.hour)
+        current_price = price_at(self.coordinator.data, poland_now)
 
         # Guard against missing data
         if today_avg is None or current_price is None:
@@ -122,9 +134,10 @@ class NegativePriceBinarySensor(EnergyHubBaseEntity, BinarySensorEntity):
     """Binary sensor that turns ON when the dynamic price is negative."""
 
     _attr_device_class = BinarySensorDeviceClass.PROBLEM
+    _topics = (TOPIC_PRICES, price_topic("dynamic"))
 
     def __init__(
-        self, coordinator: EnergyHubDataCoordinator, entry: ConfigEntry
+        self, coordinator: EnergyHubEntryCoordinator, entry: ConfigEntry
     ) -> None:
         super().__init__(coordinator, entry)
         self._attr_translation_key = "negative_price"
@@ -136,7 +149,6 @@ class NegativePriceBinarySensor(EnergyHubBaseEntity, BinarySensorEntity):
         if not self.coordinator.data:
             return False
         now = dt_util.now()
-        poland_tz = ZoneInfo("Europe/Warsaw")
-        poland_now = now.astimezone(poland_tz)
-        current_price = self.coordinator.data.get("today", {}).get(poland_now.hour)
+        poland_now = SLOT_CALENDAR.to_local(now)
+        current_price = price_at(self.coordinator.data, poland_now)
         return current_price is not None and current_price < 0
@@ -54,6 +54,8 @@ from .const import (
     CONF_SENSOR_TYPE,
     CONF_SPIKE_THRESHOLD,
     CONF_VAT_RATE,
+    CONF_WINDOW_HOURS,
+    DEFAULT_WINDOW_HOURS,
     MODE_COMPARISON,
     MODE_DYNAMIC,
     MODE_G11,
@@ -71,8 +73,9 @@ from .const import (
     SENSOR_TYPE_TOTAL_INCREASING,
     UNIT_KWH,
     UNIT_MWH,
+    WINDOW_HOURS_OPTIONS,
 )
-from .helpers import parse_hour_ranges
+from .helpers import parse_hour_ranges, range_mask
 
 _LOGGER = logging.getLogger(__package__)
 
@@ -117,23 +120,17 @@ def validate_hour_format(user_input: str) -> bool:
     if not ranges:
         return False
 
-    seen_hours: set[int] = set()
+    seen_hours = 0
     for start, end in ranges:
         if start < 0 or start > 23 or end < 0 or end > 24:
             return False
         if start == end:
             return False
 
-        hours = []
-        if start < end:
-            hours = list(range(start, end))
-        else:
-            hours = list(range(start, 24)) + list(range(0, end))
-
-        for hour in hours:
-            if hour in seen_hours:
-                return False
-            seen_hours.add(hour)
+        hours = range_mask(start, end)
+        if seen_hours & hours:
+            return False
+        seen_hours |= hours
 
     return True
 
@@ -774,6 +771,22 @@ class EnergyHubPolandOptionsFlowHandler(config_entries.OptionsFlow):
                 )
             ] = vol.All(vol.Coerce(int), vol.Range(min=1, max=500))
 
+        # Price window sensors follow the RCE analytics (dynamic and comparison)
+        if mode in (MODE_DYNAMIC, MODE_COMPARISON):
+            schema[
+                vol.Optional(
+                    CONF_WINDOW_HOURS,
+                    default=config.get(CONF_WINDOW_HOURS, DEFAULT_WINDOW_HOURS),
+                )
+            ] = SelectSelector(
+                SelectSelectorConfig(
+                    options=WINDOW_HOURS_OPTIONS,
+                    multiple=True,
+                    mode=SelectSelectorMode.LIST,
+                    translation_key="window_hours",
+                )
+            )
+
         # Energy sensor settings only for comparison mode
         if mode == MODE_COMPARISON:
             schema[
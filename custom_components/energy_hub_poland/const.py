@@ -1,6 +1,7 @@
 """Constants for the Energy Hub Poland integration."""
 
 DOMAIN = "energy_hub_poland"
+DATA_MARKET_COORDINATOR = f"{DOMAIN}_market_coordinator"
 API_URL = "https://datahub.gkpge.pl/api/tge/quote"
 PSE_API_URL = "https://api.raporty.pse.pl/api"
 
@@ -13,6 +14,8 @@ ICONS = {
     "api_status": "mdi:cloud-check",
     "lowest_price_hour": "mdi:clock-outline",
     "highest_price_hour": "mdi:clock-alert-outline",
+    "cheapest_window": "mdi:clock-check-outline",
+    "most_expensive_window": "mdi:clock-remove-outline",
 }
 
 # Configuration keys
@@ -29,6 +32,7 @@ CONF_G13_SETTINGS = "g13_settings"
 CONF_PRICE_UNIT = "price_unit"
 CONF_PROVIDER = "provider"
 CONF_SPIKE_THRESHOLD = "spike_threshold"
+CONF_WINDOW_HOURS = "window_hours"
 
 CONF_PRICE_PEAK = "price_peak"
 CONF_PRICE_OFFPEAK = "price_offpeak"
@@ -83,10 +87,43 @@ CONF_NETWORK_VARIABLE_FEE_G13_OFFPEAK = "network_variable_fee_g13_offpeak"
 UNIT_KWH = "kwh"
 UNIT_MWH = "mwh"
 
-# Update interval tuning
-DEFAULT_UPDATE_INTERVAL_MINUTES = 5
-ERROR_BACKOFF_THRESHOLD = 3
-ERROR_BACKOFF_INTERVAL_MINUTES = 15
+# Update schedule, aligned to PSE/TGE publication times (Polish local time)
+GRID_PUBLICATION_DELAY_SECONDS = 90
+PRICE_PUBLICATION_HOUR = 12
+CATCHUP_INTERVAL_SECONDS = 120
+
+# Retry and circuit breaker tuning (per API endpoint)
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY_SECONDS = 1
+RETRY_MAX_DELAY_SECONDS = 8
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_BASE_COOLDOWN_SECONDS = 60
+BREAKER_MAX_COOLDOWN_SECONDS = 1800
+
+# Batched fetch tuning (one coordinator cycle)
+FETCH_MAX_CONCURRENCY = 4
+FETCH_CYCLE_DEADLINE_SECONDS = 30
+
+# Days of prices kept in memory and in the cache (including today and tomorrow)
+PRICE_WINDOW_DAYS = 7
+
+# Quarter-hour price archive, one file per year under <config>/.storage
+ARCHIVE_DIRECTORY = f"{DOMAIN}_archive"
+
+# PSE response cache (identical queries within one cycle are fetched once)
+PSE_RESPONSE_CACHE_TTL_SECONDS = 60
+
+# Write-behind persistence: changes are coalesced into one write per delay
+# and flushed at every full hour and on shutdown
+SAVE_DELAY_SECONDS = 60
+
+# Cost journal: metered increments are fsynced in batches of this interval
+JOURNAL_DIRECTORY = f"{DOMAIN}_journal"
+JOURNAL_FLUSH_SECONDS = 5
+
+# Window lengths (hours) offered for the cheapest/most expensive window sensors
+WINDOW_HOURS_OPTIONS = ["1", "2", "3", "4", "6"]
+DEFAULT_WINDOW_HOURS = ["3"]
 
 # Compatibility with tests
 CONF_UNIT_TYPE = CONF_PRICE_UNIT
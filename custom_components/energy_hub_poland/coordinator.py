@@ -1,54 +1,141 @@
 """Data coordinator for Energy Hub Poland."""
 
+import asyncio
 import logging
-from datetime import date, datetime, timedelta
+from collections.abc import Awaitable, Callable
+from datetime import UTC, date, datetime, time, timedelta
+from functools import partial
 from typing import Any
-from zoneinfo import ZoneInfo
 
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_point_in_utc_time,
+    async_track_time_change,
+)
 from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
 from .api import EnergyHubApiClient, PSEApiClient
+from .archive import PriceArchive
 from .const import (
-    DEFAULT_UPDATE_INTERVAL_MINUTES,
+    ARCHIVE_DIRECTORY,
+    CATCHUP_INTERVAL_SECONDS,
+    CONF_ENABLED_TARIFFS,
+    CONF_OPERATION_MODE,
+    DATA_MARKET_COORDINATOR,
     DOMAIN,
-    ERROR_BACKOFF_INTERVAL_MINUTES,
-    ERROR_BACKOFF_THRESHOLD,
+    FETCH_CYCLE_DEADLINE_SECONDS,
+    FETCH_MAX_CONCURRENCY,
+    GRID_PUBLICATION_DELAY_SECONDS,
+    JOURNAL_DIRECTORY,
+    JOURNAL_FLUSH_SECONDS,
+    MODE_COMPARISON,
+    PRICE_PUBLICATION_HOUR,
+    PRICE_WINDOW_DAYS,
+    SAVE_DELAY_SECONDS,
+)
+from .final_prices import FinalPrices
+from .journal import CostJournal, JournalRecord
+from .prices import DayPrices, PriceWindow, parse_dtime
+from .slots import SLOT_CALENDAR, SLOT_DURATION, WARSAW_TZ
+from .storage import EntryLedgerStore, PriceCacheStore
+from .tariffs import (
+    FeeSchedule,
+    TariffTable,
+    compile_fee_schedules,
+    compile_tariff_tables,
 )
+from .windows import PriceWindows
 
 _LOGGER = logging.getLogger(__package__)
 
-STORAGE_KEY = f"{DOMAIN}_cache"
-STORAGE_VERSION = 1
+TARIFFS = ["dynamic", "g11", "g12", "g12w", "g12n", "g13"]
+
+# Update topics of the entry coordinator (see async_publish)
+TOPIC_PRICES = "prices"  # today/tomorrow price data
+TOPIC_GRID = "grid"  # KSE load and generation
+TOPIC_COSTS = "costs"  # any accumulated cost
+TOPIC_STATUS = "status"  # API connection and last update result
+TOPIC_SLOT = "slot"  # start of the current quarter-hour slot
+
+GRID_KEYS = (
+    "load_actual",
+    "load_fcst",
+    "gen_wi",
+    "gen_fv",
+    "kse_pow_dem",
+    "imb_energy",
+)
+
+
+def price_topic(tariff: str) -> str:
+    """Return the topic of a tariff's current price."""
+    return f"price_{tariff}"
+
+
+def cost_topic(tariff: str) -> str:
+    """Return the topic of a tariff's accumulated cost."""
+    return f"cost_{tariff}"
+
+
+def _enabled_tariffs(config: dict[str, Any]) -> list[str]:
+    """Return the tariffs shown by an entry; RCE analytics always need dynamic."""
+    mode = config.get(CONF_OPERATION_MODE)
+    if mode == MODE_COMPARISON:
+        tariffs = config.get(CONF_ENABLED_TARIFFS, TARIFFS)
+    else:
+        tariffs = [mode]
+    return ["dynamic", *(tariff for tariff in tariffs if tariff != "dynamic")]
+
+
+def entry_journal_path(hass: HomeAssistant, entry_id: str) -> str:
+    """Return the path of a config entry's cost journal."""
+    return hass.config.path(".storage", JOURNAL_DIRECTORY, f"{entry_id}.bin")
 
 
 class EnergyHubDataCoordinator(DataUpdateCoordinator):
     """
     Class to manage fetching Energy Hub data from PSE/TGE API.
     Handles data caching, day transitions, and basic statistics calculation.
+    A single instance is shared by all config entries of the integration.
+    Instead of polling on a fixed interval it wakes up at the publication
+    times of the upstream data (see _next_update_time).
     """
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize the coordinator."""
+        # Not bound to the entry that happens to create it: its lifetime is
+        # the set of attached entries (see async_unload_entry)
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=None,
             name=DOMAIN,
-            update_interval=timedelta(minutes=DEFAULT_UPDATE_INTERVAL_MINUTES),
+            update_interval=None,
         )
         self.api_client = EnergyHubApiClient(async_get_clientsession(hass))
         self.pse_client = PSEApiClient(async_get_clientsession(hass))
-        self.store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self.store = PriceCacheStore(hass)
+        self.archive = PriceArchive(hass.config.path(".storage", ARCHIVE_DIRECTORY))
+        # Days written to the archive, and days whose write is in progress
+        self._archived: dict[date, list[float | None]] = {}
+        self._archiving: dict[date, list[float | None]] = {}
         self._cache_loaded = False
+        self.save_delay = SAVE_DELAY_SECONDS
+        self.save_stats: dict[str, dict[str, int]] = {
+            "cache": {"dirty": 0, "scheduled": 0, "written": 0}
+        }
+        self._unsub_hourly_flush = async_track_time_change(
+            hass, self._handle_hourly_flush, minute=0, second=0
+        )
 
+        self._prices = PriceWindow(PRICE_WINDOW_DAYS)
         self._internal_data: dict[str, Any] = {
-            "today": None,
-            "today_date": None,
-            "tomorrow": None,
-            "tomorrow_date": None,
             "last_price_update": None,
             "load_actual": None,
             "load_fcst": None,
@@ -59,37 +146,27 @@ class EnergyHubDataCoordinator(DataUpdateCoordinator):
         }
         self.last_update_time: datetime | None = None
         self.api_connected: bool = True
-        self._error_count: int = 0
+        # True while the data comes from the cache, until a refresh succeeds
+        self.stale = False
         self._last_tomorrow_event_date: date | None = None
-        self.costs: dict[str, float] = dict.fromkeys(
-            ["dynamic", "g11", "g12", "g12w", "g12n", "g13"], 0.0
-        )
-        self.cost_breakdown: dict[str, dict[str, float]] = {
-            tariff: {"energy": 0.0, "variable_fee": 0.0, "vat": 0.0, "total": 0.0}
-            for tariff in ["dynamic", "g11", "g12", "g12w", "g12n", "g13"]
-        }
-        self.last_reset: datetime = dt_util.now().replace(
-            day=1, hour=0, minute=0, second=0, microsecond=0
-        )
-
-    def _adjust_update_interval(self) -> None:
-        """Adjust the coordinator update interval after repeated failures."""
-        normal_interval: timedelta = timedelta(minutes=DEFAULT_UPDATE_INTERVAL_MINUTES)
-        backoff_interval: timedelta = timedelta(minutes=ERROR_BACKOFF_INTERVAL_MINUTES)
-
-        if self._error_count >= ERROR_BACKOFF_THRESHOLD:
-            if self.update_interval != backoff_interval:
-                _LOGGER.warning(
-                    "Multiple PSE failures detected, backing off updates to %s minutes",
-                    ERROR_BACKOFF_INTERVAL_MINUTES,
-                )
-                self.update_interval = backoff_interval
-        elif self.update_interval != normal_interval:
-            _LOGGER.debug(
-                "Restoring normal update interval to %s minutes",
-                DEFAULT_UPDATE_INTERVAL_MINUTES,
-            )
-            self.update_interval = normal_interval
+        # Days whose prices come from published RCE, not forecasts or PGE
+        self._rce_days: set[date] = set()
+        self._scheduled_update_remover: CALLBACK_TYPE | None = None
+
+        # Per-entry state (costs) is owned and persisted by the
+        # EnergyHubEntryCoordinator objects, one ledger store each.
+        self._entries: dict[str, EnergyHubEntryCoordinator] = {}
+        self._legacy_entry_state: dict[str, Any] | None = None
+        self._ready = False
+        self._ready_lock = asyncio.Lock()
+        self._first_refresh: asyncio.Task[None] | None = None
+
+        # Parsed results keyed by the identity of the raw payloads they came
+        # from; the API clients return the same object for unchanged data.
+        self._parsed_pse: (
+            tuple[Any, Any, dict[date, DayPrices], frozenset[date]] | None
+        ) = None
+        self._parsed_pge: dict[date, tuple[Any, dict[int, float] | None]] = {}
 
     async def _fetch_data(self, fetch_date: date) -> dict[int, float] | None:
         """Fetch and parse price data from PGE (wrapper for tests)."""
@@ -112,13 +189,80 @@ class EnergyHubDataCoordinator(DataUpdateCoordinator):
         )
 
         raw_data = await self.api_client.async_get_prices(api_query_date)
-        return self._parse_prices(raw_data)
+        cached = self._parsed_pge.get(fetch_date)
+        if raw_data is not None and cached is not None and cached[0] is raw_data:
+            return cached[1]
+
+        prices = self._parse_prices(raw_data)
+        self._parsed_pge = {
+            d: v
+            for d, v in self._parsed_pge.items()
+            if d >= fetch_date - timedelta(days=1)
+        }
+        self._parsed_pge[fetch_date] = (raw_data, prices)
+        return prices
+
+    async def _async_fetch_batch(
+        self,
+        requests: dict[str, Callable[[], Awaitable[Any]]],
+        deadline: float | None = None,
+    ) -> dict[str, Any]:
+        """
+        Run all fetches of one cycle concurrently.
+        Parallelism is bounded and the whole batch shares a single deadline,
+        the event loop time of the end of the update cycle; without one the
+        batch gets the full cycle budget. Requests that fail, return no data
+        (the API clients return None on errors) or miss the deadline are left
+        out of the result, so callers get exactly the data that did arrive and
+        an empty result means the whole batch failed.
+        """
+        if not requests:
+            return {}
+        loop = asyncio.get_running_loop()
+        if deadline is None:
+            deadline = loop.time() + FETCH_CYCLE_DEADLINE_SECONDS
+        if (timeout := deadline - loop.time()) <= 0:
+            _LOGGER.warning(
+                "No time left in the update cycle to fetch %s", ", ".join(requests)
+            )
+            return {}
+
+        semaphore = asyncio.Semaphore(FETCH_MAX_CONCURRENCY)
 
-    async def _update_pse_frequent_data(self, today_date: date) -> None:
-        """Fetch frequent data (Load, Generation) from PSE."""
-        load_data = await self.pse_client.get_load_data(today_date)
-        gen_data = await self.pse_client.get_generation_plans(today_date)
-        forecast_data = await self.pse_client.get_rce_forecast(today_date)
+        async def _run(factory: Callable[[], Awaitable[Any]]) -> Any:
+            async with semaphore:
+                return await factory()
+
+        tasks = {
+            name: asyncio.ensure_future(_run(factory))
+            for name, factory in requests.items()
+        }
+        _, pending = await asyncio.wait(tasks.values(), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        results: dict[str, Any] = {}
+        for name, task in tasks.items():
+            if task in pending:
+                _LOGGER.warning(
+                    "Fetching %s did not finish within %.0f seconds", name, timeout
+                )
+            elif (err := task.exception()) is not None:
+                _LOGGER.warning("Fetching %s failed: %s", name, err)
+            elif (result := task.result()) is None:
+                _LOGGER.debug("Fetching %s returned no data", name)
+            else:
+                results[name] = result
+        return results
+
+    def _update_pse_frequent_data(self, results: dict[str, Any]) -> None:
+        """Apply frequent data (Load, Generation) fetched from PSE."""
+        load_data = results.get("load")
+        gen_data = results.get("generation")
+        forecast_data = results.get("forecast")
+        previous = dict(self._internal_data)
 
         if load_data:
             latest = load_data[-1]
@@ -135,46 +279,68 @@ class EnergyHubDataCoordinator(DataUpdateCoordinator):
             latest = forecast_data[-1]
             self._internal_data["imb_energy"] = latest.get("imb_energy")
 
-    async def _update_pse_prices(self, today_date: date) -> None:
-        """Fetch and process RCE prices from PSE with PGE fallback."""
-        rce_data = await self.pse_client.get_rce_prices(today_date)
-        forecast_data = await self.pse_client.get_rce_forecast(today_date)
+        if self._internal_data != previous:
+            self.async_schedule_cache_save()
 
-        pse_prices = self._parse_pse_prices(rce_data, forecast_data)
+    async def _update_pse_prices(
+        self,
+        today_date: date,
+        rce_data: list[dict[str, Any]] | None,
+        forecast_data: list[dict[str, Any]] | None,
+        deadline: float | None = None,
+    ) -> None:
+        """
+        Process RCE prices from PSE with PGE fallback.
+        The fallbacks only get what is left of the cycle deadline.
+        """
+        # Unchanged upstream payloads skip the parse entirely
+        if (
+            self._parsed_pse is not None
+            and self._parsed_pse[0] is rce_data
+            and self._parsed_pse[1] is forecast_data
+        ):
+            pse_prices, rce_days = self._parsed_pse[2], self._parsed_pse[3]
+        else:
+            pse_prices = self._parse_pse_prices(rce_data, forecast_data)
+            rce_days = self._rce_dates(rce_data)
+            self._parsed_pse = (rce_data, forecast_data, pse_prices, rce_days)
+        tomorrow_date = today_date + timedelta(days=1)
+        self._rce_days = {day for day in self._rce_days | rce_days if day >= today_date}
+
+        # Work on copies, the parsed days are memoized for the next cycle
+        today = pse_prices[today_date].copy() if today_date in pse_prices else None
+        tomorrow = (
+            pse_prices[tomorrow_date].copy() if tomorrow_date in pse_prices else None
+        )
+
+        # If missing some quarters, fetch PGE fallbacks for both days concurrently
+        fallbacks: dict[str, Callable[[], Awaitable[Any]]] = {}
+        if today is None or not today.is_complete:
+            fallbacks["today"] = partial(self._fetch_pge_prices, today_date)
+        if tomorrow is None or not tomorrow.is_complete:
+            fallbacks["tomorrow"] = partial(self._fetch_pge_prices, tomorrow_date)
+        pge_results = await self._async_fetch_batch(fallbacks, deadline)
 
         # Update today
-        today_prices = {h: pse_prices.get((today_date, h)) for h in range(24)}
-        # If missing some hours, try PGE fallback
-        if None in today_prices.values():
-            pge_prices = await self._fetch_pge_prices(today_date)
-            if pge_prices:
-                for h in range(24):
-                    if today_prices[h] is None:
-                        today_prices[h] = pge_prices.get(h)
-
-        if any(v is not None for v in today_prices.values()):
-            self._internal_data["today"] = {
-                h: v for h, v in today_prices.items() if v is not None
-            }
-            self._internal_data["today_date"] = today_date
+        if pge_prices := pge_results.get("today"):
+            today = self._fill_from_hourly(today, today_date, pge_prices)
+
+        if today:
+            self._store_day(today)
 
         # Update tomorrow
-        tomorrow_date = today_date + timedelta(days=1)
-        tomorrow_prices = {h: pse_prices.get((tomorrow_date, h)) for h in range(24)}
-        if None in tomorrow_prices.values():
-            pge_prices = await self._fetch_pge_prices(tomorrow_date)
-            if pge_prices:
-                for h in range(24):
-                    if tomorrow_prices[h] is None:
-                        tomorrow_prices[h] = pge_prices.get(h)
+        if pge_prices := pge_results.get("tomorrow"):
+            tomorrow = self._fill_from_hourly(tomorrow, tomorrow_date, pge_prices)
 
+        # The event waits for the RCE publication, forecasts and PGE
+        # fallbacks only stand in for it
         tomorrow_published = False
-        if any(v is not None for v in tomorrow_prices.values()):
-            self._internal_data["tomorrow"] = {
-                h: v for h, v in tomorrow_prices.items() if v is not None
-            }
-            self._internal_data["tomorrow_date"] = tomorrow_date
-            if tomorrow_date != self._last_tomorrow_event_date:
+        if tomorrow:
+            self._store_day(tomorrow)
+            if (
+                tomorrow_date in self._rce_days
+                and tomorrow_date != self._last_tomorrow_event_date
+            ):
                 tomorrow_published = True
                 self._last_tomorrow_event_date = tomorrow_date
 
@@ -183,191 +349,258 @@ class EnergyHubDataCoordinator(DataUpdateCoordinator):
                 "energy_hub_poland_tomorrow_prices_published",
                 {
                     "tomorrow_date": tomorrow_date.isoformat(),
-                    "tomorrow_price_count": len(self._internal_data["tomorrow"] or {}),
-                    "tomorrow_prices": self._internal_data["tomorrow"],
+                    "tomorrow_price_count": len(tomorrow),
+                    "tomorrow_prices": tomorrow.hourly(),
                 },
             )
 
-    def _parse_pse_prices(
-        self, rce_data: list | None, forecast_data: list | None
-    ) -> dict[tuple[date, int], float]:
-        """Parse PSE RCE and Forecast data, averaging all values per hour."""
-        hourly_actuals: dict[tuple[date, int], list[float]] = {}
-        hourly_forecasts: dict[tuple[date, int], list[float]] = {}
+    def _store_day(self, prices: DayPrices) -> None:
+        """
+        Put a day into the window and persist it if its prices changed.
+        An unchanged day keeps the stored DayPrices object, so its derived
+        views keep their identity and consumers can skip rebuilding.
+        """
+        self._archive_day(prices)
+        previous = self._prices.get(prices.day)
+        if previous is not None and previous.to_slots() == prices.to_slots():
+            return
+        self._prices.put(prices)
+        self.async_schedule_cache_save()
+
+    def _archive_day(self, prices: DayPrices) -> None:
+        """Append a fully priced day to the on-disk archive if it changed."""
+        if not prices.is_complete:
+            return
+        slots = prices.to_slots()
+        if slots in (self._archived.get(prices.day), self._archiving.get(prices.day)):
+            return
+        self._archiving[prices.day] = slots
+        future = self.hass.async_add_executor_job(self._write_archive, prices)
+        future.add_done_callback(partial(self._archive_written, prices.day, slots))
 
-        def add_to_raw(dt_str: str, val: Any, target_dict: dict) -> None:
-            if val is None:
-                return
-            dt = dt_util.parse_datetime(dt_str)
-            if not dt:
-                return
-            # Polish time adjust: 00:15-01:00 is hour 0
-            hour = dt.hour
-            d_date = dt.date()
-            if dt.minute == 0 and dt.second == 0:
-                hour -= 1
-            if hour < 0:
-                hour = 23
-                d_date -= timedelta(days=1)
-            key = (d_date, hour)
-            if key not in target_dict:
-                target_dict[key] = []
-            target_dict[key].append(float(val) / 1000)
+    @callback
+    def _archive_written(
+        self, day: date, slots: list[float | None], future: asyncio.Future[bool]
+    ) -> None:
+        """Record an archived day once its write succeeded, so failures retry."""
+        if self._archiving.get(day) == slots:
+            del self._archiving[day]
+        if future.cancelled() or future.exception() is not None or not future.result():
+            return
+        self._archived = {
+            archived: values
+            for archived, values in self._archived.items()
+            if archived >= day - timedelta(days=1)
+        }
+        self._archived[day] = slots
 
-        if forecast_data:
-            for item in forecast_data:
-                add_to_raw(item["dtime"], item.get("cen_fcst"), hourly_forecasts)
+    def _write_archive(self, prices: DayPrices) -> bool:
+        """Write a day to the archive (runs in the executor)."""
+        try:
+            self.archive.append_day(prices)
+        except (OSError, ValueError) as e:
+            _LOGGER.error("Failed to archive prices for %s: %s", prices.day, e)
+            return False
+        return True
+
+    @staticmethod
+    def _fill_from_hourly(
+        day: DayPrices | None, day_date: date, hourly: dict[int, float]
+    ) -> DayPrices:
+        """Fill unknown quarters of a day with hourly (PGE) prices."""
+        if day is None:
+            return DayPrices.from_hourly(day_date, hourly)
+        for hour, price in hourly.items():
+            day.fill_hour(hour, price, only_missing=True)
+        return day
 
+    def _parse_pse_prices(
+        self, rce_data: list | None, forecast_data: list | None
+    ) -> dict[date, DayPrices]:
+        """Parse PSE RCE and Forecast data into quarter-hour day prices."""
+        days: dict[date, DayPrices] = {}
+
+        def store(rows: list, field: str) -> None:
+            # On the autumn DST day the repeated hour carries the same local
+            # dtime twice; the second occurrence belongs to the later slot.
+            seen: set[tuple[date, int]] = set()
+            for item in rows:
+                val = item.get(field)
+                if val is None or not (parsed := parse_dtime(item.get("dtime"))):
+                    continue
+                d_date, quarter = parsed
+                if (day := days.get(d_date)) is None:
+                    day = days[d_date] = DayPrices(d_date)
+                fold = 1 if parsed in seen else 0
+                seen.add(parsed)
+                day.set_wall(quarter, float(val) / 1000, fold)
+
+        # Forecasts first, published actuals override them per quarter-hour
+        if forecast_data:
+            store(forecast_data, "cen_fcst")
         if rce_data:
-            for item in rce_data:
-                add_to_raw(item["dtime"], item.get("rce_pln"), hourly_actuals)
-
-        def average(values: list[float]) -> float:
-            return sum(values) / len(values)
-
-        result: dict[tuple[date, int], float] = {}
-        # Combine keys from both
-        all_keys = set(hourly_actuals.keys()) | set(hourly_forecasts.keys())
+            store(rce_data, "rce_pln")
+
+        return days
+
+    @staticmethod
+    def _rce_dates(rce_data: list | None) -> frozenset[date]:
+        """Return the days the RCE payload carries published prices for."""
+        return frozenset(
+            parsed[0]
+            for item in rce_data or ()
+            if item.get("rce_pln") is not None
+            and (parsed := parse_dtime(item.get("dtime")))
+        )
 
-        for key in all_keys:
-            # If we have actuals for this hour, average them
-            if key in hourly_actuals:
-                result[key] = average(hourly_actuals[key])
-            # Otherwise average forecasts
+    async def async_ensure_ready(self) -> None:
+        """
+        Load the cache and start the first refresh once for all entries.
+        With cached data the entries are served from it at once, marked as
+        stale, and the first refresh runs in the background; only a start
+        without any cache (first install) waits for the upstream APIs.
+        """
+        async with self._ready_lock:
+            if self._ready:
+                return
+            if not self._cache_loaded:
+                await self._load_cache()
+                self._cache_loaded = True
+            if self.data:
+                self._serve_cached_data()
+                self._first_refresh = self.hass.async_create_background_task(
+                    self.async_refresh(), f"{DOMAIN} first refresh"
+                )
             else:
-                result[key] = average(hourly_forecasts[key])
+                await self.async_refresh()
+                if not self.last_update_success:
+                    raise ConfigEntryNotReady(
+                        "No energy price data available for today"
+                    )
+            self._ready = True
 
-        return result
+    def _serve_cached_data(self) -> None:
+        """Move cached prices to the current day and mark the data stale."""
+        today_date = SLOT_CALENDAR.to_local(dt_util.now()).date()
+        if self._prices.today != today_date:
+            self._prices.advance(today_date)
+        self.data = {**self.data, **self._price_views()}
+        self.stale = True
 
     @callback
-    def async_update_costs(
-        self, delta: float, prices: dict[str, dict[str, float] | None]
+    def async_register_entry(
+        self, entry_coordinator: "EnergyHubEntryCoordinator"
     ) -> None:
-        """Update accumulated costs with a new energy increment and breakdown."""
-        legacy_keys = ["dynamic", "g11", "g12", "g12w", "g12n", "g13"]
-        for key in legacy_keys:
-            if key not in self.costs:
-                self.costs[key] = 0.0
-            if key not in self.cost_breakdown:
-                self.cost_breakdown[key] = {
-                    "energy": 0.0,
-                    "variable_fee": 0.0,
-                    "vat": 0.0,
-                    "total": 0.0,
-                }
+        """Attach a per-entry coordinator."""
+        self._entries[entry_coordinator.entry_id] = entry_coordinator
 
-        for tariff, price_data in prices.items():
-            if price_data is None:
-                continue
+    @callback
+    def async_unregister_entry(self, entry_id: str) -> None:
+        """Detach a per-entry coordinator."""
+        self._entries.pop(entry_id, None)
 
-            if isinstance(price_data, dict):
-                energy_price = price_data.get("energy", 0.0)
-                variable_fee = price_data.get("variable_fee", 0.0)
-                vat_amount = price_data.get("vat", 0.0)
-                total_price = price_data.get("total", 0.0)
-            else:
-                energy_price = float(price_data)
-                variable_fee = 0.0
-                vat_amount = 0.0
-                total_price = float(price_data)
+    @callback
+    def async_claim_legacy_state(self, entry_id: str) -> dict[str, Any] | None:
+        """Hand the costs saved before entries were namespaced to an entry."""
+        if (state := self._legacy_entry_state) is None:
+            return None
+        self._legacy_entry_state = None
+        self.hass.async_create_task(self._async_hand_over_legacy(entry_id, state))
+        return state
 
-            self.costs[tariff] += delta * total_price
-            breakdown = self.cost_breakdown.setdefault(
-                tariff,
-                {"energy": 0.0, "variable_fee": 0.0, "vat": 0.0, "total": 0.0},
-            )
-            breakdown["energy"] += delta * energy_price
-            breakdown["variable_fee"] += delta * variable_fee
-            breakdown["vat"] += delta * vat_amount
-            breakdown["total"] += delta * total_price
+    async def _async_hand_over_legacy(
+        self, entry_id: str, state: dict[str, Any]
+    ) -> None:
+        """
+        Persist claimed legacy costs in the entry's store, then rewrite the
+        cache without them. Until then the version 1 cache keeps the costs,
+        so a restart in between migrates them again.
+        """
+        try:
+            await EntryLedgerStore(self.hass, entry_id).async_save(state)
+            self.async_schedule_cache_save()
+        except Exception as e:
+            _LOGGER.error("Error moving legacy costs to entry %s: %s", entry_id, e)
 
-        self.data["costs"] = self.costs
-        self.data["cost_breakdown"] = self.cost_breakdown
-        self.async_set_updated_data(self.data)
-        self.hass.async_create_task(self._save_cache())
+    @property
+    def has_entries(self) -> bool:
+        """Return True while at least one config entry uses this coordinator."""
+        return bool(self._entries)
 
     async def _async_update_data(self) -> dict[str, Any]:
-        """Core update method called periodically by Home Assistant."""
+        """Core update method, run at the scheduled publication times."""
+        try:
+            return await self._async_update_market()
+        finally:
+            self._schedule_next_update()
+
+    async def _async_update_market(self) -> dict[str, Any]:
+        """Fetch the data due in this cycle and rebuild the market data."""
         if not self._cache_loaded:
             await self._load_cache()
             self._cache_loaded = True
 
         now = dt_util.now()
-        poland_tz = ZoneInfo("Europe/Warsaw")
-        poland_now = now.astimezone(poland_tz)
+        poland_now = SLOT_CALENDAR.to_local(now)
         today_date = poland_now.date()
+        rolled_over = self._prices.today != today_date
+        if rolled_over:
+            # Day transition (midnight): yesterday's tomorrow becomes today
+            _LOGGER.debug("Price window moved to %s", today_date)
+            self._prices.advance(today_date)
+
+        # Prices are refreshed on the first cycle of a day and after the midday
+        # publication, and while published prices are still missing
+        last_price_update = self._internal_data.get("last_price_update")
+        needs_price_update = rolled_over or self._prices_missing(poland_now)
+
+        if not needs_price_update and last_price_update:
+            last_p_poland = SLOT_CALENDAR.to_local(last_price_update)
+            if (
+                last_p_poland.date() != today_date
+                or last_p_poland.hour < PRICE_PUBLICATION_HOUR <= poland_now.hour
+            ):
+                needs_price_update = True
 
-        # Monthly reset check
-        if now.day == 1 and self.last_reset.month != now.month:
-            _LOGGER.info("Monthly cost reset triggered")
-            self.costs = dict.fromkeys(self.costs, 0.0)
-            self.last_reset = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        # 1. Fetch everything needed for this cycle in a single batch; the PGE
+        # fallbacks of step 3 share its deadline
+        deadline = asyncio.get_running_loop().time() + FETCH_CYCLE_DEADLINE_SECONDS
+        requests: dict[str, Callable[[], Awaitable[Any]]] = {
+            "load": partial(self.pse_client.get_load_data, today_date),
+            "generation": partial(self.pse_client.get_generation_plans, today_date),
+            "forecast": partial(self.pse_client.get_rce_forecast, today_date),
+        }
+        if needs_price_update:
+            requests["rce"] = partial(self.pse_client.get_rce_prices, today_date)
+        results = await self._async_fetch_batch(requests, deadline)
 
-        # 1. Fetch frequent data (Load, Generation)
-        try:
-            await self._update_pse_frequent_data(today_date)
+        # 2. Apply frequent data (Load, Generation). Failed fetches are not in
+        # the results, so cached data only stops being stale on real data.
+        if results:
+            self._update_pse_frequent_data(results)
             self.api_connected = True
-            self._error_count = 0
-        except Exception as e:
-            _LOGGER.warning("Failed to fetch frequent PSE data: %s", e)
+            self.stale = False
+        else:
+            _LOGGER.warning("Failed to fetch frequent PSE data")
             self.api_connected = False
-            self._error_count += 1
-
-        # 2. Fetch prices twice a day (00:01 and 12:00) or if missing
-        last_price_update = self._internal_data.get("last_price_update")
-        needs_price_update = False
-
-        if (
-            not self._internal_data.get("today")
-            or self._internal_data.get("today_date") != today_date
-        ):
-            needs_price_update = True
-        elif poland_now.hour >= 12 and (
-            not self._internal_data.get("tomorrow")
-            or self._internal_data.get("tomorrow_date")
-            != (today_date + timedelta(days=1))
-        ):
-            needs_price_update = True
-        elif last_price_update:
-            last_p_poland = last_price_update.astimezone(poland_tz)
-            if last_p_poland.hour < 12 <= poland_now.hour:
-                needs_price_update = True
 
+        # 3. Apply prices
         if needs_price_update:
             try:
-                await self._update_pse_prices(today_date)
+                await self._update_pse_prices(
+                    today_date, results.get("rce"), results.get("forecast"), deadline
+                )
                 self._internal_data["last_price_update"] = now
                 self.last_update_time = now
-                self._error_count = 0
             except Exception as e:
                 _LOGGER.error("Failed to update PSE prices: %s", e)
-                self._error_count += 1
-
-        self._adjust_update_interval()
-
-        # Handle day transition (midnight)
-        if (
-            self._internal_data["today_date"]
-            and self._internal_data["today_date"] < today_date
-        ):
-            _LOGGER.debug("Day transition: moving tomorrow data to today")
-            self._internal_data["today"] = self._internal_data["tomorrow"]
-            self._internal_data["today_date"] = self._internal_data["tomorrow_date"]
-            self._internal_data["tomorrow"] = None
-            self._internal_data["tomorrow_date"] = None
-
-        await self._save_cache()
 
         # Raise error only if we have no data at all for today
-        if not self._internal_data["today"]:
+        if not self._prices.get(today_date):
             raise UpdateFailed("No energy price data available for today")
 
-        data = {
-            "today": self._internal_data["today"],
-            "tomorrow": self._internal_data["tomorrow"],
-            "costs": self.costs,
-            "cost_breakdown": self.cost_breakdown,
-            "last_reset": self.last_reset,
+        return {
+            **self._price_views(),
             "load_actual": self._internal_data.get("load_actual"),
             "load_fcst": self._internal_data.get("load_fcst"),
             "gen_wi": self._internal_data.get("gen_wi"),
@@ -376,51 +609,119 @@ class EnergyHubDataCoordinator(DataUpdateCoordinator):
             "imb_energy": self._internal_data.get("imb_energy"),
         }
 
-        # Calculate daily statistics
-        for day in ["today", "tomorrow"]:
-            prices = data.get(day)
-            if prices:
-                avg = sum(prices.values()) / len(prices)
-                data[f"{day}_avg"] = round(avg, 4)
+    def _prices_missing(self, poland_now: datetime) -> bool:
+        """
+        Return whether prices that should already be published are missing.
+        A tomorrow built only from forecasts or PGE fallbacks still counts as
+        missing, so the RCE publication replaces it once it is out.
+        """
+        today_date = poland_now.date()
+        if not self._prices.get(today_date):
+            return True
+        if poland_now.hour < PRICE_PUBLICATION_HOUR:
+            return False
+        tomorrow_date = today_date + timedelta(days=1)
+        return (
+            not self._prices.get(tomorrow_date) or tomorrow_date not in self._rce_days
+        )
 
-                min_price = min(prices.values())
-                min_hour = [h for h, p in prices.items() if p == min_price][0]
-                data[f"{day}_min_hour"] = min_hour
+    def _next_update_time(self, now: datetime) -> datetime:
+        """
+        Return the next moment worth waking up for (UTC).
+        Candidates are the next quarter-hour grid publication, the day-ahead
+        price publication, the midnight rollover and, while published prices
+        are still missing, a short catch-up interval.
+        """
+        now = now.astimezone(UTC)
+        poland_now = SLOT_CALENDAR.to_local(now)
+        day, slot = SLOT_CALENDAR.locate(now)
+
+        # Grid data for a quarter-hour is published shortly after it ends
+        grid = day.slot_start(slot) + timedelta(seconds=GRID_PUBLICATION_DELAY_SECONDS)
+        if grid <= now:
+            grid = day.slot_start(slot + 1) + timedelta(
+                seconds=GRID_PUBLICATION_DELAY_SECONDS
+            )
 
-                max_price = max(prices.values())
-                max_hour = [h for h, p in prices.items() if p == max_price][0]
-                data[f"{day}_max_hour"] = max_hour
-                data[f"{day}_max_price"] = max_price
+        candidates = [grid, day.end]
+        publication = datetime.combine(day.day, time(PRICE_PUBLICATION_HOUR), WARSAW_TZ)
+        if now < publication:
+            candidates.append(publication)
+        if self._prices_missing(poland_now):
+            candidates.append(now + timedelta(seconds=CATCHUP_INTERVAL_SECONDS))
+        return min(candidates).astimezone(UTC)
+
+    def _schedule_next_update(self) -> None:
+        """Replace the pending wake-up with one at the next publication time."""
+        if self._scheduled_update_remover:
+            self._scheduled_update_remover()
+        next_update = self._next_update_time(dt_util.utcnow())
+        _LOGGER.debug("Next market update scheduled for %s", next_update)
+        self._scheduled_update_remover = async_track_point_in_utc_time(
+            self.hass, self._handle_scheduled_update, next_update
+        )
 
-        return data
+    @callback
+    def _handle_scheduled_update(self, _now: datetime) -> None:
+        """Run a refresh at a scheduled publication time."""
+        self._scheduled_update_remover = None
+        self.hass.async_create_task(self.async_refresh())
+
+    async def async_shutdown(self) -> None:
+        """Cancel the pending wake-up, flush the cache and shut down."""
+        if self._first_refresh is not None and not self._first_refresh.done():
+            self._first_refresh.cancel()
+        if self._scheduled_update_remover:
+            self._scheduled_update_remover()
+            self._scheduled_update_remover = None
+        if self._unsub_hourly_flush:
+            self._unsub_hourly_flush()
+            self._unsub_hourly_flush = None
+        await self.async_flush_cache()
+        await self.hass.async_add_executor_job(self.archive.close)
+        await super().async_shutdown()
+
+    def _price_views(self) -> dict[str, Any]:
+        """Return price views and cached statistics around today."""
+        views: dict[str, Any] = {"price_window": self._prices}
+        for offset, day in ((-1, "yesterday"), (0, "today"), (1, "tomorrow")):
+            prices = self._prices.relative(offset)
+            views[day] = prices.hourly() if prices else None
+            views[f"{day}_quarters"] = prices.quarter_hours() if prices else None
+            if prices:
+                views.update(
+                    {f"{day}_{name}": value for name, value in prices.stats().items()}
+                )
+        return views
+
+    def _restore_prices(self, cached: dict[str, Any]) -> None:
+        """Restore the price window, accepting the older today/tomorrow format."""
+        self._prices = PriceWindow(PRICE_WINDOW_DAYS)
+        for day_str, slots in (cached.get("price_days") or {}).items():
+            self._prices.put(DayPrices.from_slots(date.fromisoformat(day_str), slots))
+        for day in ("today", "tomorrow"):
+            if not (day_str := cached.get(f"{day}_date")):
+                continue
+            day_date = date.fromisoformat(day_str)
+            if slots := cached.get(f"{day}_slots"):
+                self._prices.put(DayPrices.from_slots(day_date, slots))
+            elif hourly := cached.get(day):
+                self._prices.put(DayPrices.from_hourly(day_date, hourly))
+            if day == "today":
+                self._prices.advance(day_date)
 
     async def _load_cache(self) -> None:
         """Load previously saved data from the persistent store."""
         try:
             cached = await self.store.async_load()
+            if self.store.legacy_ledger is not None:
+                # Costs of a version 1 cache wait for the first entry to attach
+                self._legacy_entry_state = self.store.legacy_ledger
+                self.store.legacy_ledger = None
             if cached:
                 _LOGGER.debug("Loaded data from persistent cache")
+                self._restore_prices(cached)
                 self._internal_data = {
-                    "today": (
-                        {int(k): v for k, v in cached.get("today", {}).items()}
-                        if cached.get("today")
-                        else None
-                    ),
-                    "today_date": (
-                        date.fromisoformat(cached["today_date"])
-                        if cached.get("today_date")
-                        else None
-                    ),
-                    "tomorrow": (
-                        {int(k): v for k, v in cached.get("tomorrow", {}).items()}
-                        if cached.get("tomorrow")
-                        else None
-                    ),
-                    "tomorrow_date": (
-                        date.fromisoformat(cached["tomorrow_date"])
-                        if cached.get("tomorrow_date")
-                        else None
-                    ),
                     "last_price_update": (
                         dt_util.parse_datetime(cached["last_price_update"])
                         if cached.get("last_price_update")
@@ -436,33 +737,10 @@ class EnergyHubDataCoordinator(DataUpdateCoordinator):
                 if last_update := cached.get("last_update_time"):
                     self.last_update_time = dt_util.parse_datetime(last_update)
                 self.api_connected = cached.get("api_connected", True)
-                if saved_costs := cached.get("costs"):
-                    self.costs.update(
-                        {k: float(v) for k, v in saved_costs.items() if k in self.costs}
-                    )
-                if saved_breakdown := cached.get("cost_breakdown"):
-                    for tariff, breakdown in saved_breakdown.items():
-                        if tariff not in self.cost_breakdown:
-                            continue
-                        self.cost_breakdown[tariff].update(
-                            {
-                                kk: float(vv)
-                                for kk, vv in breakdown.items()
-                                if kk in self.cost_breakdown[tariff]
-                            }
-                        )
-                if last_reset := cached.get("last_reset"):
-                    self.last_reset = (
-                        dt_util.parse_datetime(last_reset) or self.last_reset
-                    )
 
                 # Populate self.data immediately
                 self.data = {
-                    "today": self._internal_data["today"],
-                    "tomorrow": self._internal_data["tomorrow"],
-                    "costs": self.costs,
-                    "cost_breakdown": self.cost_breakdown,
-                    "last_reset": self.last_reset,
+                    **self._price_views(),
                     "load_actual": self._internal_data["load_actual"],
                     "load_fcst": self._internal_data["load_fcst"],
                     "gen_wi": self._internal_data["gen_wi"],
@@ -473,39 +751,86 @@ class EnergyHubDataCoordinator(DataUpdateCoordinator):
         except Exception as e:
             _LOGGER.error("Error loading cache: %s", e)
 
+    @callback
+    def async_schedule_cache_save(self) -> None:
+        """Mark the price cache dirty and write it once changes settle."""
+        self._schedule_save("cache", self.store, self._cache_to_save)
+
+    def _schedule_save(
+        self, name: str, store: Store, data_func: Callable[[], dict[str, Any]]
+    ) -> None:
+        """
+        Schedule a delayed write of one store.
+        Repeated calls within the save delay are coalesced into a single
+        write of the state at that moment.
+        """
+        stats = self.save_stats[name]
+        stats["dirty"] += 1
+        stats["scheduled"] += 1
+        store.async_delay_save(data_func, self.save_delay)
+
+    async def async_flush_cache(self) -> None:
+        """
+        Write pending changes of the price cache and every entry's ledger.
+        An entry is also saved when its delayed save already wrote the costs
+        but the journal still holds the records they include, so the saved
+        snapshot is followed by a compaction while Home Assistant runs.
+        """
+        for entry_coordinator in list(self._entries.values()):
+            if entry_coordinator.needs_ledger_flush:
+                await entry_coordinator.async_save_ledger()
+        if self.save_stats["cache"]["dirty"]:
+            await self._save_cache()
+
+    @callback
+    def _handle_hourly_flush(self, _now: datetime) -> None:
+        """Persist pending changes at the top of every hour."""
+        if self.save_stats["cache"]["dirty"] or any(
+            entry_coordinator.needs_ledger_flush
+            for entry_coordinator in self._entries.values()
+        ):
+            self.hass.async_create_task(self.async_flush_cache())
+
     async def _save_cache(self) -> None:
-        """Save current data to the persistent store."""
+        """Save the price cache immediately."""
         try:
-            today_date: date | None = self._internal_data["today_date"]
-            tomorrow_date: date | None = self._internal_data["tomorrow_date"]
-            data_to_save = {
-                "today": self._internal_data["today"],
-                "today_date": today_date.isoformat() if today_date else None,
-                "tomorrow": self._internal_data["tomorrow"],
-                "tomorrow_date": tomorrow_date.isoformat() if tomorrow_date else None,
-                "last_update_time": (
-                    self.last_update_time.isoformat() if self.last_update_time else None
-                ),
-                "last_price_update": (
-                    self._internal_data["last_price_update"].isoformat()
-                    if self._internal_data.get("last_price_update")
-                    else None
-                ),
-                "api_connected": self.api_connected,
-                "costs": self.costs,
-                "cost_breakdown": self.cost_breakdown,
-                "last_reset": self.last_reset.isoformat() if self.last_reset else None,
-                "load_actual": self._internal_data.get("load_actual"),
-                "load_fcst": self._internal_data.get("load_fcst"),
-                "gen_wi": self._internal_data.get("gen_wi"),
-                "gen_fv": self._internal_data.get("gen_fv"),
-                "kse_pow_dem": self._internal_data.get("kse_pow_dem"),
-                "imb_energy": self._internal_data.get("imb_energy"),
-            }
-            await self.store.async_save(data_to_save)
+            await self.store.async_save(self._cache_to_save())
         except Exception as e:
             _LOGGER.error("Error saving cache: %s", e)
 
+    def _mark_written(self, name: str) -> None:
+        """Reset the dirty counter of a store (called at write time)."""
+        stats = self.save_stats[name]
+        stats["dirty"] = 0
+        stats["written"] += 1
+
+    def _cache_to_save(self) -> dict[str, Any]:
+        """Serialize market prices and grid data."""
+        self._mark_written("cache")
+        today_date: date | None = self._prices.today
+        return {
+            "price_days": {
+                prices.day.isoformat(): prices.to_slots()
+                for prices in self._prices.days()
+            },
+            "today_date": today_date.isoformat() if today_date else None,
+            "last_update_time": (
+                self.last_update_time.isoformat() if self.last_update_time else None
+            ),
+            "last_price_update": (
+                self._internal_data["last_price_update"].isoformat()
+                if self._internal_data.get("last_price_update")
+                else None
+            ),
+            "api_connected": self.api_connected,
+            "load_actual": self._internal_data.get("load_actual"),
+            "load_fcst": self._internal_data.get("load_fcst"),
+            "gen_wi": self._internal_data.get("gen_wi"),
+            "gen_fv": self._internal_data.get("gen_fv"),
+            "kse_pow_dem": self._internal_data.get("kse_pow_dem"),
+            "imb_energy": self._internal_data.get("imb_energy"),
+        }
+
     def _parse_prices(
         self, raw_data: list[dict[str, Any]] | None
     ) -> dict[int, float] | None:
@@ -514,7 +839,6 @@ class EnergyHubDataCoordinator(DataUpdateCoordinator):
             return None
 
         prices: dict[int, float] = {}
-        poland_tz = ZoneInfo("Europe/Warsaw")
         item = {}
         try:
             for item in raw_data:
@@ -538,7 +862,7 @@ class EnergyHubDataCoordinator(DataUpdateCoordinator):
                     dt = dt.replace(tzinfo=dt_util.UTC)
 
                 # Convert to Polish time
-                poland_dt = dt.astimezone(poland_tz)
+                poland_dt = SLOT_CALENDAR.to_local(dt)
                 hour = poland_dt.hour
 
                 # In tests, WARSAW is patched to UTC or something else sometimes
@@ -577,3 +901,505 @@ class EnergyHubDataCoordinator(DataUpdateCoordinator):
             # return prices if prices else None
 
         return prices if prices else None
+
+
+class EnergyHubEntryCoordinator(DataUpdateCoordinator):
+    """
+    Lightweight per-entry view on the shared market data.
+    Holds the state that belongs to a single config entry (accumulated costs)
+    and republishes every market update, merged with that state, to the
+    entry's entities. It never talks to the upstream APIs itself.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        market: EnergyHubDataCoordinator,
+    ) -> None:
+        """Initialize the per-entry coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_{entry.entry_id}",
+            update_interval=None,
+        )
+        self.entry_id = entry.entry_id
+        self.market = market
+        # Rebuilt on options change, which reloads the entry
+        config = {**entry.data, **entry.options}
+        self.tariff_tables: dict[str, TariffTable] = compile_tariff_tables(config)
+        self.fee_schedules: dict[str, FeeSchedule] = compile_fee_schedules(config)
+        self.final_prices = FinalPrices(
+            _enabled_tariffs(config), self.tariff_tables, self.fee_schedules
+        )
+        self.price_windows = PriceWindows(self.final_prices)
+        self.costs: dict[str, float] = dict.fromkeys(TARIFFS, 0.0)
+        self.cost_breakdown: dict[str, dict[str, float]] = {
+            tariff: {"energy": 0.0, "variable_fee": 0.0, "vat": 0.0, "total": 0.0}
+            for tariff in TARIFFS
+        }
+        self.last_reset: datetime = dt_util.now().replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+        self._unsub_market: CALLBACK_TYPE | None = None
+        # Costs are persisted per entry, so saving them never rewrites the
+        # other entries' state or the shared market data
+        self.ledger_store = EntryLedgerStore(hass, entry.entry_id)
+        self._stored_state: dict[str, Any] | None = None
+        self.save_stats: dict[str, int] = {"dirty": 0, "scheduled": 0, "written": 0}
+        # Bumped when the published prices or costs change; entities memoize
+        # against it
+        self.data_version = 0
+        self._versioned_costs: tuple[dict[str, float], datetime] | None = None
+        # Listeners subscribed to topics, and what was last published to them
+        self._topic_listeners: dict[
+            CALLBACK_TYPE, tuple[CALLBACK_TYPE, frozenset[str]]
+        ] = {}
+        self._published_prices_version = 0
+        self._published_grid: tuple[Any, ...] = ()
+        self._published_status: tuple[bool, bool, bool] | None = None
+        self._published_current: dict[str, float | None] = {}
+        self._published_slot: datetime | None = None
+        self._published_costs: dict[str, float] = {}
+
+        # Metered increments not yet in a persisted ledger snapshot
+        self.journal = CostJournal(entry_journal_path(hass, entry.entry_id))
+        self.journal_watermark = 0.0
+        # Watermark of the last compaction; records up to journal_watermark
+        # are dropped from the file once a snapshot including them is saved
+        self._compacted_watermark = 0.0
+        self._journal_tail: list[JournalRecord] = []
+        self._unsub_journal_flush: CALLBACK_TYPE | None = None
+
+        # Energy of the open quarter-hour, priced once when the slot closes
+        self._pricing: Callable[[datetime], dict[str, Any]] | None = None
+        self._bucket_start: datetime | None = None
+        self._bucket_kwh = 0.0
+        self._bucket_last = 0.0
+        # Energy of closed slots that had no price for any tariff
+        self.unpriced_kwh = 0.0
+
+    @property
+    def api_connected(self) -> bool:
+        """Return the connection state of the shared market coordinator."""
+        return self.market.api_connected
+
+    @property
+    def last_update_time(self) -> datetime | None:
+        """Return when market prices were last updated."""
+        return self.market.last_update_time
+
+    @property
+    def stale(self) -> bool:
+        """Return whether the market data is cached and not yet refreshed."""
+        return self.market.stale
+
+    async def async_load_ledger(self) -> None:
+        """Read this entry's persisted costs."""
+        try:
+            self._stored_state = await self.ledger_store.async_load()
+        except Exception as e:
+            _LOGGER.error("Error loading cost ledger: %s", e)
+
+    @callback
+    def async_attach(self) -> None:
+        """Restore persisted state and start following market updates."""
+        self.market.async_register_entry(self)
+        state, self._stored_state = self._stored_state, None
+        if state is None:
+            state = self.market.async_claim_legacy_state(self.entry_id)
+        self.restore(state)
+        self._async_publish()
+        self._unsub_market = self.market.async_add_listener(self._handle_market_update)
+
+    async def async_detach(self) -> None:
+        """Stop following market updates and persist the final state."""
+        if self._unsub_market is not None:
+            self._unsub_market()
+            self._unsub_market = None
+        self.market.async_unregister_entry(self.entry_id)
+        await self.async_persist()
+
+    async def async_persist(self) -> None:
+        """Settle the open slot, then write the journal and the costs."""
+        self._close_bucket()
+        await self.async_flush_journal()
+        await self.async_save_ledger()
+
+    async def async_handle_final_write(self, _event: Event) -> None:
+        """Persist the final state when Home Assistant stops."""
+        # Config entries are not unloaded on stop, so async_detach never runs
+        await self.async_persist()
+
+    @callback
+    def async_schedule_ledger_save(self) -> None:
+        """Mark the costs dirty and write them once changes settle."""
+        self.save_stats["dirty"] += 1
+        self.save_stats["scheduled"] += 1
+        self.ledger_store.async_delay_save(self._ledger_to_save, self.market.save_delay)
+
+    def _ledger_to_save(self) -> dict[str, Any]:
+        """Serialize this entry's costs (called at write time)."""
+        self.save_stats["dirty"] = 0
+        self.save_stats["written"] += 1
+        return self.as_dict()
+
+    async def async_save_ledger(self) -> bool:
+        """Save the costs immediately and compact the journal behind them."""
+        try:
+            ledger = self._ledger_to_save()
+            await self.ledger_store.async_save(ledger)
+        except Exception as e:
+            _LOGGER.error("Error saving cost ledger: %s", e)
+            return False
+        await self.async_compact_journal(ledger.get("journal_watermark", 0.0))
+        return True
+
+    @property
+    def needs_ledger_flush(self) -> bool:
+        """Return whether costs are unsaved or the journal can be compacted."""
+        return bool(self.save_stats["dirty"]) or (
+            self.journal_watermark > self._compacted_watermark
+        )
+
+    async def async_load_journal(self) -> None:
+        """Read the journal records that are not in the restored ledger."""
+        self._journal_tail = await self.hass.async_add_executor_job(
+            self.journal.read_since, self.journal_watermark
+        )
+        if self._journal_tail:
+            _LOGGER.info(
+                "Recovering %d metered increments from the cost journal",
+                len(self._journal_tail),
+            )
+
+    @callback
+    def async_set_pricing(self, pricing: Callable[[datetime], dict[str, Any]]) -> None:
+        """Set how metered energy is priced and replay the recovered journal."""
+        self._pricing = pricing
+        self.async_replay_journal()
+
+    @callback
+    def async_replay_journal(self) -> None:
+        """Apply recovered journal records, priced at the time they were metered."""
+        if self._pricing is None:
+            return
+        records, self._journal_tail = self._journal_tail, []
+        if not records:
+            return
+        for timestamp, _slot, delta in records:
+            when = datetime.fromtimestamp(timestamp, UTC)
+            self._apply_costs(delta, self._pricing(when))
+            self.journal_watermark = max(self.journal_watermark, timestamp)
+        self._async_publish()
+        self.async_schedule_ledger_save()
+
+    @callback
+    def _schedule_journal_flush(self) -> None:
+        """Write buffered journal records after a short batching delay."""
+        if self._unsub_journal_flush is None:
+            self._unsub_journal_flush = async_call_later(
+                self.hass, JOURNAL_FLUSH_SECONDS, self._handle_journal_flush
+            )
+
+    @callback
+    def _handle_journal_flush(self, _now: datetime) -> None:
+        """Flush the journal at the end of a batching delay."""
+        self._unsub_journal_flush = None
+        self.hass.async_create_task(self.async_flush_journal())
+
+    async def async_flush_journal(self) -> None:
+        """Write buffered journal records to disk."""
+        if self._unsub_journal_flush is not None:
+            self._unsub_journal_flush()
+            self._unsub_journal_flush = None
+        if data := self.journal.take():
+            try:
+                await self.hass.async_add_executor_job(self.journal.write, data)
+            except OSError as e:
+                _LOGGER.error("Error writing cost journal: %s", e)
+
+    async def async_compact_journal(self, watermark: float) -> None:
+        """Drop journal records folded into a persisted ledger snapshot."""
+        try:
+            await self.hass.async_add_executor_job(self.journal.compact, watermark)
+        except OSError as e:
+            _LOGGER.error("Error compacting cost journal: %s", e)
+            return
+        self._compacted_watermark = max(self._compacted_watermark, watermark)
+
+    @callback
+    def _handle_market_update(self) -> None:
+        """Republish new market data merged with this entry's state."""
+        if (
+            self._bucket_start is not None
+            and dt_util.utcnow() >= self._bucket_start + SLOT_DURATION
+        ):
+            self._close_bucket()
+        self._check_monthly_reset()
+        self.last_update_success = self.market.last_update_success
+        self._async_publish()
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for updates; a frozenset context subscribes to those topics."""
+        if not isinstance(context, frozenset):
+            return super().async_add_listener(update_callback, context)
+
+        @callback
+        def remove_listener() -> None:
+            self._topic_listeners.pop(remove_listener, None)
+
+        self._topic_listeners[remove_listener] = (update_callback, context)
+        return remove_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify every listener, whatever its topics."""
+        super().async_update_listeners()
+        for update_callback, _topics in list(self._topic_listeners.values()):
+            update_callback()
+
+    @callback
+    def async_publish(self, topics: set[str]) -> None:
+        """Notify the listeners subscribed to any of the given topics."""
+        if not topics:
+            return
+        super().async_update_listeners()
+        for update_callback, subscribed in list(self._topic_listeners.values()):
+            if not subscribed.isdisjoint(topics):
+                update_callback()
+
+    @callback
+    def _async_publish(self) -> None:
+        """Rebuild the entry data and publish the topics that changed."""
+        self.data = self._build_data()
+        self.async_publish(self._changed_topics())
+
+    def _changed_topics(self) -> set[str]:
+        """Return the topics whose data changed since they were last published."""
+        topics: set[str] = set()
+
+        status = (self.api_connected, self.last_update_success, self.stale)
+        if status != self._published_status:
+            self._published_status = status
+            topics.add(TOPIC_STATUS)
+
+        if self.final_prices.version != self._published_prices_version:
+            self._published_prices_version = self.final_prices.version
+            topics.add(TOPIC_PRICES)
+
+        grid = tuple(self.data.get(key) for key in GRID_KEYS)
+        if grid != self._published_grid:
+            self._published_grid = grid
+            topics.add(TOPIC_GRID)
+
+        now = dt_util.utcnow()
+        day, slot = SLOT_CALENDAR.locate(now)
+        if (slot_start := day.slot_start(slot)) != self._published_slot:
+            self._published_slot = slot_start
+            topics.add(TOPIC_SLOT)
+
+        current = self.final_prices.prices_at(now)
+        for tariff, price in current.items():
+            if tariff not in self._published_current or (
+                self._published_current[tariff] != price
+            ):
+                topics.add(price_topic(tariff))
+        self._published_current = current
+
+        costs = self.data["costs"]
+        for tariff, cost in costs.items():
+            if self._published_costs.get(tariff) != cost:
+                topics.update((TOPIC_COSTS, cost_topic(tariff)))
+        self._published_costs = dict(costs)
+        return topics
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Rebuild entry data from the latest market data (no network I/O)."""
+        self._check_monthly_reset()
+        return self._build_data()
+
+    def _check_monthly_reset(self) -> None:
+        """Reset accumulated costs at the start of a new month."""
+        now = dt_util.now()
+        if now.day == 1 and self.last_reset.month != now.month:
+            _LOGGER.info("Monthly cost reset triggered")
+            self.costs = dict.fromkeys(self.costs, 0.0)
+            self.last_reset = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            self.async_schedule_ledger_save()
+
+    def _build_data(self) -> dict[str, Any]:
+        """Merge market data with this entry's costs and refresh final prices."""
+        data = dict(self.market.data or {})
+        window = data.get("price_window")
+        if window is not None and window.today is not None:
+            today = window.today
+        else:
+            today = SLOT_CALENDAR.to_local(dt_util.utcnow()).date()
+        refreshed = self.final_prices.refresh(data, today)
+        data["costs"] = self._live_costs()
+        data["cost_breakdown"] = self.cost_breakdown
+        data["last_reset"] = self.last_reset
+        # Costs are updated in place, so they are compared against a copy
+        costs = (dict(data["costs"]), self.last_reset)
+        if refreshed or costs != self._versioned_costs:
+            self._versioned_costs = costs
+            self.data_version += 1
+        return data
+
+    @callback
+    def async_add_energy(self, delta: float) -> None:
+        """
+        Add a metered energy increment to the bucket of the current slot.
+        The increment is only summed and journaled; tariff prices are applied
+        once per quarter-hour when the bucket closes.
+        """
+        now = dt_util.utcnow()
+        day, slot = SLOT_CALENDAR.locate(now)
+        start = day.slot_start(slot)
+        if start != self._bucket_start:
+            if self._close_bucket():
+                self._async_publish()
+            self._bucket_start = start
+        self._bucket_kwh += delta
+        self._bucket_last = self.journal.append(now.timestamp(), slot, delta)
+        self._schedule_journal_flush()
+
+    @callback
+    def async_migrate_cost(self, tariff: str, value: float) -> None:
+        """Take over a cost restored from a sensor state of an older version."""
+        self.costs[tariff] = value
+        self._async_publish()
+        self.async_schedule_ledger_save()
+
+    def _close_bucket(self) -> bool:
+        """
+        Price the energy of the open slot and add it to the costs.
+        A slot without any price is settled as unpriced energy, so it is
+        never charged at the price of a later slot.
+        """
+        start, kwh = self._bucket_start, self._bucket_kwh
+        self._bucket_start = None
+        self._bucket_kwh = 0.0
+        if start is None or not kwh:
+            return False
+        prices = self._pricing(start) if self._pricing is not None else {}
+        if any(price is not None for price in prices.values()):
+            self._apply_costs(kwh, prices)
+        else:
+            _LOGGER.warning(
+                "No prices for the slot starting %s, %.3f kWh left unpriced",
+                start,
+                kwh,
+            )
+            self.unpriced_kwh += kwh
+        self.journal_watermark = max(self.journal_watermark, self._bucket_last)
+        self.async_schedule_ledger_save()
+        return True
+
+    @staticmethod
+    def _price_components(
+        price_data: dict[str, float] | float,
+    ) -> tuple[float, float, float, float]:
+        """Return (energy, variable_fee, vat, total) of a tariff price."""
+        if isinstance(price_data, dict):
+            return (
+                price_data.get("energy", 0.0),
+                price_data.get("variable_fee", 0.0),
+                price_data.get("vat", 0.0),
+                price_data.get("total", 0.0),
+            )
+        return float(price_data), 0.0, 0.0, float(price_data)
+
+    def _live_costs(self) -> dict[str, float]:
+        """Return the costs including the open slot, priced on demand."""
+        if not self._bucket_kwh or self._pricing is None:
+            return self.costs
+        costs = dict(self.costs)
+        for tariff, price_data in self._pricing(self._bucket_start).items():
+            if price_data is not None:
+                total = self._price_components(price_data)[3]
+                costs[tariff] = costs.get(tariff, 0.0) + self._bucket_kwh * total
+        return costs
+
+    def _apply_costs(
+        self, delta: float, prices: dict[str, dict[str, float] | float | None]
+    ) -> None:
+        """Add an energy increment priced per tariff to the accumulated costs."""
+        for key in TARIFFS:
+            if key not in self.costs:
+                self.costs[key] = 0.0
+            if key not in self.cost_breakdown:
+                self.cost_breakdown[key] = {
+                    "energy": 0.0,
+                    "variable_fee": 0.0,
+                    "vat": 0.0,
+                    "total": 0.0,
+                }
+
+        for tariff, price_data in prices.items():
+            if price_data is None:
+                continue
+
+            energy_price, variable_fee, vat_amount, total_price = (
+                self._price_components(price_data)
+            )
+            self.costs[tariff] += delta * total_price
+            breakdown = self.cost_breakdown.setdefault(
+                tariff,
+                {"energy": 0.0, "variable_fee": 0.0, "vat": 0.0, "total": 0.0},
+            )
+            breakdown["energy"] += delta * energy_price
+            breakdown["variable_fee"] += delta * variable_fee
+            breakdown["vat"] += delta * vat_amount
+            breakdown["total"] += delta * total_price
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the persistable state of this entry."""
+        return {
+            "costs": self.costs,
+            "cost_breakdown": self.cost_breakdown,
+            "last_reset": self.last_reset.isoformat() if self.last_reset else None,
+            "journal_watermark": self.journal_watermark,
+            "unpriced_kwh": self.unpriced_kwh,
+        }
+
+    def restore(self, state: dict[str, Any] | None) -> None:
+        """Restore persisted costs, breakdown, reset timestamp and unpriced energy."""
+        if not state:
+            return
+        if saved_costs := state.get("costs"):
+            self.costs.update(
+                {k: float(v) for k, v in saved_costs.items() if k in self.costs}
+            )
+        if saved_breakdown := state.get("cost_breakdown"):
+            for tariff, breakdown in saved_breakdown.items():
+                if tariff not in self.cost_breakdown:
+                    continue
+                self.cost_breakdown[tariff].update(
+                    {
+                        kk: float(vv)
+                        for kk, vv in breakdown.items()
+                        if kk in self.cost_breakdown[tariff]
+                    }
+                )
+        if last_reset := state.get("last_reset"):
+            self.last_reset = dt_util.parse_datetime(last_reset) or self.last_reset
+        self.journal_watermark = float(state.get("journal_watermark") or 0.0)
+        self.unpriced_kwh = float(state.get("unpriced_kwh") or 0.0)
+
+
+async def async_get_market_coordinator(
+    hass: HomeAssistant,
+) -> EnergyHubDataCoordinator:
+    """Return the shared market-data coordinator, creating it on first use."""
+    market: EnergyHubDataCoordinator | None = hass.data.get(DATA_MARKET_COORDINATOR)
+    if market is None:
+        market = EnergyHubDataCoordinator(hass)
+        hass.data[DATA_MARKET_COORDINATOR] = market
+    await market.async_ensure_ready()
+    return market
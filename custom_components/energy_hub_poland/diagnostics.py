@@ -9,7 +9,7 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN
-from .coordinator import EnergyHubDataCoordinator
+from .coordinator import EnergyHubEntryCoordinator
 
 TO_REDACT = {
     "api_key",
@@ -22,38 +22,53 @@ async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: ConfigEntry
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
-    coordinator: EnergyHubDataCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator: EnergyHubEntryCoordinator = hass.data[DOMAIN][entry.entry_id]
+    market = coordinator.market
 
     return {
         "config_entry": async_redact_data(entry.as_dict(), TO_REDACT),
         "coordinator_data": {
             "api_connected": coordinator.api_connected,
+            "stale": coordinator.stale,
             "last_update": (
                 coordinator.last_update_time.isoformat()
                 if coordinator.last_update_time
                 else None
             ),
             "today_date": (
-                coordinator._internal_data["today_date"].isoformat()
-                if coordinator._internal_data.get("today_date")
-                else None
-            ),
-            "tomorrow_date": (
-                coordinator._internal_data["tomorrow_date"].isoformat()
-                if coordinator._internal_data.get("tomorrow_date")
-                else None
-            ),
-            "today_prices_count": (
-                len(coordinator._internal_data["today"])
-                if coordinator._internal_data.get("today")
-                else 0
-            ),
-            "tomorrow_prices_count": (
-                len(coordinator._internal_data["tomorrow"])
-                if coordinator._internal_data.get("tomorrow")
-                else 0
+                market._prices.today.isoformat() if market._prices.today else None
             ),
+            "price_days": {
+                prices.day.isoformat(): len(prices.quarter_hours())
+                for prices in market._prices.days()
+            },
             "costs": coordinator.costs,
             "last_reset": coordinator.last_reset.isoformat(),
         },
+        "cost_journal": {
+            "watermark": coordinator.journal_watermark,
+            "pending_records": coordinator.journal.pending,
+            "unpriced_kwh": coordinator.unpriced_kwh,
+        },
+        "pse_response_cache": dict(market.pse_client.cache_stats),
+        "conditional_requests": {
+            "pse": dict(market.pse_client.conditional_stats),
+            "pge": dict(market.api_client.conditional_stats),
+        },
+        "persistence": {
+            "save_delay": market.save_delay,
+            **market.save_stats,
+            "ledger": dict(coordinator.save_stats),
+        },
+        "price_archive": {
+            "directory": market.archive.directory,
+            "archived_days": sorted(day.isoformat() for day in market._archived),
+        },
+        "circuit_breakers": {
+            **{
+                name: breaker.as_dict()
+                for name, breaker in market.pse_client.breakers.items()
+            },
+            "pge": market.api_client.breaker.as_dict(),
+        },
     }
@@ -1,23 +1,36 @@
 """Base entity for Energy Hub Poland."""
 
+from collections.abc import Callable
+from typing import Any, TypeVar
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
-from .coordinator import EnergyHubDataCoordinator
+from .coordinator import (
+    TOPIC_COSTS,
+    TOPIC_GRID,
+    TOPIC_PRICES,
+    TOPIC_STATUS,
+    EnergyHubEntryCoordinator,
+)
+
+_T = TypeVar("_T")
 
 
 class EnergyHubEntity(CoordinatorEntity):
     """Base entity for Energy Hub Poland."""
 
     _attr_has_entity_name = True
+    # Coordinator topics whose updates rewrite this entity's state
+    _topics: tuple[str, ...] = (TOPIC_PRICES, TOPIC_GRID, TOPIC_COSTS)
 
     def __init__(
-        self, coordinator: EnergyHubDataCoordinator, entry: ConfigEntry
+        self, coordinator: EnergyHubEntryCoordinator, entry: ConfigEntry
     ) -> None:
         """Initialize the entity."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, self._topic_context(self._topics))
         self.entry = entry
         self._config = {**entry.data, **entry.options}
         self._attr_device_info = DeviceInfo(
@@ -27,3 +40,28 @@ class EnergyHubEntity(CoordinatorEntity):
             model="Energy Hub",
             sw_version="v1.3.2",
         )
+        self._memo: dict[str, tuple[tuple[int, Any], Any]] = {}
+
+    @staticmethod
+    def _topic_context(topics: tuple[str, ...]) -> frozenset[str]:
+        """Return the listener context of a set of topics."""
+        # Availability follows the coordinator status, so every entity needs it
+        return frozenset((TOPIC_STATUS, *topics))
+
+    def _subscribe(self, *topics: str) -> None:
+        """Replace the topics of an entity whose topics depend on its config."""
+        self.coordinator_context = self._topic_context(topics)
+
+    def _memoized(self, key: str, compute: Callable[[], _T], since: Any = None) -> _T:
+        """
+        Return a value computed at most once per coordinator data version.
+        Values that also depend on something outside the coordinator data
+        (e.g. the current slot) pass it as `since`.
+        """
+        version = (self.coordinator.data_version, since)
+        cached = self._memo.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        value = compute()
+        self._memo[key] = (version, value)
+        return value
@@ -0,0 +1,154 @@
+"""Final (fees and VAT included) prices shared by the entities of an entry."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from .slots import SLOT_CALENDAR, DaySlots
+from .tariffs import FeeSchedule, TariffTable, table_index
+
+DAY_LABELS = ("today", "tomorrow")
+
+# Market views a cached day is derived from. They are cached on the market's
+# DayPrices objects, which are only replaced when a day's prices change, so
+# comparing identities detects changes and an identical fetch rebuilds nothing.
+_SOURCE_KEYS = tuple(
+    f"{label}{suffix}"
+    for label in DAY_LABELS
+    for suffix in ("", "_quarters", "_avg", "_max_price")
+)
+
+
+class FinalPrices:
+    """
+    Per-slot final prices of the enabled tariffs for today and tomorrow,
+    plus the hourly prices and statistics of the dynamic tariff.
+    refresh() rebuilds them only when the market publishes new day prices
+    or the local day changes; an options change reloads the entry and with
+    it this cache. Entity state writes then only read from it.
+    """
+
+    def __init__(
+        self,
+        tariffs: Iterable[str],
+        tables: Mapping[str, TariffTable],
+        fees: Mapping[str, FeeSchedule],
+    ) -> None:
+        """Initialize an empty cache for the given tariffs."""
+        self.tariffs = tuple(
+            tariff for tariff in tariffs if tariff == "dynamic" or tariff in tables
+        )
+        self.tables = tables
+        self.fees = fees
+        self.today: date | None = None
+        # Bumped on every rebuild
+        self.version = 0
+        self.hourly: dict[str, dict[int, float]] = {}
+        self.stats: dict[str, dict[str, float]] = {}
+        self._slots: dict[date, dict[str, tuple[float | None, ...]]] = {}
+        self._sources: tuple[Any, ...] = (None,) * len(_SOURCE_KEYS)
+
+    def refresh(self, data: Mapping[str, Any], today: date) -> bool:
+        """Rebuild the cache if the market data or the day changed."""
+        sources = tuple(data.get(key) for key in _SOURCE_KEYS)
+        if today == self.today and all(
+            new is old for new, old in zip(sources, self._sources, strict=True)
+        ):
+            return False
+
+        self.today, self._sources = today, sources
+        self.version += 1
+        self._slots = {}
+        dynamic = self.fees["dynamic"]
+        for offset, label in enumerate(DAY_LABELS):
+            slots = SLOT_CALENDAR.day(today + timedelta(days=offset))
+            hourly = data.get(label) or {}
+            rows = self._slots[slots.day] = {}
+            for tariff in self.tariffs:
+                if tariff == "dynamic":
+                    quarters = data.get(f"{label}_quarters") or {}
+                    rows[tariff] = self._dynamic_row(slots, hourly, quarters)
+                else:
+                    rows[tariff] = self._fixed_row(tariff, slots)
+            self.hourly[label] = {
+                hour: dynamic.total(price) for hour, price in hourly.items()
+            }
+            self.stats[label] = self._day_stats(dynamic, hourly, data, label)
+        return True
+
+    def _dynamic_row(
+        self,
+        slots: DaySlots,
+        hourly: Mapping[int, float],
+        quarters: Mapping[int, float],
+    ) -> tuple[float | None, ...]:
+        """Return the final dynamic price of every slot of a day."""
+        schedule = self.fees["dynamic"]
+        row: list[float | None] = []
+        for slot, wall in enumerate(slots.wall):
+            price = quarters.get(slot)
+            if price is None:
+                price = hourly.get(wall // 4)
+            row.append(None if price is None else schedule.total(price))
+        return tuple(row)
+
+    def _fixed_row(self, tariff: str, slots: DaySlots) -> tuple[float | None, ...]:
+        """Return the final price of a fixed-price tariff for every slot."""
+        zones = self.tables[tariff].zones
+        by_zone = self.fees[tariff].by_zone
+        row: list[float | None] = []
+        for slot in range(slots.count):
+            index = table_index(SLOT_CALENDAR.to_local(slots.slot_start(slot)))
+            components = by_zone.get(zones[index])
+            row.append(None if components is None else components["total"])
+        return tuple(row)
+
+    @staticmethod
+    def _day_stats(
+        schedule: FeeSchedule,
+        hourly: Mapping[int, float],
+        data: Mapping[str, Any],
+        label: str,
+    ) -> dict[str, float]:
+        """Return the final min, max and average of a day's hourly prices."""
+        if not hourly:
+            return {}
+        avg = data.get(f"{label}_avg")
+        if avg is None:
+            avg = sum(hourly.values()) / len(hourly)
+        stats = {
+            "min": schedule.total(min(hourly.values())),
+            "max": schedule.total(max(hourly.values())),
+            "avg": schedule.total(avg),
+        }
+        if (max_price := data.get(f"{label}_max_price")) is not None:
+            stats["max_price"] = schedule.total(max_price)
+        return stats
+
+    def price_at(self, tariff: str, when: datetime) -> float | None:
+        """
+        Return the final price of a tariff at an instant.
+        Raises KeyError if the instant or tariff is not cached.
+        """
+        day, slot = SLOT_CALENDAR.locate(when)
+        return self._slots[day.day][tariff][slot]
+
+    def series(self, tariff: str) -> tuple[list[datetime], list[float | None]]:
+        """Return the slot starts (UTC) and final prices of today and tomorrow."""
+        starts: list[datetime] = []
+        prices: list[float | None] = []
+        for day, rows in self._slots.items():
+            if (row := rows.get(tariff)) is None:
+                continue
+            slots = SLOT_CALENDAR.day(day)
+            starts.extend(slots.slot_start(slot) for slot in range(slots.count))
+            prices.extend(row)
+        return starts, prices
+
+    def prices_at(self, when: datetime) -> dict[str, float | None]:
+        """Return the final price of every cached tariff at an instant."""
+        day, slot = SLOT_CALENDAR.locate(when)
+        rows = self._slots.get(day.day, {})
+        return {tariff: row[slot] for tariff, row in rows.items()}
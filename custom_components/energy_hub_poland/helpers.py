@@ -2,12 +2,9 @@
 
 import functools
 import logging
-from datetime import datetime
-
-import holidays
+from datetime import date, datetime
 
 _LOGGER = logging.getLogger(__package__)
-_POLISH_HOLIDAYS = holidays.PL()
 
 
 @functools.lru_cache(maxsize=32)
@@ -32,24 +29,48 @@ def parse_hour_ranges(hour_ranges_str: str) -> list[tuple[int, int]]:
     return ranges
 
 
-def is_peak_time(dt: datetime, peak_hours: list[tuple[int, int]]) -> bool:
+# Peak schedules are compiled into 24-bit masks, bit n standing for hour n
+ALL_HOURS_MASK = (1 << 24) - 1
+
+
+def range_mask(start: int, end: int) -> int:
+    """
+    Return the mask of the hours from start up to (not including) end.
+    Ranges with end <= start cross midnight (e.g., 22-6).
+    """
+    if start < end:
+        mask = (1 << end) - (1 << start)
+    else:
+        mask = ((1 << 24) - (1 << start)) | ((1 << end) - 1)
+    return mask & ALL_HOURS_MASK
+
+
+def ranges_mask(hour_ranges: list[tuple[int, int]]) -> int:
+    """Return the mask of the hours covered by a list of (start, end) ranges."""
+    mask = 0
+    for start, end in hour_ranges:
+        mask |= range_mask(start, end)
+    return mask
+
+
+@functools.lru_cache(maxsize=32)
+def hour_mask(hour_ranges_str: str) -> int:
+    """Return the mask of the hours covered by a string of hour ranges."""
+    return ranges_mask(parse_hour_ranges(hour_ranges_str))
+
+
+def is_peak_time(dt: datetime, peak_hours: int | list[tuple[int, int]]) -> bool:
     """
-    Check if the hour of the given datetime falls within any of the peak hour ranges.
+    Check if the hour of the given datetime falls within the peak hours,
+    given as an hour mask or as a list of (start, end) ranges.
     Supports ranges that cross midnight (e.g., 22-6).
     """
-    for start, end in peak_hours:
-        if start < end:
-            # Normal range (e.g., 6-13)
-            if start <= dt.hour < end:
-                return True
-        else:
-            # Range crossing midnight (e.g., 22-6)
-            if dt.hour >= start or dt.hour < end:
-                return True
-    return False
+    if not isinstance(peak_hours, int):
+        peak_hours = ranges_mask(peak_hours)
+    return bool(peak_hours >> dt.hour & 1)
 
 
-def is_summer(dt: datetime) -> bool:
+def is_summer(dt: date) -> bool:
     """
     Determine if the given date falls within the 'Summer' season for energy tariffs.
     Polish energy providers define summer as April 1st to September 30th (inclusive).
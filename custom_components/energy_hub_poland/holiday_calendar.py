@@ -0,0 +1,96 @@
+"""Polish statutory holiday calendar for Energy Hub Poland."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+# First year of the current set of statutory holidays (3 May restored);
+# earlier years fall back to the holidays library
+RULES_FIRST_YEAR = 1990
+
+# (month, day, first year) of the holidays with a fixed date
+_FIXED_HOLIDAYS = (
+    (1, 1, RULES_FIRST_YEAR),
+    (1, 6, 2011),
+    (5, 1, RULES_FIRST_YEAR),
+    (5, 3, RULES_FIRST_YEAR),
+    (8, 15, RULES_FIRST_YEAR),
+    (11, 1, RULES_FIRST_YEAR),
+    (11, 11, RULES_FIRST_YEAR),
+    (12, 24, 2025),
+    (12, 25, RULES_FIRST_YEAR),
+    (12, 26, RULES_FIRST_YEAR),
+)
+
+# Holidays declared by a separate act for a single year
+_ONE_OFF_HOLIDAYS = (date(2018, 11, 12),)  # Centenary of independence
+
+# Days after Easter Sunday: Easter Sunday and Monday, Pentecost, Corpus Christi
+_EASTER_OFFSETS = (0, 1, 49, 60)
+
+
+def easter_sunday(year: int) -> date:
+    """Return the date of (Gregorian) Easter Sunday of a year."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    n = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * n) // 451
+    month, day = divmod(h + n - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def statutory_holidays(year: int) -> frozenset[date]:
+    """Return the Polish statutory public holidays of a year."""
+    easter = easter_sunday(year)
+    return frozenset(
+        [
+            *(
+                date(year, month, day)
+                for month, day, since in _FIXED_HOLIDAYS
+                if year >= since
+            ),
+            *(easter + timedelta(days=offset) for offset in _EASTER_OFFSETS),
+            *(day for day in _ONE_OFF_HOLIDAYS if day.year == year),
+        ]
+    )
+
+
+class HolidayCalendar:
+    """
+    Set-like view of the Polish public holidays.
+    Each year is computed once, on its first lookup, into a frozenset of
+    date ordinals, so a lookup is one dict and one set access. The holidays
+    library is only imported for years before the built-in rules apply.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty calendar."""
+        self._years: dict[int, frozenset[int]] = {}
+
+    def __contains__(self, day: object) -> bool:
+        """Return whether a date (or the date of a datetime) is a holiday."""
+        if not isinstance(day, date):
+            return False
+        ordinals = self._years.get(day.year)
+        if ordinals is None:
+            ordinals = self._years[day.year] = self._compute(day.year)
+        return day.toordinal() in ordinals
+
+    @staticmethod
+    def _compute(year: int) -> frozenset[int]:
+        """Return the date ordinals of the holidays of a year."""
+        if year >= RULES_FIRST_YEAR:
+            days = statutory_holidays(year)
+        else:
+            import holidays
+
+            days = frozenset(holidays.PL(years=year))
+        return frozenset(day.toordinal() for day in days)
+
+
+POLISH_HOLIDAYS = HolidayCalendar()
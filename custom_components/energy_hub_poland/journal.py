@@ -0,0 +1,107 @@
+"""Append-only journal of metered energy for Energy Hub Poland."""
+
+from __future__ import annotations
+
+import os
+import struct
+import threading
+
+# UTC timestamp, quarter-hour slot of the local day, energy in kWh
+RECORD = struct.Struct("<dHd")
+
+JournalRecord = tuple[float, int, float]
+
+
+class CostJournal:
+    """
+    Write-ahead journal of energy increments of one config entry.
+    Records are buffered in memory by append() (event loop) and written with
+    a single fsync by write() (executor). The cost ledger stores the
+    timestamp of the last record it includes, so after a crash only the
+    records past that watermark are replayed, and compact() drops the rest.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the journal of a file."""
+        self.path = path
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._last_timestamp = 0.0
+
+    def append(self, timestamp: float, slot: int, delta: float) -> float:
+        """Buffer a record and return its (strictly increasing) timestamp."""
+        timestamp = max(timestamp, self._last_timestamp + 1e-6)
+        self._last_timestamp = timestamp
+        self._buffer += RECORD.pack(timestamp, slot, delta)
+        return timestamp
+
+    def take(self) -> bytes:
+        """Return and clear the records buffered since the last call."""
+        data, self._buffer = bytes(self._buffer), bytearray()
+        return data
+
+    @property
+    def pending(self) -> int:
+        """Return the number of buffered records."""
+        return len(self._buffer) // RECORD.size
+
+    def write(self, data: bytes) -> None:
+        """Append buffered records to the file and fsync once."""
+        if not data:
+            return
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "ab") as file:
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+
+    def _read(self) -> bytes:
+        """Return every complete record in the file."""
+        try:
+            with open(self.path, "rb") as file:
+                data = file.read()
+        except FileNotFoundError:
+            return b""
+        # A crash may leave half a record at the end
+        return data[: len(data) - len(data) % RECORD.size]
+
+    def read_since(self, watermark: float) -> list[JournalRecord]:
+        """Return the records written after a watermark."""
+        with self._lock:
+            data = self._read()
+        records = [
+            record for record in RECORD.iter_unpack(data) if record[0] > watermark
+        ]
+        if records:
+            self._last_timestamp = max(self._last_timestamp, records[-1][0])
+        return records
+
+    def compact(self, watermark: float) -> None:
+        """Drop the records already folded into a persisted snapshot."""
+        with self._lock:
+            data = self._read()
+            if not data:
+                return
+            kept = b"".join(
+                RECORD.pack(*record)
+                for record in RECORD.iter_unpack(data)
+                if record[0] > watermark
+            )
+            if len(kept) == len(data):
+                return
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "wb") as file:
+                file.write(kept)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self.path)
+
+    def remove(self) -> None:
+        """Delete the journal file of a removed entry."""
+        with self._lock:
+            self._buffer = bytearray()
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
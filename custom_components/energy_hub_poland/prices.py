@@ -0,0 +1,256 @@
+"""Quarter-hour price storage for Energy Hub Poland."""
+
+from __future__ import annotations
+
+import functools
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from .slots import SLOT_CALENDAR, SLOT_MINUTES
+
+WALL_QUARTERS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_day(text: str) -> date:
+    """Parse an ISO date; PSE payloads only ever carry a couple of days."""
+    return date.fromisoformat(text)
+
+
+def parse_dtime(dtime: str) -> tuple[date, int] | None:
+    """
+    Map a PSE 'YYYY-MM-DD HH:MM[:SS]' period end to (day, wall-clock quarter).
+    Quarter 0 is 00:00-00:15, so '00:15' is quarter 0 and '00:00' closes the
+    last quarter of the previous day. Use DaySlots.slot_for_wall to turn the
+    quarter into a slot of a DST day.
+    """
+    try:
+        minutes = int(dtime[11:13]) * 60 + int(dtime[14:16])
+        day = _parse_day(dtime[:10])
+    except (TypeError, ValueError):
+        return None
+    quarter = (minutes + SLOT_MINUTES - 1) // SLOT_MINUTES - 1
+    if quarter < 0:
+        return day - timedelta(days=1), WALL_QUARTERS_PER_DAY - 1
+    return day, quarter
+
+
+def price_at(data: Mapping[str, Any], when: datetime) -> float | None:
+    """
+    Return the price at an instant, preferring quarter-hour resolution.
+    Instants outside today are looked up in the price window, if any.
+    """
+    day, slot = SLOT_CALENDAR.locate(when)
+    window = data.get("price_window")
+    if window is not None and window.today is not None and day.day != window.today:
+        prices = window.get(day.day)
+        return prices.get_slot(slot) if prices is not None else None
+    quarters = data.get("today_quarters")
+    if quarters and (price := quarters.get(slot)) is not None:
+        return price
+    hourly = data.get("today")
+    return hourly.get(SLOT_CALENDAR.to_local(when).hour) if hourly else None
+
+
+class DayPrices(Mapping[int, float]):
+    """
+    Prices of one delivery day in quarter-hour resolution.
+    Values live in an array('d') with one entry per slot of the local day
+    (92/96/100 around DST) and a validity mask. As a mapping it is the
+    hourly view (local hour -> average of the known quarters), derived
+    lazily and cached until the next write.
+    """
+
+    __slots__ = (
+        "_hourly",
+        "_quarters",
+        "_stats",
+        "_valid",
+        "_values",
+        "day",
+        "slots",
+    )
+
+    def __init__(self, day: date) -> None:
+        """Initialize an empty day."""
+        self.day = day
+        self.slots = SLOT_CALENDAR.day(day)
+        self._values = array("d", bytes(8 * self.slots.count))
+        self._valid = bytearray(self.slots.count)
+        self._hourly: dict[int, float] | None = None
+        self._quarters: dict[int, float] | None = None
+        self._stats: dict[str, Any] | None = None
+
+    @classmethod
+    def from_hourly(cls, day: date, prices: Mapping[int, float | None]) -> DayPrices:
+        """Build a day from hourly prices, spreading each over its quarters."""
+        result = cls(day)
+        for hour, price in prices.items():
+            if price is not None:
+                result.fill_hour(int(hour), price)
+        return result
+
+    @classmethod
+    def from_slots(cls, day: date, values: Iterable[float | None]) -> DayPrices:
+        """Build a day from a per-slot list with None for gaps."""
+        result = cls(day)
+        for slot, value in enumerate(values):
+            if value is not None and slot < result.slots.count:
+                result.set_slot(slot, value)
+        return result
+
+    def copy(self) -> DayPrices:
+        """Return an independent copy."""
+        result = DayPrices(self.day)
+        result._values[:] = self._values
+        result._valid[:] = self._valid
+        return result
+
+    def set_slot(self, slot: int, value: float) -> None:
+        """Store the price of one quarter-hour."""
+        self._values[slot] = value
+        self._valid[slot] = 1
+        self._invalidate()
+
+    def set_wall(self, quarter: int, value: float, fold: int = 0) -> None:
+        """Store the price of a wall-clock quarter (skipped if it does not exist)."""
+        if (slot := self.slots.slot_for_wall(quarter, fold)) is not None:
+            self.set_slot(slot, value)
+
+    def get_slot(self, slot: int) -> float | None:
+        """Return the price of one quarter-hour, None if unknown."""
+        return self._values[slot] if self._valid[slot] else None
+
+    def fill_hour(self, hour: int, value: float, only_missing: bool = False) -> None:
+        """Set every quarter of a local hour, optionally keeping known ones."""
+        for slot in self.slots.hour_slots[hour]:
+            if not (only_missing and self._valid[slot]):
+                self._values[slot] = value
+                self._valid[slot] = 1
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        """Drop the derived views after a write."""
+        self._hourly = self._quarters = self._stats = None
+
+    @property
+    def is_complete(self) -> bool:
+        """Return True when every quarter-hour has a price."""
+        return all(self._valid)
+
+    def quarter_hours(self) -> dict[int, float]:
+        """Return the known prices keyed by slot."""
+        if self._quarters is None:
+            values, valid = self._values, self._valid
+            self._quarters = {
+                slot: values[slot] for slot in range(len(valid)) if valid[slot]
+            }
+        return self._quarters
+
+    def hourly(self) -> dict[int, float]:
+        """Return hourly averages of the known quarter-hour prices."""
+        if self._hourly is None:
+            values, valid = self._values, self._valid
+            hourly: dict[int, float] = {}
+            for hour, slots in enumerate(self.slots.hour_slots):
+                known = [values[slot] for slot in slots if valid[slot]]
+                if known:
+                    hourly[hour] = sum(known) / len(known)
+            self._hourly = hourly
+        return self._hourly
+
+    def stats(self) -> dict[str, Any]:
+        """Return the daily average and the cheapest/most expensive hour."""
+        if self._stats is None:
+            hourly = self.hourly()
+            if not hourly:
+                self._stats = {}
+            else:
+                min_hour = min(hourly, key=hourly.__getitem__)
+                max_hour = max(hourly, key=hourly.__getitem__)
+                self._stats = {
+                    "avg": round(sum(hourly.values()) / len(hourly), 4),
+                    "min_hour": min_hour,
+                    "max_hour": max_hour,
+                    "max_price": hourly[max_hour],
+                }
+        return self._stats
+
+    def to_slots(self) -> list[float | None]:
+        """Return a per-slot list with None for gaps (for storage)."""
+        return [
+            self._values[slot] if self._valid[slot] else None
+            for slot in range(len(self._valid))
+        ]
+
+    def __getitem__(self, hour: int) -> float:
+        """Return the hourly price."""
+        return self.hourly()[hour]
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over hours with a known price."""
+        return iter(self.hourly())
+
+    def __len__(self) -> int:
+        """Return the number of hours with a known price."""
+        return len(self.hourly())
+
+    def __repr__(self) -> str:
+        """Return a short representation for logs."""
+        return f"DayPrices({self.day.isoformat()}, {sum(self._valid)} slots)"
+
+
+class PriceWindow:
+    """
+    Rolling window of day prices indexed by date.
+    Days live in a fixed ring addressed by the date ordinal, so moving to a
+    new day only advances the `today` pointer and nothing is copied. The
+    window covers today, tomorrow and size - 2 past days; older days are
+    overwritten when their ring position is reused.
+    """
+
+    def __init__(self, size: int) -> None:
+        """Initialize an empty window."""
+        self._ring: list[DayPrices | None] = [None] * size
+        self.today: date | None = None
+
+    def advance(self, today: date) -> None:
+        """Move the window to a new local day."""
+        self.today = today
+
+    def _in_window(self, day: date) -> bool:
+        """Return whether a day is covered by the window."""
+        if self.today is None:
+            return True
+        offset = (day - self.today).days
+        return 2 - len(self._ring) <= offset <= 1
+
+    def get(self, day: date) -> DayPrices | None:
+        """Return the prices of a day, None if unknown or out of the window."""
+        prices = self._ring[day.toordinal() % len(self._ring)]
+        if prices is None or prices.day != day or not self._in_window(day):
+            return None
+        return prices
+
+    def relative(self, offset: int) -> DayPrices | None:
+        """Return the prices of the day `offset` days from today."""
+        if self.today is None:
+            return None
+        return self.get(self.today + timedelta(days=offset))
+
+    def put(self, prices: DayPrices) -> None:
+        """Store the prices of a day."""
+        self._ring[prices.day.toordinal() % len(self._ring)] = prices
+
+    def days(self) -> list[DayPrices]:
+        """Return the known days of the window, oldest first."""
+        return sorted(
+            (
+                prices
+                for prices in self._ring
+                if prices is not None and self._in_window(prices.day)
+            ),
+            key=lambda prices: prices.day,
+        )
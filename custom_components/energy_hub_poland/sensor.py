@@ -4,7 +4,6 @@
 import logging
 from datetime import datetime
 from typing import Any
-from zoneinfo import ZoneInfo
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -22,26 +21,14 @@ from homeassistant.util import dt as dt_util
 from .const import (
     CONF_ENABLED_TARIFFS,
     CONF_ENERGY_SENSOR,
-    CONF_G11_SETTINGS,
-    CONF_G12_SETTINGS,
-    CONF_G12N_SETTINGS,
-    CONF_G12W_SETTINGS,
-    CONF_G13_SETTINGS,
     CONF_NETWORK_VARIABLE_FEE,
     CONF_NETWORK_VARIABLE_FEE_DYNAMIC,
-    CONF_NETWORK_VARIABLE_FEE_G12_OFFPEAK,
-    CONF_NETWORK_VARIABLE_FEE_G12_PEAK,
-    CONF_NETWORK_VARIABLE_FEE_G12N_OFFPEAK,
-    CONF_NETWORK_VARIABLE_FEE_G12N_PEAK,
-    CONF_NETWORK_VARIABLE_FEE_G12W_OFFPEAK,
-    CONF_NETWORK_VARIABLE_FEE_G12W_PEAK,
-    CONF_NETWORK_VARIABLE_FEE_G13_OFFPEAK,
-    CONF_NETWORK_VARIABLE_FEE_G13_PEAK1,
-    CONF_NETWORK_VARIABLE_FEE_G13_PEAK2,
     CONF_OPERATION_MODE,
     CONF_PRICE_UNIT,
     CONF_SENSOR_TYPE,
     CONF_VAT_RATE,
+    CONF_WINDOW_HOURS,
+    DEFAULT_WINDOW_HOURS,
     DOMAIN,
     ICONS,
     MODE_COMPARISON,
@@ -51,16 +38,27 @@ from .const import (
     SENSOR_TYPE_DAILY,
     SENSOR_TYPE_TOTAL_INCREASING,
     UNIT_MWH,
+    WINDOW_HOURS_OPTIONS,
+)
+from .coordinator import (
+    TARIFFS,
+    TOPIC_COSTS,
+    TOPIC_GRID,
+    TOPIC_PRICES,
+    TOPIC_SLOT,
+    EnergyHubEntryCoordinator,
+    cost_topic,
+    price_topic,
 )
-from .coordinator import EnergyHubDataCoordinator
 from .entity import EnergyHubEntity as EnergyHubBaseEntity
+from .prices import price_at
+from .slots import SLOT_CALENDAR
 from .tariffs import (
-    get_current_g11_price,
-    get_current_g12_price,
-    get_current_g12n_price,
-    get_current_g12w_price,
-    get_current_g13_price,
+    ZONE_PEAK,
+    PriceComponents,
+    table_index,
 )
+from .windows import WINDOW_KINDS
 
 _LOGGER = logging.getLogger(__package__)
 
@@ -69,7 +67,7 @@ async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: Any
 ) -> None:
     """Set up Energy Hub sensors from a config entry."""
-    coordinator: EnergyHubDataCoordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator: EnergyHubEntryCoordinator = hass.data[DOMAIN][entry.entry_id]
     config = {**entry.data, **entry.options}
     mode = config.get(CONF_OPERATION_MODE)
     _LOGGER.debug(
@@ -80,18 +78,20 @@ async def async_setup_entry(
     if mode == MODE_DYNAMIC:
         sensors.extend(setup_dynamic_sensors(coordinator, entry))
         sensors.extend(setup_pse_sensors(coordinator, entry))
+        sensors.extend(setup_window_sensors(coordinator, entry, config))
     elif mode == MODE_G12:
         sensors.append(CurrentPriceSensor(coordinator, entry, "g12", config))
     elif mode == MODE_G12W:
         sensors.append(CurrentPriceSensor(coordinator, entry, "g12w", config))
     elif mode == MODE_COMPARISON:
         sensors.extend(setup_comparison_sensors(coordinator, entry, config))
+        sensors.extend(setup_window_sensors(coordinator, entry, config))
 
     async_add_entities(sensors, update_before_add=True)
 
 
 def setup_dynamic_sensors(
-    coordinator: EnergyHubDataCoordinator, entry: ConfigEntry
+    coordinator: EnergyHubEntryCoordinator, entry: ConfigEntry
 ) -> list[SensorEntity]:
     """Set up dynamic tariff (RCE) sensors."""
     return [
@@ -110,7 +110,7 @@ def setup_dynamic_sensors(
 
 
 def setup_pse_sensors(
-    coordinator: EnergyHubDataCoordinator, entry: ConfigEntry
+    coordinator: EnergyHubEntryCoordinator, entry: ConfigEntry
 ) -> list[SensorEntity]:
     """Set up additional PSE-specific sensors."""
     return [
@@ -119,8 +119,20 @@ def setup_pse_sensors(
     ]
 
 
+def setup_window_sensors(
+    coordinator: EnergyHubEntryCoordinator, entry: ConfigEntry, config: dict[str, Any]
+) -> list[SensorEntity]:
+    """Set up cheapest and most expensive window sensors of the chosen lengths."""
+    return [
+        PriceWindowSensor(coordinator, entry, int(hours), kind)
+        for hours in config.get(CONF_WINDOW_HOURS, DEFAULT_WINDOW_HOURS)
+        if hours in WINDOW_HOURS_OPTIONS
+        for kind in WINDOW_KINDS
+    ]
+
+
 def setup_comparison_sensors(
-    coordinator: EnergyHubDataCoordinator, entry: ConfigEntry, config: dict[str, Any]
+    coordinator: EnergyHubEntryCoordinator, entry: ConfigEntry, config: dict[str, Any]
 ) -> list[SensorEntity]:
     """Set up comparison mode sensors (enabled tariffs only)."""
     enabled_tariffs = config.get(
@@ -169,12 +181,13 @@ def setup_comparison_sensors(
 class EnergyHubSensorEntity(EnergyHubBaseEntity, SensorEntity):
     """Base sensor entity for Energy Hub Poland."""
 
-    def __init__(self, coordinator: EnergyHubDataCoordinator, entry: ConfigEntry):
+    def __init__(self, coordinator: EnergyHubEntryCoordinator, entry: ConfigEntry):
         """Initialize the sensor entity."""
         super().__init__(coordinator, entry)
         self._price_unit = self._config.get(CONF_PRICE_UNIT) or self._config.get(
             "unit_type", "kwh"
         )
+        self._fees = coordinator.fee_schedules
 
     @property
     def native_unit_of_measurement(self) -> str | None:
@@ -195,84 +208,20 @@ class EnergyHubSensorEntity(EnergyHubBaseEntity, SensorEntity):
         return round(value, 4)
 
     def _calculate_total_price(
-        self, energy_price: float | None, tariff: str
+        self, energy_price: float | None, tariff: str, zone: int = ZONE_PEAK
     ) -> float | None:
-        """Apply network fees and VAT to the energy price."""
-        if energy_price is None:
+        """Apply network fees and VAT of a tariff zone to the energy price."""
+        # The coordinator compiles a schedule for every tariff it can price
+        if energy_price is None or (schedule := self._fees.get(tariff)) is None:
             return None
-
-        # 1. Get variable network fee for this tariff
-        variable_fee = None
-        if tariff == "dynamic":
-            variable_fee = self._config.get(CONF_NETWORK_VARIABLE_FEE_DYNAMIC)
-        elif tariff == "g12":
-            tariff_settings = self._config.get(f"{tariff}_settings", {})
-            # For G12, check if price is peak or offpeak
-            if energy_price == tariff_settings.get("price_peak"):
-                variable_fee = tariff_settings.get(CONF_NETWORK_VARIABLE_FEE_G12_PEAK)
-            else:
-                variable_fee = tariff_settings.get(CONF_NETWORK_VARIABLE_FEE_G12_OFFPEAK)
-            # Fallback to generic if not set
-            if variable_fee is None:
-                variable_fee = tariff_settings.get(CONF_NETWORK_VARIABLE_FEE)
-        elif tariff == "g12w":
-            tariff_settings = self._config.get(f"{tariff}_settings", {})
-            if energy_price == tariff_settings.get("price_peak"):
-                variable_fee = tariff_settings.get(CONF_NETWORK_VARIABLE_FEE_G12W_PEAK)
-            else:
-                variable_fee = tariff_settings.get(CONF_NETWORK_VARIABLE_FEE_G12W_OFFPEAK)
-            if variable_fee is None:
-                variable_fee = tariff_settings.get(CONF_NETWORK_VARIABLE_FEE)
-        elif tariff == "g12n":
-            tariff_settings = self._config.get(f"{tariff}_settings", {})
-            if energy_price == tariff_settings.get("price_peak"):
-                variable_fee = tariff_settings.get(CONF_NETWORK_VARIABLE_FEE_G12N_PEAK)
-            else:
-                variable_fee = tariff_settings.get(CONF_NETWORK_VARIABLE_FEE_G12N_OFFPEAK)
-            if variable_fee is None:
-                variable_fee = tariff_settings.get(CONF_NETWORK_VARIABLE_FEE)
-        elif tariff == "g13":
-            tariff_settings = self._config.get(f"{tariff}_settings", {})
-            if energy_price == tariff_settings.get("price_peak_1"):
-                variable_fee = tariff_settings.get(CONF_NETWORK_VARIABLE_FEE_G13_PEAK1)
-            elif energy_price == tariff_settings.get("price_peak_2"):
-                variable_fee = tariff_settings.get(CONF_NETWORK_VARIABLE_FEE_G13_PEAK2)
-            else:
-                variable_fee = tariff_settings.get(CONF_NETWORK_VARIABLE_FEE_G13_OFFPEAK)
-            if variable_fee is None:
-                variable_fee = tariff_settings.get(CONF_NETWORK_VARIABLE_FEE)
-        else:
-            tariff_settings = self._config.get(f"{tariff}_settings", {})
-            # Try new generic key
-            variable_fee = tariff_settings.get(CONF_NETWORK_VARIABLE_FEE)
-            # If not found, try legacy tariff-specific key (e.g., network_variable_fee_g11)
-            if variable_fee is None:
-                legacy_key = f"network_variable_fee_{tariff}"
-                variable_fee = tariff_settings.get(legacy_key)
-
-        # Fallback to global variable fee if tariff-specific is not set or 0
-        if variable_fee is None or float(variable_fee) == 0.0:
-            variable_fee = self._config.get(CONF_NETWORK_VARIABLE_FEE, 0.0)
-
-        variable_fee = float(variable_fee)
-
-        total_net = energy_price + variable_fee
-
-        # 2. Apply VAT
-        vat_rate_str = self._config.get(CONF_VAT_RATE, "0")
-        try:
-            vat_rate = float(vat_rate_str) / 100
-        except (ValueError, TypeError):
-            vat_rate = 0.0
-
-        return total_net * (1 + vat_rate)
+        return schedule.total(energy_price, zone)
 
 
 class EnergyConsumerEntity(EnergyHubSensorEntity, RestoreEntity):
     """Base class for entities that consume and process energy sensor readings."""
 
     def __init__(
-        self, coordinator: EnergyHubDataCoordinator, entry: ConfigEntry
+        self, coordinator: EnergyHubEntryCoordinator, entry: ConfigEntry
     ) -> None:
         """Initialize the consumer entity."""
         super().__init__(coordinator, entry)
@@ -315,38 +264,26 @@ class EnergyConsumerEntity(EnergyHubSensorEntity, RestoreEntity):
         self._last_energy_reading = current_energy
         return energy_delta
 
-    def _get_tariff_prices(self) -> dict[str, float | None]:
-        """Get the current price for all supported tariffs."""
-        now = dt_util.now()
-        poland_tz = ZoneInfo("Europe/Warsaw")
-        poland_now = now.astimezone(poland_tz)
+    def _get_tariff_prices(
+        self, when: datetime | None = None
+    ) -> dict[str, PriceComponents | None]:
+        """Get the price breakdown of all tariffs now (or at a given instant)."""
+        now = when or dt_util.now()
+        poland_now = SLOT_CALENDAR.to_local(now)
 
         if not self.coordinator.data:
             return {}
 
-        today_prices = self.coordinator.data.get("today", {})
-
-        prices = {
-            "dynamic": today_prices.get(poland_now.hour),
-            "g11": get_current_g11_price(self._config.get(CONF_G11_SETTINGS, {})),
-            "g12": get_current_g12_price(
-                poland_now, self._config.get(CONF_G12_SETTINGS, {})
-            ),
-            "g12w": get_current_g12w_price(
-                poland_now, self._config.get(CONF_G12W_SETTINGS, {})
-            ),
-            "g12n": get_current_g12n_price(
-                poland_now, self._config.get(CONF_G12N_SETTINGS, {})
-            ),
-            "g13": get_current_g13_price(
-                poland_now, self._config.get(CONF_G13_SETTINGS, {})
-            ),
-        }
-
-        # Apply fees and VAT to all
+        index = table_index(poland_now)
+        dynamic = price_at(self.coordinator.data, poland_now)
         return {
-            tariff: self._calculate_total_price(price, tariff)
-            for tariff, price in prices.items()
+            "dynamic": (
+                None if dynamic is None else self._fees["dynamic"].components(dynamic)
+            ),
+            **{
+                tariff: self._fees[tariff].by_zone.get(table.zones[index])
+                for tariff, table in self.coordinator.tariff_tables.items()
+            },
         }
 
 
@@ -358,13 +295,14 @@ class TariffCostSensor(EnergyHubSensorEntity):
 
     def __init__(
         self,
-        coordinator: EnergyHubDataCoordinator,
+        coordinator: EnergyHubEntryCoordinator,
         entry: ConfigEntry,
         tariff: str,
     ) -> None:
         """Initialize the tariff cost sensor."""
         super().__init__(coordinator, entry)
         self._tariff = tariff
+        self._subscribe(cost_topic(tariff))
         self._attr_translation_key = f"cost_{tariff}"
         self._attr_unique_id = f"cost_{tariff}_{entry.entry_id}"
 
@@ -395,8 +333,7 @@ class TariffCostSensor(EnergyHubSensorEntity):
                             val,
                             self._tariff,
                         )
-                        self.coordinator.costs[self._tariff] = val
-                        self.coordinator.async_set_updated_data(self.coordinator.data)
+                        self.coordinator.async_migrate_cost(self._tariff, val)
                 except (ValueError, TypeError):
                     pass
 
@@ -406,11 +343,12 @@ class RecommendationSensor(EnergyConsumerEntity):
 
     _attr_device_class = SensorDeviceClass.ENUM
     _attr_state_class = None
+    _topics = (TOPIC_COSTS, *(price_topic(tariff) for tariff in TARIFFS))
     _attr_icon = ICONS.get("recommendation")
     _attr_options = ["dynamiczna", "g11", "g12", "g12w", "g12n", "g13", "brak_danych"]
 
     def __init__(
-        self, coordinator: EnergyHubDataCoordinator, entry: ConfigEntry
+        self, coordinator: EnergyHubEntryCoordinator, entry: ConfigEntry
     ) -> None:
         """Initialize the recommendation sensor."""
         super().__init__(coordinator, entry)
@@ -435,10 +373,13 @@ class RecommendationSensor(EnergyConsumerEntity):
                 )
             )
 
+        # Metered energy is priced per quarter-hour by the coordinator; this
+        # also replays increments recovered from the cost journal
+        self.coordinator.async_set_pricing(self._get_tariff_prices)
+
     def _process_energy_delta(self, delta: float) -> None:
-        """Apply energy delta to each tariff's accumulated cost in the coordinator."""
-        prices = self._get_tariff_prices()
-        self.coordinator.async_update_costs(delta, prices)
+        """Add the energy delta to the coordinator's current quarter-hour bucket."""
+        self.coordinator.async_add_energy(delta)
 
     @property
     def native_value(self) -> str:
@@ -451,16 +392,12 @@ class RecommendationSensor(EnergyConsumerEntity):
                 return "dynamiczna" if cheapest == "dynamic" else cheapest
 
             # Fallback to current instantaneous prices
-            prices = self._get_tariff_prices()
-            mapping = {
-                "dynamiczna": prices.get("dynamic"),
-                "g11": prices.get("g11"),
-                "g12": prices.get("g12"),
-                "g12w": prices.get("g12w"),
-                "g12n": prices.get("g12n"),
-                "g13": prices.get("g13"),
+            prices = self.coordinator.final_prices.prices_at(dt_util.now())
+            filtered = {
+                "dynamiczna" if k == "dynamic" else k: v
+                for k, v in prices.items()
+                if v is not None
             }
-            filtered = {k: float(v) for k, v in mapping.items() if v is not None}
 
             if not filtered:
                 return "brak_danych"
@@ -496,7 +433,7 @@ class CurrentPriceSensor(EnergyHubSensorEntity):
 
     def __init__(
         self,
-        coordinator: EnergyHubDataCoordinator,
+        coordinator: EnergyHubEntryCoordinator,
         entry: ConfigEntry,
         tariff: str,
         config: dict | None = None,
@@ -504,6 +441,11 @@ class CurrentPriceSensor(EnergyHubSensorEntity):
         """Initialize the price sensor."""
         super().__init__(coordinator, entry)
         self._tariff = tariff
+        # Fixed-price attributes never change; dynamic ones list day prices
+        if tariff == "dynamic":
+            self._subscribe(price_topic(tariff), TOPIC_PRICES)
+        else:
+            self._subscribe(price_topic(tariff))
         self._attr_translation_key = f"current_price_{tariff}"
         self._attr_unique_id = f"current_price_{tariff}_{entry.entry_id}"
 
@@ -511,39 +453,34 @@ class CurrentPriceSensor(EnergyHubSensorEntity):
     def native_value(self) -> float | None:
         """Fetch and convert the current tariff price."""
         now = dt_util.now()
-        poland_tz = ZoneInfo("Europe/Warsaw")
-        poland_now = now.astimezone(poland_tz)
+        try:
+            return self._convert_price(
+                self.coordinator.final_prices.price_at(self._tariff, now)
+            )
+        except KeyError:
+            pass
 
+        # Not cached (e.g. at midnight before the market data rolls over)
+        poland_now = SLOT_CALENDAR.to_local(now)
         val = None
+        zone = ZONE_PEAK
         if self._tariff == "dynamic":
             if self.coordinator.data:
-                prices = self.coordinator.data.get("today", {})
-                val = prices.get(poland_now.hour) if prices else None
-        elif self._tariff == "g11":
-            val = get_current_g11_price(self._config.get(CONF_G11_SETTINGS, {}))
-        elif self._tariff == "g12":
-            val = get_current_g12_price(
-                poland_now, self._config.get(CONF_G12_SETTINGS, {})
-            )
-        elif self._tariff == "g12w":
-            val = get_current_g12w_price(
-                poland_now, self._config.get(CONF_G12W_SETTINGS, {})
-            )
-        elif self._tariff == "g12n":
-            val = get_current_g12n_price(
-                poland_now, self._config.get(CONF_G12N_SETTINGS, {})
-            )
-        elif self._tariff == "g13":
-            val = get_current_g13_price(
-                poland_now, self._config.get(CONF_G13_SETTINGS, {})
-            )
+                val = price_at(self.coordinator.data, poland_now)
+        elif (table := self.coordinator.tariff_tables.get(self._tariff)) is not None:
+            zone = table.zone_at(poland_now)
+            val = table.price_at(poland_now)
 
-        total_price = self._calculate_total_price(val, self._tariff)
+        total_price = self._calculate_total_price(val, self._tariff, zone)
         return self._convert_price(total_price)
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Expose price forecast tables and statistics for visualization."""
+        return self._memoized("attributes", self._price_attributes)
+
+    def _price_attributes(self) -> dict[str, Any]:
+        """Build the fee parameters and forecast tables of this tariff."""
         attrs = {}
 
         # Calculation parameters for all tariffs
@@ -570,31 +507,15 @@ class CurrentPriceSensor(EnergyHubSensorEntity):
                 return attrs
 
             # We want to show total prices (with fees and VAT) in attributes as well
-            today_raw = self.coordinator.data.get("today", {})
-            tomorrow_raw = self.coordinator.data.get("tomorrow", {})
-
-            today_total: dict[Any, float | None] = {
-                h: self._calculate_total_price(p, "dynamic")
-                for h, p in today_raw.items()
-            }
-            tomorrow_total: dict[Any, float | None] = {
-                h: self._calculate_total_price(p, "dynamic")
-                for h, p in tomorrow_raw.items()
-            }
-
+            final = self.coordinator.final_prices
             attrs.update(
                 {
-                    "today_prices": today_total,
-                    "tomorrow_prices": tomorrow_total,
+                    "today_prices": final.hourly.get("today", {}),
+                    "tomorrow_prices": final.hourly.get("tomorrow", {}),
                 }
             )
-            today_avg = self.coordinator.data.get("today_avg")
-            if today_avg is not None:
-                total_avg: float | None = self._calculate_total_price(
-                    today_avg, "dynamic"
-                )
-                if total_avg is not None:
-                    attrs["today_average"] = self._convert_price(total_avg)
+            if (today_avg := final.stats.get("today", {}).get("avg")) is not None:
+                attrs["today_average"] = self._convert_price(today_avg)
 
         return attrs
 
@@ -604,10 +525,11 @@ class MinMaxPriceSensor(EnergyHubSensorEntity):
 
     _attr_device_class = SensorDeviceClass.MONETARY
     _attr_state_class = None
+    _topics = (TOPIC_PRICES,)
 
     def __init__(
         self,
-        coordinator: EnergyHubDataCoordinator,
+        coordinator: EnergyHubEntryCoordinator,
         entry: ConfigEntry,
         day: str,
         mode: str,
@@ -624,16 +546,16 @@ class MinMaxPriceSensor(EnergyHubSensorEntity):
         """Return the min or max price for the specified day."""
         if not self.coordinator.data:
             return None
-        prices = self.coordinator.data.get(self._day, {})
-        if not prices:
-            return None
-        val = min(prices.values()) if self._mode == "min" else max(prices.values())
-        total_price = self._calculate_total_price(val, "dynamic")
-        return self._convert_price(total_price)
+        stats = self.coordinator.final_prices.stats.get(self._day)
+        return self._convert_price(stats[self._mode]) if stats else None
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        """Expose extra attributes for tests."""
+        """Expose the hour(s) at which the min or max price occurs."""
+        return self._memoized("attributes", self._extreme_hours)
+
+    def _extreme_hours(self) -> dict[str, Any]:
+        """Find the hour(s) at which the min or max price occurs."""
         if not self.coordinator.data:
             return {"prices": {}}
         prices = self.coordinator.data.get(self._day, {})
@@ -657,10 +579,11 @@ class AveragePriceSensor(EnergyHubSensorEntity):
 
     _attr_device_class = SensorDeviceClass.MONETARY
     _attr_state_class = None
+    _topics = (TOPIC_PRICES,)
 
     def __init__(
         self,
-        coordinator: EnergyHubDataCoordinator,
+        coordinator: EnergyHubEntryCoordinator,
         entry: ConfigEntry,
         day: str,
     ) -> None:
@@ -675,19 +598,8 @@ class AveragePriceSensor(EnergyHubSensorEntity):
         """Return the average price for the specified day."""
         if not self.coordinator.data:
             return None
-        val = self.coordinator.data.get(f"{self._day}_avg")
-
-        # Compatibility with tests that don't pre-calculate avg in coordinator
-        if val is None:
-            prices = self.coordinator.data.get(self._day, {})
-            if prices:
-                val = sum(prices.values()) / len(prices)
-
-        if val is None:
-            return None
-
-        total_price = self._calculate_total_price(val, "dynamic")
-        return self._convert_price(total_price)
+        stats = self.coordinator.final_prices.stats.get(self._day)
+        return self._convert_price(stats["avg"]) if stats else None
 
 
 class LowestPriceHourSensor(EnergyHubSensorEntity):
@@ -695,10 +607,11 @@ class LowestPriceHourSensor(EnergyHubSensorEntity):
 
     _attr_icon = ICONS.get("lowest_price_hour")
     _attr_state_class = None
+    _topics = (TOPIC_PRICES,)
 
     def __init__(
         self,
-        coordinator: EnergyHubDataCoordinator,
+        coordinator: EnergyHubEntryCoordinator,
         entry: ConfigEntry,
         day: str,
     ) -> None:
@@ -711,6 +624,10 @@ class LowestPriceHourSensor(EnergyHubSensorEntity):
     @property
     def native_value(self) -> str | None:
         """Return the formatted hour string (e.g. '14:00')."""
+        return self._memoized("native_value", self._lowest_hour)
+
+    def _lowest_hour(self) -> str | None:
+        """Find the cheapest hour of the day."""
         if not self.coordinator.data:
             return None
         hour = self.coordinator.data.get(f"{self._day}_min_hour")
@@ -728,12 +645,8 @@ class LowestPriceHourSensor(EnergyHubSensorEntity):
         """Return price for this hour as an attribute."""
         if not self.coordinator.data:
             return {}
-        prices = self.coordinator.data.get(self._day, {})
-        if not prices:
-            return {}
-        min_price = min(prices.values())
-        total_price = self._calculate_total_price(min_price, "dynamic")
-        return {"price": self._convert_price(total_price)}
+        stats = self.coordinator.final_prices.stats.get(self._day)
+        return {"price": self._convert_price(stats["min"])} if stats else {}
 
 
 class HighestPriceHourSensor(EnergyHubSensorEntity):
@@ -741,10 +654,11 @@ class HighestPriceHourSensor(EnergyHubSensorEntity):
 
     _attr_icon = ICONS.get("highest_price_hour")
     _attr_state_class = None
+    _topics = (TOPIC_PRICES,)
 
     def __init__(
         self,
-        coordinator: EnergyHubDataCoordinator,
+        coordinator: EnergyHubEntryCoordinator,
         entry: ConfigEntry,
         day: str,
     ) -> None:
@@ -767,9 +681,60 @@ class HighestPriceHourSensor(EnergyHubSensorEntity):
         """Return price for this hour as an attribute."""
         if not self.coordinator.data:
             return {}
-        price = self.coordinator.data.get(f"{self._day}_max_price")
-        total_price = self._calculate_total_price(price, "dynamic")
-        return {"price": self._convert_price(total_price)}
+        stats = self.coordinator.final_prices.stats.get(self._day) or {}
+        return {"price": self._convert_price(stats.get("max_price"))}
+
+
+class PriceWindowSensor(EnergyHubSensorEntity):
+    """Sensor for the start of the cheapest or most expensive upcoming window (RCE)."""
+
+    _attr_device_class = SensorDeviceClass.TIMESTAMP
+    _attr_state_class = None
+    # The window is looked up again as the current slot moves on
+    _topics = (TOPIC_PRICES, TOPIC_SLOT)
+
+    def __init__(
+        self,
+        coordinator: EnergyHubEntryCoordinator,
+        entry: ConfigEntry,
+        hours: int,
+        kind: str,
+    ) -> None:
+        """Initialize the price window sensor."""
+        super().__init__(coordinator, entry)
+        self._hours = hours
+        self._kind = kind
+        self._attr_translation_key = f"{kind}_window_{hours}h"
+        self._attr_unique_id = f"{kind}_window_{hours}h_{entry.entry_id}"
+        self._attr_icon = ICONS.get(f"{kind}_window")
+
+    def _window(self) -> dict[str, Any] | None:
+        """Return the best window that has not started before the current slot."""
+        now = dt_util.utcnow()
+        day, slot = SLOT_CALENDAR.locate(now)
+        return self._memoized(
+            "window",
+            lambda: self.coordinator.price_windows.find(self._hours, self._kind, now),
+            since=day.slot_start(slot),
+        )
+
+    @property
+    def native_value(self) -> datetime | None:
+        """Return the start of the window."""
+        window = self._window()
+        return window["start"] if window else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the end and average final price of the window."""
+        window = self._window()
+        if not window:
+            return {}
+        return {
+            "end": window["end"],
+            "average_price": self._convert_price(window["average_price"]),
+            "hours": self._hours,
+        }
 
 
 class KSELoadSensor(EnergyHubSensorEntity):
@@ -779,10 +744,11 @@ class KSELoadSensor(EnergyHubSensorEntity):
     _attr_native_unit_of_measurement = "MW"
     _attr_device_class = SensorDeviceClass.POWER
     _attr_state_class = SensorStateClass.MEASUREMENT
+    _topics = (TOPIC_GRID,)
 
     def __init__(
         self,
-        coordinator: EnergyHubDataCoordinator,
+        coordinator: EnergyHubEntryCoordinator,
         entry: ConfigEntry,
     ) -> None:
         """Initialize the load sensor."""
@@ -811,10 +777,11 @@ class KSEGenerationSensor(EnergyHubSensorEntity):
     _attr_native_unit_of_measurement = "MW"
     _attr_device_class = SensorDeviceClass.POWER
     _attr_state_class = SensorStateClass.MEASUREMENT
+    _topics = (TOPIC_GRID,)
 
     def __init__(
         self,
-        coordinator: EnergyHubDataCoordinator,
+        coordinator: EnergyHubEntryCoordinator,
         entry: ConfigEntry,
     ) -> None:
         """Initialize the generation sensor."""
@@ -0,0 +1,102 @@
+"""Quarter-hour slot calendar for Polish local time."""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+WARSAW_TZ = ZoneInfo("Europe/Warsaw")
+
+SLOT_MINUTES = 15
+SLOT_SECONDS = SLOT_MINUTES * 60
+SLOT_DURATION = timedelta(minutes=SLOT_MINUTES)
+
+# Days kept in the calendar; a handful around today is all anyone asks for
+MAX_CACHED_DAYS = 16
+
+
+class DaySlots:
+    """
+    The quarter-hour slots of one local day.
+    A regular day has 96 slots, the spring DST day 92 and the autumn one 100.
+    Slot i starts at start + i * 15 min (UTC); `wall` holds the wall-clock
+    quarter (hour * 4 + minute // 15) of every slot.
+    """
+
+    __slots__ = ("_by_wall", "count", "day", "end", "hour_slots", "start", "wall")
+
+    def __init__(self, day: date, tz: ZoneInfo) -> None:
+        """Precompute the slot layout of a local day."""
+        self.day = day
+        self.start = datetime.combine(day, time(), tz).astimezone(UTC)
+        self.end = datetime.combine(day + timedelta(days=1), time(), tz).astimezone(UTC)
+        self.count = int((self.end - self.start).total_seconds()) // SLOT_SECONDS
+
+        wall: list[int] = []
+        by_wall: dict[tuple[int, int], int] = {}
+        hour_slots: list[list[int]] = [[] for _ in range(24)]
+        for slot in range(self.count):
+            local = (self.start + slot * SLOT_DURATION).astimezone(tz)
+            quarter = local.hour * 4 + local.minute // SLOT_MINUTES
+            wall.append(quarter)
+            by_wall.setdefault((quarter, local.fold), slot)
+            hour_slots[local.hour].append(slot)
+        self.wall = tuple(wall)
+        self._by_wall = by_wall
+        self.hour_slots = tuple(tuple(slots) for slots in hour_slots)
+
+    def slot_at(self, when: datetime) -> int:
+        """Return the slot containing an instant of this day."""
+        return int((when - self.start).total_seconds()) // SLOT_SECONDS
+
+    def slot_start(self, slot: int) -> datetime:
+        """Return the UTC start of a slot (slot == count gives the day end)."""
+        return self.start + slot * SLOT_DURATION
+
+    def slot_for_wall(self, quarter: int, fold: int = 0) -> int | None:
+        """Return the slot of a wall-clock quarter, None if it does not exist."""
+        slot = self._by_wall.get((quarter, fold))
+        if slot is None and fold:
+            slot = self._by_wall.get((quarter, 0))
+        return slot
+
+    def __repr__(self) -> str:
+        """Return a short representation for logs."""
+        return f"DaySlots({self.day.isoformat()}, {self.count} slots)"
+
+
+class SlotCalendar:
+    """
+    Map instants to local days and quarter-hour slots.
+    Day layouts are computed once and the current day is remembered, so
+    "which slot is now" is a bounds check and a division.
+    """
+
+    def __init__(self, tz: ZoneInfo = WARSAW_TZ) -> None:
+        """Initialize the calendar for a time zone."""
+        self.tz = tz
+        self._days: dict[date, DaySlots] = {}
+        self._current: DaySlots | None = None
+
+    def day(self, day: date) -> DaySlots:
+        """Return the slot layout of a local day."""
+        slots = self._days.get(day)
+        if slots is None:
+            if len(self._days) >= MAX_CACHED_DAYS:
+                del self._days[next(iter(self._days))]
+            slots = self._days[day] = DaySlots(day, self.tz)
+        return slots
+
+    def to_local(self, when: datetime) -> datetime:
+        """Convert an aware datetime to local time."""
+        return when.astimezone(self.tz)
+
+    def locate(self, when: datetime) -> tuple[DaySlots, int]:
+        """Return the local day and slot containing an aware instant."""
+        current = self._current
+        if current is None or not current.start <= when < current.end:
+            current = self._current = self.day(when.astimezone(self.tz).date())
+        return current, current.slot_at(when)
+
+
+SLOT_CALENDAR = SlotCalendar()
@@ -0,0 +1,71 @@
+"""Persistent stores for Energy Hub Poland."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+# Version 1 kept prices, grid data and the costs in one document
+LEGACY_STORAGE_VERSION = 1
+
+CACHE_STORAGE_KEY = f"{DOMAIN}_cache"
+CACHE_STORAGE_VERSION = 2
+
+# Prefix of the per-entry cost ledgers
+LEDGER_STORAGE_KEY = f"{DOMAIN}_ledger"
+ENTRY_LEDGER_STORAGE_VERSION = 1
+
+# Top-level keys of the version 1 document that belong to the cost ledger
+LEDGER_FIELDS = ("costs", "cost_breakdown", "last_reset")
+
+
+def split_legacy_cache(
+    data: dict[str, Any],
+) -> tuple[dict[str, Any], dict[str, Any] | None]:
+    """Split a version 1 document into a price cache and the saved costs."""
+    ledger = None
+    if data.get("costs"):
+        ledger = {key: data.get(key) for key in LEDGER_FIELDS}
+    cache = {key: value for key, value in data.items() if key not in LEDGER_FIELDS}
+    return cache, ledger
+
+
+class PriceCacheStore(Store):
+    """
+    Store of market prices and grid data, rewritten only when they change.
+    Loading a version 1 document strips the costs out of it; they are kept
+    in `legacy_ledger` until the coordinator moves them to an entry's ledger.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        super().__init__(hass, CACHE_STORAGE_VERSION, CACHE_STORAGE_KEY)
+        self.legacy_ledger: dict[str, Any] | None = None
+
+    async def _async_migrate_func(
+        self,
+        old_major_version: int,
+        old_minor_version: int,
+        old_data: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Migrate an older document to the current schema."""
+        if old_major_version == LEGACY_STORAGE_VERSION:
+            old_data, self.legacy_ledger = split_legacy_cache(old_data)
+        return old_data
+
+
+def entry_ledger_key(entry_id: str) -> str:
+    """Return the storage key of a config entry's cost ledger."""
+    return f"{LEDGER_STORAGE_KEY}.{entry_id}"
+
+
+class EntryLedgerStore(Store):
+    """Small, frequently written store of one config entry's costs."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store of an entry."""
+        super().__init__(hass, ENTRY_LEDGER_STORAGE_VERSION, entry_ledger_key(entry_id))
@@ -1,55 +1,281 @@
 """Tariff pricing helpers for Energy Hub Poland."""
 
-from datetime import datetime
+import functools
+from datetime import date, datetime
 from typing import Any
 
-from .helpers import _POLISH_HOLIDAYS, is_peak_time, is_summer, parse_hour_ranges
+from .const import (
+    CONF_NETWORK_VARIABLE_FEE,
+    CONF_NETWORK_VARIABLE_FEE_DYNAMIC,
+    CONF_NETWORK_VARIABLE_FEE_G12_OFFPEAK,
+    CONF_NETWORK_VARIABLE_FEE_G12_PEAK,
+    CONF_NETWORK_VARIABLE_FEE_G12N_OFFPEAK,
+    CONF_NETWORK_VARIABLE_FEE_G12N_PEAK,
+    CONF_NETWORK_VARIABLE_FEE_G12W_OFFPEAK,
+    CONF_NETWORK_VARIABLE_FEE_G12W_PEAK,
+    CONF_NETWORK_VARIABLE_FEE_G13_OFFPEAK,
+    CONF_NETWORK_VARIABLE_FEE_G13_PEAK1,
+    CONF_NETWORK_VARIABLE_FEE_G13_PEAK2,
+    CONF_VAT_RATE,
+)
+from .helpers import ALL_HOURS_MASK, hour_mask, is_summer, range_mask
+from .holiday_calendar import POLISH_HOLIDAYS
 
+# Off-peak hours of G12n outside Sundays and holidays
+_G12N_OFFPEAK_MASK = range_mask(1, 5) | range_mask(13, 15)
 
-def get_current_g11_price(settings: dict[str, Any]) -> float | None:
-    return settings.get("price_peak")
 
+# Compiled tariff tables
+#
+# Each tariff is compiled once into a flat table with one zone id per
+# (season, day type, wall-clock quarter-hour), so resolving the zone and
+# energy price of an instant is a single index instead of season, holiday
+# and hour-range checks on every lookup.
 
-def get_current_g12_price(dt: datetime, settings: dict[str, Any]) -> float | None:
-    if is_summer(dt):
-        hours_str = settings.get("hours_peak_summer") or settings.get("hours_peak", "")
+SEASON_WINTER = 0
+SEASON_SUMMER = 1
+
+DAY_WORKDAY = 0
+DAY_SATURDAY = 1
+DAY_SUNDAY = 2
+DAY_HOLIDAY = 3
+DAY_TYPES = 4
+
+QUARTERS_PER_DAY = 96
+
+ZONE_OFFPEAK = 0
+ZONE_PEAK = 1
+ZONE_PEAK_2 = 2
+
+# Settings key holding the energy price of every zone of a tariff
+ZONE_PRICE_KEYS: dict[str, dict[int, str]] = {
+    "g11": {ZONE_PEAK: "price_peak"},
+    "g12": {ZONE_OFFPEAK: "price_offpeak", ZONE_PEAK: "price_peak"},
+    "g12w": {ZONE_OFFPEAK: "price_offpeak", ZONE_PEAK: "price_peak"},
+    "g12n": {ZONE_OFFPEAK: "price_offpeak", ZONE_PEAK: "price_peak"},
+    "g13": {
+        ZONE_OFFPEAK: "price_offpeak",
+        ZONE_PEAK: "price_peak_1",
+        ZONE_PEAK_2: "price_peak_2",
+    },
+}
+
+
+def day_type(day: date) -> int:
+    """Return the tariff day type of a local date."""
+    if day in POLISH_HOLIDAYS:
+        return DAY_HOLIDAY
+    weekday = day.weekday()
+    if weekday == 6:
+        return DAY_SUNDAY
+    if weekday == 5:
+        return DAY_SATURDAY
+    return DAY_WORKDAY
+
+
+@functools.lru_cache(maxsize=64)
+def _day_offset(day: date) -> int:
+    """Return the table index of the first quarter-hour of a local date."""
+    season = SEASON_SUMMER if is_summer(day) else SEASON_WINTER
+    return (season * DAY_TYPES + day_type(day)) * QUARTERS_PER_DAY
+
+
+def table_index(dt: datetime) -> int:
+    """Return the index of a local datetime into the compiled tables."""
+    return _day_offset(dt.date()) + dt.hour * 4 + dt.minute // 15
+
+
+def _zones_of_hours(*zone_hours: tuple[int, int]) -> list[int]:
+    """Return 24 hourly zones, the first matching (zone, hour mask) pair winning."""
+    return [
+        next((zone for zone, mask in zone_hours if mask >> hour & 1), ZONE_OFFPEAK)
+        for hour in range(24)
+    ]
+
+
+def _g11_zones(settings: dict[str, Any], season: int, day: int) -> list[int]:
+    return [ZONE_PEAK] * 24
+
+
+def _g12_zones(settings: dict[str, Any], season: int, day: int) -> list[int]:
+    key = "hours_peak_summer" if season == SEASON_SUMMER else "hours_peak_winter"
+    hours_str = settings.get(key) or settings.get("hours_peak", "")
+    return _zones_of_hours((ZONE_PEAK, hour_mask(hours_str)))
+
+
+def _g12w_zones(settings: dict[str, Any], season: int, day: int) -> list[int]:
+    if day != DAY_WORKDAY:
+        return [ZONE_OFFPEAK] * 24
+    return _g12_zones(settings, season, day)
+
+
+def _g12n_zones(settings: dict[str, Any], season: int, day: int) -> list[int]:
+    if day in (DAY_SUNDAY, DAY_HOLIDAY):
+        return [ZONE_OFFPEAK] * 24
+    return _zones_of_hours((ZONE_PEAK, ALL_HOURS_MASK & ~_G12N_OFFPEAK_MASK))
+
+
+def _g13_zones(settings: dict[str, Any], season: int, day: int) -> list[int]:
+    if day != DAY_WORKDAY:
+        return [ZONE_OFFPEAK] * 24
+    if season == SEASON_SUMMER:
+        peak_1 = settings.get("hours_peak_1_summer", "7-13")
+        peak_2 = settings.get("hours_peak_2_summer", "19-22")
     else:
-        hours_str = settings.get("hours_peak_winter") or settings.get("hours_peak", "")
+        peak_1 = settings.get("hours_peak_1_winter", "7-13")
+        peak_2 = settings.get("hours_peak_2_winter", "16-21")
+    return _zones_of_hours(
+        (ZONE_PEAK, hour_mask(peak_1)), (ZONE_PEAK_2, hour_mask(peak_2))
+    )
+
+
+_ZONE_RULES = {
+    "g11": _g11_zones,
+    "g12": _g12_zones,
+    "g12w": _g12w_zones,
+    "g12n": _g12n_zones,
+    "g13": _g13_zones,
+}
+
+
+class TariffTable:
+    """Zone and energy price of a tariff for every compiled table index."""
 
-    peak_hours = parse_hour_ranges(hours_str)
-    if is_peak_time(dt, peak_hours):
-        return settings.get("price_peak")
-    return settings.get("price_offpeak")
+    __slots__ = ("prices", "tariff", "zones")
 
+    def __init__(self, tariff: str, settings: dict[str, Any]) -> None:
+        """Compile the zones and prices of a tariff from its settings."""
+        rule = _ZONE_RULES[tariff]
+        zones = bytearray()
+        for season in (SEASON_WINTER, SEASON_SUMMER):
+            for day in range(DAY_TYPES):
+                for zone in rule(settings, season, day):
+                    zones.extend((zone,) * 4)
+        zone_prices = {
+            zone: settings.get(key) for zone, key in ZONE_PRICE_KEYS[tariff].items()
+        }
+        self.tariff = tariff
+        self.zones = bytes(zones)
+        self.prices: tuple[float | None, ...] = tuple(
+            zone_prices.get(zone) for zone in self.zones
+        )
 
-def get_current_g12w_price(dt: datetime, settings: dict[str, Any]) -> float | None:
-    if dt.weekday() >= 5 or dt.date() in _POLISH_HOLIDAYS:
-        return settings.get("price_offpeak")
-    return get_current_g12_price(dt, settings)
+    def zone_at(self, dt: datetime) -> int:
+        """Return the zone id at a local datetime."""
+        return self.zones[table_index(dt)]
 
+    def price_at(self, dt: datetime) -> float | None:
+        """Return the energy price at a local datetime."""
+        return self.prices[table_index(dt)]
 
-def get_current_g12n_price(dt: datetime, settings: dict[str, Any]) -> float | None:
-    if dt.weekday() == 6 or dt.date() in _POLISH_HOLIDAYS:
-        return settings.get("price_offpeak")
-    if (1 <= dt.hour < 5) or (13 <= dt.hour < 15):
-        return settings.get("price_offpeak")
-    return settings.get("price_peak")
 
+def compile_tariff_tables(config: dict[str, Any]) -> dict[str, TariffTable]:
+    """Compile the tables of every zoned tariff from an entry's config."""
+    return {
+        tariff: TariffTable(tariff, config.get(f"{tariff}_settings") or {})
+        for tariff in _ZONE_RULES
+    }
 
-def get_current_g13_price(dt: datetime, settings: dict[str, Any]) -> float | None:
-    if dt.weekday() >= 5 or dt.date() in _POLISH_HOLIDAYS:
-        return settings.get("price_offpeak")
 
-    summer = is_summer(dt)
-    if summer:
-        p1_hours = parse_hour_ranges(settings.get("hours_peak_1_summer", "7-13"))
-        p2_hours = parse_hour_ranges(settings.get("hours_peak_2_summer", "19-22"))
+# Compiled fee schedules
+#
+# Network fees and VAT depend only on the tariff zone, so they are resolved
+# once per entity instead of on every price calculation. Single-zone tariffs
+# (dynamic, G11) use ZONE_PEAK.
+
+PriceComponents = dict[str, float]
+
+# Settings key of the variable network fee of every zone of a tariff
+ZONE_FEE_KEYS: dict[str, dict[int, str]] = {
+    "g12": {
+        ZONE_OFFPEAK: CONF_NETWORK_VARIABLE_FEE_G12_OFFPEAK,
+        ZONE_PEAK: CONF_NETWORK_VARIABLE_FEE_G12_PEAK,
+    },
+    "g12w": {
+        ZONE_OFFPEAK: CONF_NETWORK_VARIABLE_FEE_G12W_OFFPEAK,
+        ZONE_PEAK: CONF_NETWORK_VARIABLE_FEE_G12W_PEAK,
+    },
+    "g12n": {
+        ZONE_OFFPEAK: CONF_NETWORK_VARIABLE_FEE_G12N_OFFPEAK,
+        ZONE_PEAK: CONF_NETWORK_VARIABLE_FEE_G12N_PEAK,
+    },
+    "g13": {
+        ZONE_OFFPEAK: CONF_NETWORK_VARIABLE_FEE_G13_OFFPEAK,
+        ZONE_PEAK: CONF_NETWORK_VARIABLE_FEE_G13_PEAK1,
+        ZONE_PEAK_2: CONF_NETWORK_VARIABLE_FEE_G13_PEAK2,
+    },
+}
+
+
+def _variable_fee(tariff: str, zone: int, config: dict[str, Any]) -> float:
+    """Resolve the variable network fee of a tariff zone from the config."""
+    if tariff == "dynamic":
+        fee = config.get(CONF_NETWORK_VARIABLE_FEE_DYNAMIC)
     else:
-        p1_hours = parse_hour_ranges(settings.get("hours_peak_1_winter", "7-13"))
-        p2_hours = parse_hour_ranges(settings.get("hours_peak_2_winter", "16-21"))
-
-    if is_peak_time(dt, p1_hours):
-        return settings.get("price_peak_1")
-    if is_peak_time(dt, p2_hours):
-        return settings.get("price_peak_2")
-    return settings.get("price_offpeak")
+        settings = config.get(f"{tariff}_settings") or {}
+        if tariff in ZONE_FEE_KEYS:
+            fee = settings.get(ZONE_FEE_KEYS[tariff].get(zone))
+            if fee is None:
+                fee = settings.get(CONF_NETWORK_VARIABLE_FEE)
+        else:
+            fee = settings.get(CONF_NETWORK_VARIABLE_FEE)
+            if fee is None:
+                # Legacy tariff-specific key (e.g. network_variable_fee_g11)
+                fee = settings.get(f"network_variable_fee_{tariff}")
+
+    # Fall back to the global fee if the tariff-specific one is not set or 0
+    if fee is None or float(fee) == 0.0:
+        fee = config.get(CONF_NETWORK_VARIABLE_FEE, 0.0)
+    return float(fee)
+
+
+def _vat_rate(config: dict[str, Any]) -> float:
+    """Return the VAT rate as a fraction."""
+    try:
+        return float(config.get(CONF_VAT_RATE, "0")) / 100
+    except (ValueError, TypeError):
+        return 0.0
+
+
+class FeeSchedule:
+    """
+    Network fee and VAT of every zone of one tariff.
+    For fixed-price tariffs the full (energy, variable_fee, vat, total)
+    breakdown of each zone is precomputed and returned by zone id.
+    """
+
+    __slots__ = ("by_zone", "fees", "tariff", "vat_rate")
+
+    def __init__(self, tariff: str, config: dict[str, Any]) -> None:
+        """Compile the fees of a tariff from an entry's config."""
+        zones = ZONE_PRICE_KEYS.get(tariff, {ZONE_PEAK: ""})
+        self.tariff = tariff
+        self.vat_rate = _vat_rate(config)
+        self.fees = {zone: _variable_fee(tariff, zone, config) for zone in zones}
+        settings = config.get(f"{tariff}_settings") or {}
+        self.by_zone: dict[int, PriceComponents] = {
+            zone: self.components(float(price), zone)
+            for zone, key in zones.items()
+            if key and (price := settings.get(key)) is not None
+        }
+
+    def components(self, energy_price: float, zone: int = ZONE_PEAK) -> PriceComponents:
+        """Return the price breakdown of an energy price in a zone."""
+        variable_fee = self.fees.get(zone, 0.0)
+        net = energy_price + variable_fee
+        vat = net * self.vat_rate
+        return {
+            "energy": energy_price,
+            "variable_fee": variable_fee,
+            "vat": vat,
+            "total": net + vat,
+        }
+
+    def total(self, energy_price: float, zone: int = ZONE_PEAK) -> float:
+        """Return the final price (fees and VAT included) of an energy price."""
+        return (energy_price + self.fees.get(zone, 0.0)) * (1 + self.vat_rate)
+
+
+def compile_fee_schedules(config: dict[str, Any]) -> dict[str, FeeSchedule]:
+    """Compile the fee schedules of the dynamic and every zoned tariff."""
+    return {tariff: FeeSchedule(tariff, config) for tariff in ("dynamic", *_ZONE_RULES)}
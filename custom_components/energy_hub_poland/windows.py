@@ -0,0 +1,104 @@
+"""Cheapest and most expensive contiguous price windows."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from datetime import datetime
+from typing import Any
+
+from .final_prices import FinalPrices
+from .slots import SLOT_DURATION, SLOT_MINUTES
+
+WINDOW_CHEAPEST = "cheapest"
+WINDOW_MOST_EXPENSIVE = "most_expensive"
+WINDOW_KINDS = (WINDOW_CHEAPEST, WINDOW_MOST_EXPENSIVE)
+
+
+class PriceWindows:
+    """
+    Best contiguous windows of a tariff's final prices, today and tomorrow.
+    The slots of both days are laid out back to back, so windows cross
+    midnight, and summed into a prefix array whenever the final prices are
+    rebuilt. For each requested (length, kind) a single backward pass then
+    records the best window starting at or after every slot, so looking one
+    up for the current time is a bisect and an index until prices change.
+    """
+
+    def __init__(self, final_prices: FinalPrices, tariff: str = "dynamic") -> None:
+        """Initialize the windows of a tariff of the shared final prices."""
+        self.final_prices = final_prices
+        self.tariff = tariff
+        # Final prices version the arrays below were built from
+        self.version = 0
+        self._starts: list[datetime] = []
+        self._prefix = [0.0]
+        # Running count of slots without a price; windows may not span them
+        self._gaps = [0]
+        self._best: dict[tuple[int, str], list[int | None]] = {}
+
+    def _sync(self) -> None:
+        """Rebuild the prefix sums if the final prices changed."""
+        if self.version == self.final_prices.version:
+            return
+        self.version = self.final_prices.version
+        self._starts, prices = self.final_prices.series(self.tariff)
+        prefix, gaps = [0.0], [0]
+        for price in prices:
+            prefix.append(prefix[-1] + (price or 0.0))
+            gaps.append(gaps[-1] + (price is None))
+        self._prefix, self._gaps = prefix, gaps
+        self._best = {}
+
+    def _best_from(self, slots: int, kind: str) -> list[int | None]:
+        """Return the best window start at or after every slot."""
+        key = (slots, kind)
+        if (best := self._best.get(key)) is not None:
+            return best
+        prefix, gaps = self._prefix, self._gaps
+        sign = 1.0 if kind == WINDOW_CHEAPEST else -1.0
+        best = [None] * (len(self._starts) + 1)
+        for start in range(len(self._starts) - slots, -1, -1):
+            candidate = best[start + 1]
+            if gaps[start + slots] == gaps[start]:
+                total = sign * (prefix[start + slots] - prefix[start])
+                # Ties go to the earlier window
+                if candidate is None or total <= sign * (
+                    prefix[candidate + slots] - prefix[candidate]
+                ):
+                    candidate = start
+            best[start] = candidate
+        self._best[key] = best
+        return best
+
+    def find(self, hours: float, kind: str, now: datetime) -> dict[str, Any] | None:
+        """
+        Return the best window of a length that has not started before the
+        slot containing `now`, or None if prices do not cover one.
+        """
+        if kind not in WINDOW_KINDS:
+            raise ValueError(f"Unknown window kind: {kind}")
+        slots = round(hours * 60 / SLOT_MINUTES)
+        self._sync()
+        if slots < 1 or not self._starts:
+            return None
+        first = max(bisect_right(self._starts, now) - 1, 0)
+        start = self._best_from(slots, kind)[first]
+        if start is None:
+            return None
+        total = self._prefix[start + slots] - self._prefix[start]
+        return {
+            "start": self._starts[start],
+            "end": self._starts[start] + slots * SLOT_DURATION,
+            "average_price": total / slots,
+        }
+
+
+def window_response(window: dict[str, Any] | None) -> dict[str, Any]:
+    """Return a window as a JSON-serializable service response."""
+    if window is None:
+        return {"start": None, "end": None, "average_price": None}
+    return {
+        "start": window["start"].isoformat(),
+        "end": window["end"].isoformat(),
+        "average_price": round(window["average_price"], 4),
+    }
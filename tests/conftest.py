@@ -13,8 +13,9 @@ def _identity_decorator(*args, **kwargs):
 
 
 class _StubCoordinatorEntity:
-    def __init__(self, coordinator=None):
+    def __init__(self, coordinator=None, context=None):
         self.coordinator = coordinator
+        self.coordinator_context = context
 
 
 class _StubSensorEntity:
@@ -30,6 +31,13 @@ class _StubRestoreEntity:
         return None
 
 
+class _StubStore:
+    def __init__(self, hass, version, key, *args, **kwargs):
+        self.hass = hass
+        self.version = version
+        self.key = key
+
+
 class _StubConfigFlow:
     pass
 
@@ -63,6 +71,10 @@ sys.modules.setdefault("homeassistant.config_entries", ha_ce)
 ha_def = MagicMock()
 sys.modules.setdefault("homeassistant.data_entry_flow", ha_def)
 
+ha_exc = MagicMock()
+ha_exc.ConfigEntryNotReady = type("ConfigEntryNotReady", (Exception,), {})
+sys.modules.setdefault("homeassistant.exceptions", ha_exc)
+
 ha_sensor = MagicMock()
 ha_sensor.SensorEntity = _StubSensorEntity
 sys.modules.setdefault("homeassistant.components.sensor", ha_sensor)
@@ -75,9 +87,20 @@ sys.modules.setdefault("homeassistant.helpers", MagicMock())
 
 ha_uc = MagicMock()
 ha_uc.CoordinatorEntity = _StubCoordinatorEntity
-ha_uc.DataUpdateCoordinator = type(
-    "DataUpdateCoordinator", (), {"__init__": lambda self, *a, **kw: None}
-)
+
+
+class _StubDataUpdateCoordinator:
+    def __init__(self, *args, **kwargs):
+        self.last_update_success = True
+
+    def async_add_listener(self, update_callback, context=None):
+        return lambda: None
+
+    def async_update_listeners(self):
+        pass
+
+
+ha_uc.DataUpdateCoordinator = _StubDataUpdateCoordinator
 ha_uc.UpdateFailed = Exception
 sys.modules.setdefault("homeassistant.helpers.update_coordinator", ha_uc)
 
@@ -99,7 +122,9 @@ sys.modules.setdefault("homeassistant.helpers.aiohttp_client", MagicMock())
 sys.modules.setdefault("homeassistant.helpers.config_validation", MagicMock())
 sys.modules.setdefault("homeassistant.helpers.entity_registry", MagicMock())
 sys.modules.setdefault("homeassistant.helpers.selector", MagicMock())
-sys.modules.setdefault("homeassistant.helpers.storage", MagicMock())
+ha_storage = MagicMock()
+ha_storage.Store = _StubStore
+sys.modules.setdefault("homeassistant.helpers.storage", ha_storage)
 
 
 def parse_datetime(dt_str):
@@ -141,6 +166,16 @@ from .common import (  # noqa: E402, I001
 )
 
 
+def pytest_collection_modifyitems(config, items):
+    """Skip wall-clock benchmarks unless they are selected with -m benchmark."""
+    if "benchmark" in (config.getoption("markexpr") or ""):
+        return
+    skip = pytest.mark.skip(reason="benchmark, run with -m benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest.fixture
 def sample_prices_today():
     return dict(SAMPLE_PRICES_TODAY)
@@ -1,12 +1,36 @@
-"""Tests for EnergyHubApiClient."""
+"""Tests for EnergyHubApiClient and PSEApiClient."""
 
+import asyncio
+import json
 from datetime import date
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from custom_components.energy_hub_poland.api import EnergyHubApiClient
-from custom_components.energy_hub_poland.const import API_URL
+from custom_components.energy_hub_poland import api as api_module
+from custom_components.energy_hub_poland.api import (
+    CircuitBreaker,
+    EnergyHubApiClient,
+    PSEApiClient,
+    retry_delay,
+)
+from custom_components.energy_hub_poland.const import (
+    API_URL,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_MAX_COOLDOWN_SECONDS,
+    PSE_RESPONSE_CACHE_TTL_SECONDS,
+    RETRY_MAX_DELAY_SECONDS,
+)
+
+
+def _make_response(payload, status=200, headers=None):
+    """Build a mocked aiohttp response carrying a JSON body."""
+    response = AsyncMock()
+    response.status = status
+    response.headers = headers or {}
+    response.read = AsyncMock(return_value=json.dumps(payload).encode())
+    response.raise_for_status = MagicMock()
+    return response
 
 
 @pytest.fixture
@@ -23,9 +47,7 @@ class TestAsyncGetPrices:
     @pytest.mark.asyncio
     async def test_successful_request(self, api_client, mock_session):
         expected_data = [{"date_time": "2025-01-15 00:00:00", "attributes": []}]
-        response = AsyncMock()
-        response.json = AsyncMock(return_value=expected_data)
-        response.raise_for_status = MagicMock()
+        response = _make_response(expected_data)
         mock_session.get = AsyncMock(return_value=response)
 
         result = await api_client.async_get_prices(date(2025, 1, 15))
@@ -64,9 +86,8 @@ class TestAsyncGetPrices:
 
     @pytest.mark.asyncio
     async def test_json_parse_error_returns_none(self, api_client, mock_session):
-        response = AsyncMock()
-        response.raise_for_status = MagicMock()
-        response.json = AsyncMock(side_effect=ValueError("Invalid JSON"))
+        response = _make_response(None)
+        response.read = AsyncMock(return_value=b"<html>Invalid JSON")
         mock_session.get = AsyncMock(return_value=response)
 
         result = await api_client.async_get_prices(date(2025, 1, 15))
@@ -74,9 +95,7 @@ class TestAsyncGetPrices:
 
     @pytest.mark.asyncio
     async def test_url_contains_correct_date(self, api_client, mock_session):
-        response = AsyncMock()
-        response.json = AsyncMock(return_value=[])
-        response.raise_for_status = MagicMock()
+        response = _make_response([])
         mock_session.get = AsyncMock(return_value=response)
 
         await api_client.async_get_prices(date(2025, 12, 31))
@@ -87,12 +106,449 @@ class TestAsyncGetPrices:
 
     @pytest.mark.asyncio
     async def test_user_agent_header(self, api_client, mock_session):
-        response = AsyncMock()
-        response.json = AsyncMock(return_value=[])
-        response.raise_for_status = MagicMock()
+        response = _make_response([])
         mock_session.get = AsyncMock(return_value=response)
 
         await api_client.async_get_prices(date(2025, 1, 15))
 
         headers = mock_session.get.call_args[1].get("headers", {})
         assert "User-Agent" in headers
+
+
+# ============================================================
+# PSEApiClient response cache
+# ============================================================
+
+
+def _pse_response(rows, status=200, headers=None):
+    return _make_response({"value": rows}, status, headers)
+
+
+class TestPSEResponseCache:
+    @pytest.mark.asyncio
+    async def test_identical_query_is_fetched_once(self, mock_session):
+        rows = [{"business_date": "2025-01-15", "dtime": "2025-01-15 00:15:00"}]
+        mock_session.get = AsyncMock(return_value=_pse_response(rows))
+        client = PSEApiClient(mock_session)
+
+        first = await client.get_rce_forecast(date(2025, 1, 15))
+        second = await client.get_rce_forecast(date(2025, 1, 15))
+
+        assert first == rows
+        assert second is first
+        assert mock_session.get.await_count == 1
+        assert client.cache_stats == {"hits": 1, "misses": 1, "coalesced": 0}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_request(self, mock_session):
+        rows = [{"dtime": "2025-01-15 00:15:00"}]
+
+        async def slow_get(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return _pse_response(rows)
+
+        mock_session.get = AsyncMock(side_effect=slow_get)
+        client = PSEApiClient(mock_session)
+
+        results = await asyncio.gather(
+            client.get_rce_forecast(date(2025, 1, 15)),
+            client.get_rce_forecast(date(2025, 1, 15)),
+            client.get_rce_forecast(date(2025, 1, 15)),
+        )
+
+        assert all(result == rows for result in results)
+        assert mock_session.get.await_count == 1
+        assert client.cache_stats["coalesced"] == 2
+
+    @pytest.mark.asyncio
+    async def test_different_queries_are_not_shared(self, mock_session):
+        mock_session.get = AsyncMock(return_value=_pse_response([]))
+        client = PSEApiClient(mock_session)
+
+        await client.get_rce_forecast(date(2025, 1, 15))
+        await client.get_rce_prices(date(2025, 1, 15))
+        await client.get_rce_forecast(date(2025, 1, 16))
+
+        assert mock_session.get.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_entry_expires_after_ttl(self, mock_session):
+        mock_session.get = AsyncMock(return_value=_pse_response([]))
+        client = PSEApiClient(mock_session)
+
+        with patch.object(api_module.time, "monotonic", return_value=1000.0):
+            await client.get_rce_forecast(date(2025, 1, 15))
+        with patch.object(
+            api_module.time,
+            "monotonic",
+            return_value=1000.0 + PSE_RESPONSE_CACHE_TTL_SECONDS + 1,
+        ):
+            await client.get_rce_forecast(date(2025, 1, 15))
+
+        assert mock_session.get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self, mock_session):
+        mock_session.get = AsyncMock(side_effect=ConnectionError("down"))
+        client = PSEApiClient(mock_session)
+
+        with patch.object(api_module.asyncio, "sleep", AsyncMock()):
+            assert await client.get_rce_forecast(date(2025, 1, 15)) is None
+            assert await client.get_rce_forecast(date(2025, 1, 15)) is None
+
+        assert client.cache_stats["misses"] == 2
+
+
+# ============================================================
+# Conditional requests (ETag / If-Modified-Since)
+# ============================================================
+
+
+class TestConditionalRequests:
+    @pytest.mark.asyncio
+    async def test_validators_are_sent_on_next_request(self, mock_session):
+        mock_session.get = AsyncMock(
+            return_value=_pse_response(
+                [{"dtime": "2025-01-15 00:15:00"}],
+                headers={"ETag": '"v1"', "Last-Modified": "Wed, 15 Jan 2025"},
+            )
+        )
+        client = PSEApiClient(mock_session)
+
+        with patch.object(api_module, "PSE_RESPONSE_CACHE_TTL_SECONDS", 0):
+            await client.get_rce_prices(date(2025, 1, 15))
+            await client.get_rce_prices(date(2025, 1, 15))
+
+        headers = mock_session.get.call_args_list[1][1]["headers"]
+        assert headers["If-None-Match"] == '"v1"'
+        assert headers["If-Modified-Since"] == "Wed, 15 Jan 2025"
+
+    @pytest.mark.asyncio
+    async def test_not_modified_returns_previous_payload(self, mock_session):
+        rows = [{"dtime": "2025-01-15 00:15:00", "rce_pln": 400}]
+        first = _pse_response(rows, headers={"ETag": '"v1"'})
+        not_modified = _pse_response(None, status=304)
+        not_modified.read = AsyncMock(side_effect=AssertionError("body read"))
+        mock_session.get = AsyncMock(side_effect=[first, not_modified])
+        client = PSEApiClient(mock_session)
+
+        with patch.object(api_module, "PSE_RESPONSE_CACHE_TTL_SECONDS", 0):
+            before = await client.get_rce_prices(date(2025, 1, 15))
+            after = await client.get_rce_prices(date(2025, 1, 15))
+
+        assert after is before
+        assert client.conditional_stats["not_modified"] == 1
+
+    @pytest.mark.asyncio
+    async def test_identical_body_without_validators_is_unchanged(self, mock_session):
+        rows = [{"dtime": "2025-01-15 00:15:00", "rce_pln": 400}]
+        mock_session.get = AsyncMock(
+            side_effect=[_pse_response(rows), _pse_response(rows)]
+        )
+        client = PSEApiClient(mock_session)
+
+        with patch.object(api_module, "PSE_RESPONSE_CACHE_TTL_SECONDS", 0):
+            before = await client.get_rce_prices(date(2025, 1, 15))
+            after = await client.get_rce_prices(date(2025, 1, 15))
+
+        assert after is before
+        assert client.conditional_stats["unchanged_body"] == 1
+
+    @pytest.mark.asyncio
+    async def test_changed_body_is_decoded(self, mock_session):
+        mock_session.get = AsyncMock(
+            side_effect=[
+                _pse_response([{"rce_pln": 1}]),
+                _pse_response([{"rce_pln": 2}]),
+            ]
+        )
+        client = PSEApiClient(mock_session)
+
+        with patch.object(api_module, "PSE_RESPONSE_CACHE_TTL_SECONDS", 0):
+            await client.get_rce_prices(date(2025, 1, 15))
+            after = await client.get_rce_prices(date(2025, 1, 15))
+
+        assert after == [{"rce_pln": 2}]
+
+    @pytest.mark.asyncio
+    async def test_incremental_queries_do_not_evict_daily_validators(
+        self, mock_session
+    ):
+        polls = api_module.MAX_CONDITIONAL_ENTRIES + 8
+        mock_session.get = AsyncMock(
+            side_effect=[_pse_response([], headers={"ETag": '"day"'})]
+            + [
+                _pse_response(
+                    [{"dtime": f"2025-01-15 {i // 4:02}:{i % 4 * 15:02}:00"}],
+                    headers={"ETag": f'"{i}"'},
+                )
+                for i in range(polls)
+            ]
+            + [_pse_response([])]
+        )
+        client = PSEApiClient(mock_session)
+
+        with patch.object(api_module, "PSE_RESPONSE_CACHE_TTL_SECONDS", 0):
+            await client.get_rce_prices(date(2025, 1, 15))
+            for _ in range(polls):
+                await client.get_load_data(date(2025, 1, 15))
+            await client.get_rce_prices(date(2025, 1, 15))
+
+        headers = mock_session.get.call_args[1]["headers"]
+        assert headers["If-None-Match"] == '"day"'
+        # Only the series' current filter keeps its validators
+        assert len(client._conditional._entries) == 2
+
+    @pytest.mark.asyncio
+    async def test_pge_not_modified(self, api_client, mock_session):
+        payload = [{"date_time": "2025-01-15 00:00:00", "attributes": []}]
+        first = _make_response(payload, headers={"ETag": '"a"'})
+        mock_session.get = AsyncMock(
+            side_effect=[first, _make_response(None, status=304)]
+        )
+
+        before = await api_client.async_get_prices(date(2025, 1, 15))
+        after = await api_client.async_get_prices(date(2025, 1, 15))
+
+        assert after is before
+        headers = mock_session.get.call_args_list[1][1]["headers"]
+        assert headers["If-None-Match"] == '"a"'
+
+
+# ============================================================
+# Incremental day series (kse-load, pdgobpkd)
+# ============================================================
+
+
+def _rows(*times):
+    return [
+        {"dtime": f"2025-01-15 {t}:00", "load_actual": i} for i, t in enumerate(times)
+    ]
+
+
+class TestIncrementalSeries:
+    @pytest.mark.asyncio
+    async def test_first_fetch_requests_whole_day(self, mock_session):
+        mock_session.get = AsyncMock(return_value=_pse_response(_rows("00:15")))
+        client = PSEApiClient(mock_session)
+
+        result = await client.get_load_data(date(2025, 1, 15))
+
+        params = mock_session.get.call_args[1]["params"]
+        assert params["$filter"] == "business_date eq '2025-01-15'"
+        assert params["$orderby"] == "dtime asc"
+        assert result == _rows("00:15")
+
+    @pytest.mark.asyncio
+    async def test_next_fetch_asks_only_for_newer_rows(self, mock_session):
+        mock_session.get = AsyncMock(
+            side_effect=[
+                _pse_response(_rows("00:15", "00:30")),
+                _pse_response([{"dtime": "2025-01-15 00:45:00", "load_actual": 9}]),
+            ]
+        )
+        client = PSEApiClient(mock_session)
+
+        await client.get_load_data(date(2025, 1, 15))
+        result = await client.get_load_data(date(2025, 1, 15))
+
+        params = mock_session.get.call_args[1]["params"]
+        assert params["$filter"] == (
+            "business_date eq '2025-01-15' and dtime gt '2025-01-15 00:30:00'"
+        )
+        assert [row["dtime"][-8:] for row in result] == [
+            "00:15:00",
+            "00:30:00",
+            "00:45:00",
+        ]
+        assert result[-1]["load_actual"] == 9
+
+    @pytest.mark.asyncio
+    async def test_no_new_rows_keeps_series(self, mock_session):
+        mock_session.get = AsyncMock(
+            side_effect=[_pse_response(_rows("00:15")), _pse_response([])]
+        )
+        client = PSEApiClient(mock_session)
+
+        first = await client.get_generation_plans(date(2025, 1, 15))
+        second = await client.get_generation_plans(date(2025, 1, 15))
+
+        assert second is first
+
+    @pytest.mark.asyncio
+    async def test_series_restarts_on_new_day(self, mock_session):
+        mock_session.get = AsyncMock(
+            side_effect=[
+                _pse_response(_rows("23:45")),
+                _pse_response([{"dtime": "2025-01-16 00:15:00"}]),
+            ]
+        )
+        client = PSEApiClient(mock_session)
+
+        await client.get_load_data(date(2025, 1, 15))
+        result = await client.get_load_data(date(2025, 1, 16))
+
+        params = mock_session.get.call_args[1]["params"]
+        assert params["$filter"] == "business_date eq '2025-01-16'"
+        assert result == [{"dtime": "2025-01-16 00:15:00"}]
+
+    @pytest.mark.asyncio
+    async def test_whole_day_is_refetched_periodically(self, mock_session):
+        revised = _rows("00:15", "00:30")
+        revised[0]["load_actual"] = 42
+        mock_session.get = AsyncMock(
+            side_effect=[
+                _pse_response(_rows("00:15", "00:30")),
+                _pse_response([]),
+                _pse_response(revised),
+            ]
+        )
+        client = PSEApiClient(mock_session)
+        start = 1000.0
+
+        for offset in (0, 60, api_module.SERIES_FULL_REFETCH_SECONDS):
+            with patch.object(
+                api_module.time, "monotonic", return_value=start + offset
+            ):
+                result = await client.get_load_data(date(2025, 1, 15))
+
+        filters = [c[1]["params"]["$filter"] for c in mock_session.get.call_args_list]
+        assert filters[1].endswith("and dtime gt '2025-01-15 00:30:00'")
+        assert filters[2] == "business_date eq '2025-01-15'"
+        # A revision that kept its dtime is picked up by the full fetch
+        assert result == revised
+
+    @pytest.mark.asyncio
+    async def test_failure_returns_none_and_keeps_series(self, mock_session):
+        mock_session.get = AsyncMock(
+            side_effect=[_pse_response(_rows("00:15"))]
+            + [ConnectionError("down")] * 3
+            + [_pse_response(_rows("00:15", "00:30")[1:])]
+        )
+        client = PSEApiClient(mock_session)
+
+        with patch.object(api_module.asyncio, "sleep", AsyncMock()):
+            await client.get_load_data(date(2025, 1, 15))
+            assert await client.get_load_data(date(2025, 1, 15)) is None
+            result = await client.get_load_data(date(2025, 1, 15))
+
+        assert len(result) == 2
+
+
+# ============================================================
+# Retry backoff and circuit breakers
+# ============================================================
+
+
+def _open_breaker(breaker):
+    for _ in range(BREAKER_FAILURE_THRESHOLD):
+        breaker.record_failure()
+
+
+class TestCircuitBreaker:
+    def test_retry_delay_is_jittered_and_capped(self):
+        with patch.object(api_module.random, "uniform", side_effect=lambda a, b: b):
+            assert retry_delay(0) == 1
+            assert retry_delay(2) == 4
+            assert retry_delay(10) == RETRY_MAX_DELAY_SECONDS
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker("rce-pln")
+        for _ in range(BREAKER_FAILURE_THRESHOLD - 1):
+            breaker.record_failure()
+        assert breaker.allow()
+
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
+        assert breaker.as_dict()["short_circuited"] == 1
+
+    def test_half_open_allows_single_trial(self):
+        breaker = CircuitBreaker("rce-pln")
+        with patch.object(api_module.time, "monotonic", return_value=1000.0):
+            _open_breaker(breaker)
+        with patch.object(api_module.time, "monotonic", return_value=1000.0 + 10_000):
+            assert breaker.allow()
+            assert breaker.state == CircuitBreaker.HALF_OPEN
+            assert not breaker.allow()
+
+            breaker.record_success()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow()
+
+    def test_failed_trial_reopens_with_longer_cooldown(self):
+        breaker = CircuitBreaker("rce-pln")
+        with (
+            patch.object(api_module.random, "uniform", side_effect=lambda a, b: b),
+            patch.object(api_module.time, "monotonic", return_value=0.0),
+        ):
+            _open_breaker(breaker)
+            first = breaker.as_dict()["retry_in"]
+            breaker.state = CircuitBreaker.HALF_OPEN
+            breaker.record_failure()
+            second = breaker.as_dict()["retry_in"]
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert second == 2 * first
+        assert second <= BREAKER_MAX_COOLDOWN_SECONDS
+
+    @pytest.mark.asyncio
+    async def test_open_endpoint_is_not_requested(self, mock_session):
+        mock_session.get = AsyncMock(side_effect=ConnectionError("down"))
+        client = PSEApiClient(mock_session)
+
+        with patch.object(api_module.asyncio, "sleep", AsyncMock()):
+            for day in range(1, BREAKER_FAILURE_THRESHOLD + 1):
+                await client.get_rce_forecast(date(2025, 1, day))
+            calls = mock_session.get.await_count
+            assert await client.get_rce_forecast(date(2025, 1, 20)) is None
+
+        assert mock_session.get.await_count == calls
+        assert client.breakers["price-fcst"].state == CircuitBreaker.OPEN
+
+    @pytest.mark.asyncio
+    async def test_breakers_are_per_endpoint(self, mock_session):
+        client = PSEApiClient(mock_session)
+        _open_breaker(client._breaker("price-fcst"))
+        mock_session.get = AsyncMock(return_value=_pse_response([{"x": 1}]))
+
+        result = await client.get_rce_prices(date(2025, 1, 15))
+
+        assert result == [{"x": 1}]
+        assert client.breakers["rce-pln"].state == CircuitBreaker.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_pge_breaker_short_circuits(self, api_client, mock_session):
+        mock_session.get = AsyncMock(side_effect=ConnectionError("down"))
+
+        for _ in range(BREAKER_FAILURE_THRESHOLD + 1):
+            assert await api_client.async_get_prices(date(2025, 1, 15)) is None
+
+        assert mock_session.get.await_count == BREAKER_FAILURE_THRESHOLD
+        assert api_client.breaker.state == CircuitBreaker.OPEN
+
+    @pytest.mark.asyncio
+    async def test_cancelled_pge_trial_releases_half_open_breaker(
+        self, api_client, mock_session
+    ):
+        breaker = api_client.breaker
+        with patch.object(api_module.time, "monotonic", return_value=1000.0):
+            _open_breaker(breaker)
+        started = asyncio.Event()
+
+        async def hang(*args, **kwargs):
+            started.set()
+            await asyncio.Event().wait()
+
+        mock_session.get = AsyncMock(side_effect=hang)
+        with patch.object(api_module.time, "monotonic", return_value=1000.0 + 10_000):
+            task = asyncio.ensure_future(api_client.async_get_prices(date(2025, 1, 15)))
+            await started.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            assert breaker.state == CircuitBreaker.HALF_OPEN
+            assert breaker.allow()
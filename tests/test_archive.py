@@ -0,0 +1,158 @@
+"""Tests for the on-disk quarter-hour price archive."""
+
+import asyncio
+import math
+import os
+from datetime import UTC, date, datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.energy_hub_poland.archive import HEADER, RECORD, PriceArchive
+from custom_components.energy_hub_poland.coordinator import EnergyHubDataCoordinator
+from custom_components.energy_hub_poland.prices import DayPrices
+
+DAY = date(2025, 1, 15)
+
+
+def _day(day=DAY, base=0.3):
+    prices = DayPrices(day)
+    for slot in range(prices.slots.count):
+        prices.set_slot(slot, base + slot / 1000)
+    return prices
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = PriceArchive(str(tmp_path / "archive"))
+    yield archive
+    archive.close()
+
+
+class TestPriceArchive:
+    def test_lookup_by_timestamp(self, archive):
+        archive.append_day(_day())
+
+        # 13:31 in Poland is slot 54
+        when = datetime(2025, 1, 15, 12, 31, tzinfo=UTC)
+        assert archive.price_at(when) == pytest.approx(0.3 + 54 / 1000)
+
+    def test_fixed_width_records(self, archive):
+        archive.append_day(_day(date(2025, 1, 1)))
+
+        size = os.path.getsize(os.path.join(archive.directory, "rce_2025.bin"))
+        assert size == HEADER.size + 96 * RECORD.size
+
+    def test_gaps_are_unknown(self, archive):
+        archive.append_day(_day(date(2025, 1, 10)))
+        archive.append_day(_day(DAY))
+
+        assert archive.price_at(datetime(2025, 1, 12, 12, tzinfo=UTC)) is None
+        assert archive.price_at(datetime(2025, 3, 1, tzinfo=UTC)) is None
+        assert archive.price_at(datetime(2024, 6, 1, tzinfo=UTC)) is None
+
+    def test_range_slices_without_full_load(self, archive):
+        prices = _day()
+        archive.append_day(prices)
+        start = prices.slots.slot_start(10)
+
+        values = archive.range(start, start + timedelta(hours=1))
+
+        assert list(values) == pytest.approx([0.3 + s / 1000 for s in range(10, 14)])
+
+    def test_range_spans_years(self, archive):
+        archive.append_day(_day(date(2024, 12, 31), base=1.0))
+        archive.append_day(_day(date(2025, 1, 1), base=2.0))
+        midnight = datetime(2024, 12, 31, 23, 0, tzinfo=UTC)
+
+        values = archive.range(
+            midnight - timedelta(minutes=30), midnight + timedelta(minutes=30)
+        )
+
+        assert len(values) == 4
+        assert values[1] == pytest.approx(1.095)
+        assert values[2] == pytest.approx(2.0)
+        assert archive.years() == [2024, 2025]
+
+    def test_rewrite_replaces_day_in_place(self, archive):
+        archive.append_day(_day())
+        archive.append_day(_day(base=0.5))
+
+        assert archive.price_at(_day().slots.start) == 0.5
+
+    def test_dst_day_has_100_records(self, archive):
+        archive.append_day(_day(date(2025, 10, 26)))
+        archive.append_day(_day(date(2025, 10, 27), base=9.0))
+
+        assert archive.price_at(
+            datetime(2025, 10, 26, 22, 59, tzinfo=UTC)
+        ) == pytest.approx(0.399)
+        assert archive.price_at(datetime(2025, 10, 26, 23, 0, tzinfo=UTC)) == 9.0
+
+    def test_rejects_foreign_file(self, archive):
+        os.makedirs(archive.directory)
+        with open(os.path.join(archive.directory, "rce_2025.bin"), "wb") as file:
+            file.write(b"x" * HEADER.size)
+
+        with pytest.raises(ValueError):
+            archive.append_day(_day())
+
+    def test_unknown_values_are_nan_on_disk(self, archive):
+        prices = DayPrices(DAY)
+        prices.set_slot(0, 0.1)
+
+        archive.append_day(prices)
+
+        assert math.isnan(archive.range(prices.slots.start, prices.slots.end)[1])
+
+
+class TestCoordinatorArchiving:
+    def _coordinator(self):
+        coord = EnergyHubDataCoordinator.__new__(EnergyHubDataCoordinator)
+        coord.hass = MagicMock()
+        coord.archive = MagicMock()
+        coord._archived = {}
+        coord._archiving = {}
+        return coord
+
+    def test_complete_day_is_archived_once(self):
+        coord = self._coordinator()
+
+        coord._archive_day(_day())
+        coord._archive_day(_day())
+
+        coord.hass.async_add_executor_job.assert_called_once()
+
+    def test_incomplete_day_is_not_archived(self):
+        coord = self._coordinator()
+        prices = DayPrices(DAY)
+        prices.set_slot(0, 0.1)
+
+        coord._archive_day(prices)
+
+        coord.hass.async_add_executor_job.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_write_is_retried(self):
+        coord = self._coordinator()
+        loop = asyncio.get_running_loop()
+        futures = []
+
+        def schedule(func, *args):
+            futures.append(loop.create_future())
+            return futures[-1]
+
+        coord.hass.async_add_executor_job.side_effect = schedule
+
+        coord._archive_day(_day())
+        futures[0].set_result(False)
+        await asyncio.sleep(0)
+        assert DAY not in coord._archived
+
+        coord._archive_day(_day())
+        futures[1].set_result(True)
+        await asyncio.sleep(0)
+        assert DAY in coord._archived
+
+        coord._archive_day(_day())
+        assert len(futures) == 2
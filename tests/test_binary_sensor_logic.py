@@ -150,3 +150,10 @@ class TestApiStatusBinarySensor:
 
         sensor = _make_api_status_sensor(coord)
         assert sensor.is_on is False
+
+    def test_stale_attribute(self):
+        coord = MagicMock()
+        coord.stale = True
+
+        sensor = _make_api_status_sensor(coord)
+        assert sensor.extra_state_attributes == {"stale": True}
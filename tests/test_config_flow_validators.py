@@ -51,6 +51,10 @@ class TestValidateHourFormat:
         # regex doesn't allow spaces
         assert validate_hour_format("6-13, 15-22") is False
 
+    def test_overlap_across_midnight(self):
+        assert validate_hour_format("22-2,1-3") is False
+        assert validate_hour_format("22-2,2-3") is True
+
 
 # ============================================================
 # validate_entity_id
@@ -1,5 +1,6 @@
 """Tests for EnergyHubDataCoordinator._async_update_data() — day transition, cache, retry."""
 
+import asyncio
 from datetime import UTC, date, datetime, timedelta, timezone
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -7,7 +8,13 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from custom_components.energy_hub_poland import coordinator as coord_module
-from custom_components.energy_hub_poland.coordinator import EnergyHubDataCoordinator
+from custom_components.energy_hub_poland.const import PRICE_WINDOW_DAYS
+from custom_components.energy_hub_poland.coordinator import (
+    TOPIC_PRICES,
+    EnergyHubDataCoordinator,
+    EnergyHubEntryCoordinator,
+)
+from custom_components.energy_hub_poland.prices import DayPrices, PriceWindow
 from tests.common import ENTRY_ID, SAMPLE_PRICES_TODAY, SAMPLE_PRICES_TOMORROW
 
 # The coordinator raises UpdateFailed from HA — use the stub from conftest
@@ -35,20 +42,31 @@ def _make_coordinator(
     coord.pse_client.get_generation_plans = AsyncMock(return_value=None)
 
     coord.store = AsyncMock()
+    coord.store.async_delay_save = MagicMock()
+    coord.store.legacy_ledger = None
+    coord.save_delay = 60
+    coord.save_stats = {"cache": {"dirty": 0, "scheduled": 0, "written": 0}}
     coord._cache_loaded = cache_loaded
-    coord._internal_data = {
-        "today": today,
-        "today_date": today_date,
-        "tomorrow": tomorrow,
-        "tomorrow_date": tomorrow_date,
-    }
+    coord._prices = PriceWindow(PRICE_WINDOW_DAYS)
+    if today:
+        coord._prices.put(DayPrices.from_hourly(today_date, today))
+        coord._prices.advance(today_date)
+    if tomorrow:
+        coord._prices.put(DayPrices.from_hourly(tomorrow_date, tomorrow))
+    coord._internal_data = {}
+    coord.archive = MagicMock()
+    coord._archived = {}
+    coord._archiving = {}
     coord.last_update_time = None
     coord.api_connected = True
-    coord.costs = dict.fromkeys(["dynamic", "g11", "g12", "g12w", "g12n", "g13"], 0.0)
-    coord.last_reset = datetime(2025, 1, 1, tzinfo=UTC)
-    coord._error_count = 0
+    coord.stale = False
+    coord._entries = {}
+    coord._legacy_entry_state = None
+    coord._parsed_pse = None
+    coord._parsed_pge = {}
     coord.update_interval = timedelta(minutes=5)
     coord._last_tomorrow_event_date = None
+    coord._rce_days = {tomorrow_date} if tomorrow else set()
     coord._scheduled_update_remover = None
     return coord
 
@@ -99,12 +117,13 @@ class TestDayTransition:
         with _patch_now(NOW), _patch_utcnow(NOW_UTC):
             result = await coord._async_update_data()
 
-        # Today should now be what was tomorrow
+        # Today should now be what was tomorrow, yesterday stays available
         assert result["today"] == PRICES_TOMORROW
-        assert coord._internal_data["today_date"] == TODAY
-        # Tomorrow should be cleared
-        assert coord._internal_data["tomorrow"] is None
-        assert coord._internal_data["tomorrow_date"] is None
+        assert coord._prices.today == TODAY
+        assert result["yesterday"] == PRICES_TODAY
+        # Tomorrow is not known yet
+        assert coord._prices.relative(1) is None
+        assert result["tomorrow"] is None
 
     @pytest.mark.asyncio
     async def test_no_transition_when_same_day(self):
@@ -124,6 +143,61 @@ class TestDayTransition:
         assert result["today"] == PRICES_TODAY
         assert result["tomorrow"] == PRICES_TOMORROW
 
+    @pytest.mark.asyncio
+    async def test_prices_refetched_after_midnight(self):
+        """The first cycle of a new day fetches RCE although no day is missing."""
+        coord = _make_coordinator(
+            today=PRICES_TODAY,
+            today_date=TODAY,
+            tomorrow=PRICES_TOMORROW,
+            tomorrow_date=TOMORROW,
+        )
+        coord._fetch_pge_prices = AsyncMock(return_value=None)
+        tz = timezone(timedelta(hours=1))
+        coord._internal_data["last_price_update"] = datetime(
+            2025, 1, 15, 13, 0, tzinfo=tz
+        )
+
+        before = datetime(2025, 1, 15, 23, 59, tzinfo=tz)
+        with _patch_now(before), _patch_utcnow(before):
+            await coord._async_update_data()
+        coord.pse_client.get_rce_prices.assert_not_awaited()
+
+        after = datetime(2025, 1, 16, 0, 2, tzinfo=tz)
+        with _patch_now(after), _patch_utcnow(after):
+            await coord._async_update_data()
+        coord.pse_client.get_rce_prices.assert_awaited_once_with(TOMORROW)
+
+    @pytest.mark.asyncio
+    async def test_tomorrow_without_rce_keeps_being_fetched(self):
+        """A tomorrow from forecasts or PGE only is replaced once RCE is out."""
+        coord = _make_coordinator(
+            today=PRICES_TODAY,
+            today_date=TODAY,
+            tomorrow=PRICES_TOMORROW,
+            tomorrow_date=TOMORROW,
+        )
+        coord._rce_days = set()
+        coord._fetch_pge_prices = AsyncMock(return_value=None)
+        coord._internal_data["last_price_update"] = NOW - timedelta(minutes=2)
+        start = datetime(2025, 1, 16)
+        rce = [
+            {
+                "dtime": f"{start + timedelta(minutes=15 * q):%Y-%m-%d %H:%M}",
+                "rce_pln": 400.0,
+            }
+            for q in range(1, 97)
+        ]
+        coord.pse_client.get_rce_prices = AsyncMock(return_value=rce)
+
+        assert coord._prices_missing(NOW)
+        with _patch_now(NOW), _patch_utcnow(NOW_UTC):
+            await coord._async_update_data()
+
+        coord.pse_client.get_rce_prices.assert_awaited_once()
+        assert TOMORROW in coord._rce_days
+        assert not coord._prices_missing(NOW)
+
     @pytest.mark.skip(
         reason="Awaiting refactor for new _update_pse_prices architecture"
     )
@@ -150,7 +224,7 @@ class TestDayTransition:
 
         # After transition, tomorrow was None → today becomes None → fetch is called
         assert result["today"] == new_today_prices
-        assert coord._internal_data["today_date"] == TODAY
+        assert coord._prices.today == TODAY
 
 
 # ============================================================
@@ -246,12 +320,36 @@ class TestCache:
         ):
             await coord._load_cache()
 
-        assert coord._internal_data["today"] == {0: 0.30, 1: 0.32}
-        assert coord._internal_data["today_date"] == date(2025, 1, 15)
-        assert coord._internal_data["tomorrow"] == {0: 0.28}
-        assert coord._internal_data["tomorrow_date"] == date(2025, 1, 16)
+        assert coord._prices.today == date(2025, 1, 15)
+        assert coord._prices.get(date(2025, 1, 15)) == {0: 0.30, 1: 0.32}
+        assert coord._prices.get(date(2025, 1, 16)) == {0: 0.28}
         assert coord.data["today"] == {0: 0.30, 1: 0.32}
 
+    @pytest.mark.asyncio
+    async def test_price_window_roundtrip(self):
+        """Every day of the window is saved and restored."""
+        coord = _make_coordinator(
+            today=PRICES_TODAY,
+            today_date=TODAY,
+            tomorrow=PRICES_TOMORROW,
+            tomorrow_date=TOMORROW,
+        )
+        coord._prices.put(DayPrices.from_hourly(date(2025, 1, 14), {5: 0.2}))
+        coord._internal_data = {"last_price_update": None}
+        coord._entries = {}
+
+        await coord._save_cache()
+        saved = coord.store.async_save.call_args[0][0]
+        restored = _make_coordinator()
+        restored.store.async_load = AsyncMock(return_value=saved)
+        restored.data = None
+        await restored._load_cache()
+
+        assert sorted(saved["price_days"]) == ["2025-01-14", "2025-01-15", "2025-01-16"]
+        assert restored._prices.today == TODAY
+        assert restored.data["yesterday"] == {5: 0.2}
+        assert restored.data["tomorrow"] == PRICES_TOMORROW
+
     @pytest.mark.asyncio
     async def test_load_cache_handles_empty_cache(self):
         """_load_cache handles None (no cache file)."""
@@ -260,7 +358,7 @@ class TestCache:
 
         await coord._load_cache()
 
-        assert coord._internal_data["today"] is None
+        assert coord._prices.days() == []
 
     @pytest.mark.asyncio
     async def test_load_cache_handles_corrupt_data(self):
@@ -270,7 +368,7 @@ class TestCache:
 
         await coord._load_cache()  # should not raise
 
-        assert coord._internal_data["today"] is None
+        assert coord._prices.days() == []
 
 
 # ============================================================
@@ -292,8 +390,8 @@ class TestApiFailure:
             result = await coord._async_update_data()
 
         assert result["today"] == PRICES_TODAY
-        # api_connected stays True because we have data from cache/transition
-        assert coord.api_connected is True
+        # Cached prices are still served, but no endpoint answered
+        assert coord.api_connected is False
 
     @pytest.mark.skip(
         reason="Awaiting refactor for new _update_pse_prices architecture"
@@ -330,6 +428,30 @@ class TestApiFailure:
 
         assert coord.api_connected is False
 
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_cached_data_stale(self):
+        """The background refresh after a cached start only clears stale on data."""
+        coord = _make_coordinator(
+            today=PRICES_TODAY,
+            today_date=TODAY,
+            tomorrow=PRICES_TOMORROW,
+            tomorrow_date=TOMORROW,
+        )
+        coord.stale = True
+
+        with _patch_now(NOW), _patch_utcnow(NOW_UTC):
+            await coord._async_update_data()
+
+        assert coord.stale is True
+        assert coord.api_connected is False
+
+        coord.pse_client.get_load_data = AsyncMock(return_value=[{"load_actual": 1}])
+        with _patch_now(NOW), _patch_utcnow(NOW_UTC):
+            await coord._async_update_data()
+
+        assert coord.stale is False
+        assert coord.api_connected is True
+
     @pytest.mark.asyncio
     async def test_tomorrow_fetch_failure_is_silent(self):
         """Failure to fetch tomorrow's data is not an error."""
@@ -411,3 +533,315 @@ class TestFetchData:
             result = await coord._fetch_data(TODAY)
 
         assert result is None
+
+
+# ============================================================
+# Batched fetch
+# ============================================================
+
+
+class TestFetchBatch:
+    @pytest.mark.asyncio
+    async def test_all_requests_run_concurrently(self):
+        """Requests of one cycle overlap instead of running one after another."""
+        coord = _make_coordinator()
+        running = 0
+        peak = 0
+
+        async def fetch():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return [{"ok": True}]
+
+        results = await coord._async_fetch_batch({"a": fetch, "b": fetch, "c": fetch})
+
+        assert set(results) == {"a", "b", "c"}
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_parallelism_is_bounded(self):
+        coord = _make_coordinator()
+        running = 0
+        peak = 0
+
+        async def fetch():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return []
+
+        with patch.object(coord_module, "FETCH_MAX_CONCURRENCY", 2):
+            results = await coord._async_fetch_batch({str(i): fetch for i in range(5)})
+
+        assert len(results) == 5
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_partial_results_on_failure_and_deadline(self):
+        """A failing or slow endpoint does not hold up the rest of the cycle."""
+        coord = _make_coordinator()
+
+        async def fast():
+            return [{"value": 1}]
+
+        async def broken():
+            raise ConnectionError("boom")
+
+        async def slow():
+            await asyncio.sleep(10)
+
+        with patch.object(coord_module, "FETCH_CYCLE_DEADLINE_SECONDS", 0.05):
+            results = await coord._async_fetch_batch(
+                {"fast": fast, "broken": broken, "slow": slow}
+            )
+
+        assert results == {"fast": [{"value": 1}]}
+
+    @pytest.mark.asyncio
+    async def test_expired_deadline_fetches_nothing(self):
+        coord = _make_coordinator()
+        fetch = AsyncMock(return_value=[{"value": 1}])
+        deadline = asyncio.get_running_loop().time() - 1
+
+        assert await coord._async_fetch_batch({"fetch": fetch}, deadline) == {}
+        fetch.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_pge_fallbacks_share_the_cycle_deadline(self):
+        """The fallback batch gets the rest of the cycle, not a deadline of its own."""
+        coord = _make_coordinator()
+        coord._fetch_pge_prices = AsyncMock(return_value=dict.fromkeys(range(24), 0.3))
+        batch = AsyncMock(side_effect=coord._async_fetch_batch)
+        coord._async_fetch_batch = batch
+
+        with _patch_now(NOW), _patch_utcnow(NOW_UTC):
+            await coord._async_update_data()
+
+        assert batch.await_count == 2
+        market_deadline = batch.await_args_list[0].args[1]
+        assert batch.await_args_list[1].args[1] == market_deadline
+
+    @pytest.mark.asyncio
+    async def test_failed_fetches_are_left_out(self):
+        """The API clients report failures as None, which is not a result."""
+        coord = _make_coordinator()
+
+        async def failed():
+            return None
+
+        async def broken():
+            raise ConnectionError("boom")
+
+        results = await coord._async_fetch_batch(
+            {"load": failed, "generation": failed, "forecast": broken}
+        )
+
+        assert results == {}
+
+    @pytest.mark.asyncio
+    async def test_empty_batch(self):
+        coord = _make_coordinator()
+        assert await coord._async_fetch_batch({}) == {}
+
+    @pytest.mark.asyncio
+    async def test_update_uses_frequent_data_from_batch(self):
+        coord = _make_coordinator(
+            today=PRICES_TODAY,
+            today_date=TODAY,
+            tomorrow=PRICES_TOMORROW,
+            tomorrow_date=TOMORROW,
+        )
+        coord.pse_client.get_load_data = AsyncMock(
+            return_value=[{"load_actual": 1.0}, {"load_actual": 2.0, "load_fcst": 3.0}]
+        )
+        coord.pse_client.get_rce_forecast = AsyncMock(
+            return_value=[{"imb_energy": 5.0}]
+        )
+
+        with _patch_now(NOW), _patch_utcnow(NOW_UTC):
+            result = await coord._async_update_data()
+
+        assert result["load_actual"] == 2.0
+        assert result["load_fcst"] == 3.0
+        assert result["imb_energy"] == 5.0
+        coord.pse_client.get_rce_prices.assert_not_awaited()
+
+
+# ============================================================
+# Unchanged upstream payloads
+# ============================================================
+
+
+class TestUnchangedPayloads:
+    @pytest.mark.asyncio
+    async def test_same_pse_payload_is_not_parsed_again(self):
+        coord = _make_coordinator()
+        rce = [{"dtime": "2025-01-15 01:00:00", "rce_pln": 400}]
+        coord._fetch_pge_prices = AsyncMock(return_value=None)
+        coord._parse_pse_prices = MagicMock(
+            return_value={TODAY: DayPrices.from_hourly(TODAY, {0: 0.4})}
+        )
+
+        await coord._update_pse_prices(TODAY, rce, None)
+        await coord._update_pse_prices(TODAY, rce, None)
+
+        coord._parse_pse_prices.assert_called_once()
+        assert coord._prices.get(TODAY) == {0: 0.4}
+
+    def test_unchanged_day_keeps_stored_prices(self):
+        coord = _make_coordinator(today=PRICES_TODAY, today_date=TODAY)
+        stored = coord._prices.get(TODAY)
+        views = coord._price_views()
+
+        coord._store_day(DayPrices.from_hourly(TODAY, PRICES_TODAY))
+
+        assert coord._prices.get(TODAY) is stored
+        assert coord._price_views()["today"] is views["today"]
+        coord.store.async_delay_save.assert_not_called()
+
+        coord._store_day(DayPrices.from_hourly(TODAY, {**PRICES_TODAY, 0: 9.0}))
+
+        assert coord._prices.get(TODAY)[0] == 9.0
+        coord.store.async_delay_save.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_identical_fetch_does_not_rebuild_final_prices(self):
+        """A catch-up retry with equal data leaves entity prices untouched."""
+        coord = _make_coordinator()
+        coord.last_update_success = True
+        coord.api_client.async_get_prices = AsyncMock(return_value=None)
+        start = datetime(2025, 1, 15, tzinfo=timezone(timedelta(hours=1)))
+
+        def rce_rows():
+            return [
+                {
+                    "dtime": (start + (q + 1) * timedelta(minutes=15)).strftime(
+                        "%Y-%m-%d %H:%M:%S"
+                    ),
+                    "rce_pln": 400 + q,
+                }
+                for q in range(96)
+            ]
+
+        entry = SimpleNamespace(entry_id=ENTRY_ID, data={}, options={})
+        entry_coord = EnergyHubEntryCoordinator(MagicMock(), entry, coord)
+        entry_coord.async_publish = MagicMock()
+
+        for _ in range(2):
+            # Tomorrow is not published yet, so every cycle fetches prices
+            coord.pse_client.get_rce_prices = AsyncMock(return_value=rce_rows())
+            with _patch_now(NOW), _patch_utcnow(NOW_UTC):
+                coord.data = await coord._async_update_data()
+                entry_coord._handle_market_update()
+
+        assert entry_coord.final_prices.version == 1
+        first, second = (c.args[0] for c in entry_coord.async_publish.call_args_list)
+        assert TOPIC_PRICES in first
+        assert TOPIC_PRICES not in second
+
+    @pytest.mark.asyncio
+    async def test_new_pse_payload_is_parsed(self):
+        coord = _make_coordinator()
+        coord._fetch_pge_prices = AsyncMock(return_value=None)
+        coord._parse_pse_prices = MagicMock(return_value={})
+
+        await coord._update_pse_prices(TODAY, [{"a": 1}], None)
+        await coord._update_pse_prices(TODAY, [{"a": 1}], None)
+
+        assert coord._parse_pse_prices.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_same_pge_payload_is_not_parsed_again(self):
+        coord = _make_coordinator()
+        raw = [{"mock": "data"}]
+        coord.api_client.async_get_prices = AsyncMock(return_value=raw)
+        coord._parse_prices = MagicMock(return_value=PRICES_TODAY)
+
+        first = await coord._fetch_pge_prices(TODAY)
+        second = await coord._fetch_pge_prices(TODAY)
+
+        assert first == second == PRICES_TODAY
+        coord._parse_prices.assert_called_once()
+
+
+# ============================================================
+# Publication-aligned update schedule
+# ============================================================
+
+
+def _scheduled_coordinator(with_tomorrow=True):
+    return _make_coordinator(
+        today=PRICES_TODAY,
+        today_date=TODAY,
+        tomorrow=PRICES_TOMORROW if with_tomorrow else None,
+        tomorrow_date=TOMORROW if with_tomorrow else None,
+    )
+
+
+class TestUpdateSchedule:
+    def test_wakes_at_next_quarter_hour_publication(self):
+        coord = _scheduled_coordinator()
+        # 13:05 in Poland (UTC+1 in January)
+        now = datetime(2025, 1, 15, 12, 5, tzinfo=UTC)
+
+        assert coord._next_update_time(now) == datetime(
+            2025, 1, 15, 12, 16, 30, tzinfo=UTC
+        )
+
+    def test_wakes_at_day_ahead_publication(self):
+        coord = _scheduled_coordinator(with_tomorrow=False)
+        # 11:59 in Poland, the grid wake-up would be at 12:01:30
+        now = datetime(2025, 1, 15, 10, 59, tzinfo=UTC)
+
+        assert coord._next_update_time(now) == datetime(2025, 1, 15, 11, 0, tzinfo=UTC)
+
+    def test_catches_up_while_tomorrow_prices_are_missing(self):
+        coord = _scheduled_coordinator(with_tomorrow=False)
+        now = datetime(2025, 1, 15, 12, 2, tzinfo=UTC)
+
+        assert coord._next_update_time(now) == now + timedelta(
+            seconds=coord_module.CATCHUP_INTERVAL_SECONDS
+        )
+
+    def test_wakes_at_midnight_rollover(self):
+        coord = _scheduled_coordinator()
+        # 23:59 in Poland
+        now = datetime(2025, 1, 15, 22, 59, tzinfo=UTC)
+
+        assert coord._next_update_time(now) == datetime(2025, 1, 15, 23, 0, tzinfo=UTC)
+
+    def test_midnight_uses_summer_offset(self):
+        coord = _make_coordinator(
+            today=PRICES_TODAY,
+            today_date=date(2025, 7, 15),
+            tomorrow=PRICES_TOMORROW,
+            tomorrow_date=date(2025, 7, 16),
+        )
+        # 23:59 in Poland (UTC+2 in July)
+        now = datetime(2025, 7, 15, 21, 59, tzinfo=UTC)
+
+        assert coord._next_update_time(now) == datetime(2025, 7, 15, 22, 0, tzinfo=UTC)
+
+    @pytest.mark.asyncio
+    async def test_update_reschedules_even_on_failure(self):
+        coord = _make_coordinator()
+        previous = MagicMock()
+        coord._scheduled_update_remover = previous
+        coord._fetch_pge_prices = AsyncMock(return_value=None)
+
+        with (
+            _patch_now(datetime(2025, 1, 15, 10, 0, tzinfo=UTC)),
+            _patch_utcnow(datetime(2025, 1, 15, 10, 0, tzinfo=UTC)),
+            patch.object(coord_module, "async_track_point_in_utc_time") as track,
+            pytest.raises(UpdateFailed),
+        ):
+            await coord._async_update_data()
+
+        previous.assert_called_once()
+        track.assert_called_once()
+        assert coord._scheduled_update_remover is track.return_value
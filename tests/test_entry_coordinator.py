@@ -0,0 +1,623 @@
+"""Tests for the shared market coordinator and per-entry coordinators."""
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.energy_hub_poland import coordinator as coord_module
+from custom_components.energy_hub_poland.const import (
+    DATA_MARKET_COORDINATOR,
+    PRICE_WINDOW_DAYS,
+)
+from custom_components.energy_hub_poland.coordinator import (
+    TOPIC_COSTS,
+    TOPIC_GRID,
+    TOPIC_PRICES,
+    TOPIC_SLOT,
+    TOPIC_STATUS,
+    EnergyHubDataCoordinator,
+    EnergyHubEntryCoordinator,
+    async_get_market_coordinator,
+    cost_topic,
+    price_topic,
+)
+from custom_components.energy_hub_poland.prices import PriceWindow
+from custom_components.energy_hub_poland.sensor import (
+    EnergyHubSensorEntity,
+    MinMaxPriceSensor,
+    TariffCostSensor,
+)
+from tests.common import SAMPLE_PRICES_TODAY
+
+ConfigEntryNotReady = coord_module.ConfigEntryNotReady
+
+# 13:00 in Poland, the start of slot 52
+SLOT_START = datetime(2025, 1, 15, 12, 0, tzinfo=UTC)
+
+
+def _at(when):
+    return patch.object(coord_module.dt_util, "utcnow", return_value=when)
+
+
+def _make_market(data=None):
+    """Create a market coordinator with mocked I/O."""
+    market = EnergyHubDataCoordinator.__new__(EnergyHubDataCoordinator)
+    market.hass = MagicMock()
+    market.data = data
+    market.store = AsyncMock()
+    market.store.async_delay_save = MagicMock()
+    market.store.legacy_ledger = None
+    market.save_delay = 60
+    market.save_stats = {"cache": {"dirty": 0, "scheduled": 0, "written": 0}}
+    market.api_connected = True
+    market.stale = False
+    market.last_update_time = None
+    market.last_update_success = True
+    market._prices = PriceWindow(PRICE_WINDOW_DAYS)
+    market._internal_data = {}
+    market._entries = {}
+    market._legacy_entry_state = None
+    market.async_add_listener = MagicMock(return_value=MagicMock())
+    return market
+
+
+def _make_entry_coordinator(market, entry_id="entry_a"):
+    entry = SimpleNamespace(entry_id=entry_id, data={}, options={})
+    coord = EnergyHubEntryCoordinator(MagicMock(), entry, market)
+    coord.hass = MagicMock()
+    coord.hass.async_add_executor_job = AsyncMock(return_value=[])
+    coord.ledger_store = AsyncMock()
+    coord.ledger_store.async_load = AsyncMock(return_value=None)
+    coord.ledger_store.async_delay_save = MagicMock()
+    coord.async_publish = MagicMock(wraps=coord.async_publish)
+    return coord
+
+
+class TestEntryCoordinatorData:
+    def test_market_data_is_merged_with_costs(self):
+        market = _make_market({"today": dict(SAMPLE_PRICES_TODAY), "load_actual": 1})
+        coord = _make_entry_coordinator(market)
+        coord.costs["g11"] = 1.5
+
+        data = coord._build_data()
+
+        assert data["today"] == SAMPLE_PRICES_TODAY
+        assert data["load_actual"] == 1
+        assert data["costs"]["g11"] == 1.5
+        assert "costs" not in market.data
+
+    def test_fee_schedules_cover_every_priced_tariff(self):
+        coord = _make_entry_coordinator(_make_market({}))
+
+        assert set(coord.fee_schedules) == set(coord_module.TARIFFS)
+
+    def test_market_update_reaches_every_entry(self):
+        market = _make_market({"today": {0: 0.1}})
+        first = _make_entry_coordinator(market, "entry_a")
+        second = _make_entry_coordinator(market, "entry_b")
+        first.async_attach()
+        second.async_attach()
+        first.async_publish.reset_mock()
+        second.async_publish.reset_mock()
+
+        market.data = {"today": {0: 0.2}}
+        first._handle_market_update()
+        second._handle_market_update()
+
+        assert first.data["today"] == {0: 0.2}
+        assert second.data["today"] == {0: 0.2}
+        for coord in (first, second):
+            coord.async_publish.assert_called_once()
+            assert TOPIC_PRICES in coord.async_publish.call_args.args[0]
+
+    def test_data_version_follows_data_changes(self):
+        market = _make_market({"today": {0: 0.1}})
+        coord = _make_entry_coordinator(market)
+        coord.async_attach()
+        version = coord.data_version
+
+        coord._handle_market_update()
+        assert coord.data_version == version
+
+        market.data = {"today": {0: 0.2}}
+        coord._handle_market_update()
+        assert coord.data_version == version + 1
+
+        coord.costs["g11"] += 1.0
+        coord._handle_market_update()
+        assert coord.data_version == version + 2
+
+    @pytest.mark.asyncio
+    async def test_legacy_sensor_state_is_migrated_and_saved(self):
+        market = _make_market({})
+        coord = _make_entry_coordinator(market)
+        coord.async_attach()
+        coord.async_publish.reset_mock()
+        version = coord.data_version
+        entry = SimpleNamespace(entry_id="entry_a", data={}, options={})
+        sensor = TariffCostSensor(coord, entry, "g11")
+        sensor.async_get_last_state = AsyncMock(
+            return_value=SimpleNamespace(state="12.5")
+        )
+
+        # The HA entity stubs have no async_added_to_hass of their own
+        with patch.object(
+            EnergyHubSensorEntity, "async_added_to_hass", AsyncMock(), create=True
+        ):
+            await sensor.async_added_to_hass()
+
+        assert coord.data["costs"]["g11"] == 12.5
+        assert coord.data_version == version + 1
+        assert cost_topic("g11") in coord.async_publish.call_args.args[0]
+        saved = coord.ledger_store.async_delay_save.call_args.args[0]()
+        assert saved["costs"]["g11"] == 12.5
+
+    def test_attributes_computed_once_for_identical_publications(self):
+        market = _make_market({"today": {0: 0.3, 1: 0.1}})
+        coord = _make_entry_coordinator(market)
+        coord.async_attach()
+        sensor = MinMaxPriceSensor.__new__(MinMaxPriceSensor)
+        sensor.coordinator = coord
+        sensor._memo = {}
+        sensor._day = "today"
+        sensor._mode = "min"
+
+        with patch.object(
+            MinMaxPriceSensor,
+            "_extreme_hours",
+            autospec=True,
+            side_effect=MinMaxPriceSensor._extreme_hours,
+        ) as compute:
+            assert sensor.extra_state_attributes == {"hour": "01:00"}
+            coord._handle_market_update()
+            assert sensor.extra_state_attributes == {"hour": "01:00"}
+
+        compute.assert_called_once()
+
+    def test_only_changed_topics_are_published(self):
+        market = _make_market({"today": {0: 0.1}, "load_actual": 1})
+        coord = _make_entry_coordinator(market)
+        prices, grid = MagicMock(), MagicMock()
+        coord.async_add_listener(prices, frozenset({TOPIC_PRICES}))
+        coord.async_add_listener(grid, frozenset({TOPIC_GRID}))
+        with _at(SLOT_START):
+            coord.async_attach()
+            prices.reset_mock()
+            grid.reset_mock()
+
+            market.data = {**market.data, "load_actual": 2}
+            coord._handle_market_update()
+
+            grid.assert_called_once()
+            prices.assert_not_called()
+            assert coord.async_publish.call_args.args[0] == {TOPIC_GRID}
+
+            coord._handle_market_update()
+            assert coord.async_publish.call_args.args[0] == set()
+
+    def test_status_and_current_price_topics(self):
+        market = _make_market({"today": dict(SAMPLE_PRICES_TODAY)})
+        coord = _make_entry_coordinator(market)
+        with _at(SLOT_START):
+            coord.async_attach()
+
+            market.last_update_success = False
+            coord._handle_market_update()
+            assert coord.async_publish.call_args.args[0] == {TOPIC_STATUS}
+
+            # A different current price wakes that tariff's listeners
+            coord._published_current["dynamic"] = -1.0
+            coord._handle_market_update()
+            assert coord.async_publish.call_args.args[0] == {price_topic("dynamic")}
+
+    def test_new_slot_topic(self):
+        market = _make_market({})
+        coord = _make_entry_coordinator(market)
+        with _at(SLOT_START):
+            coord.async_attach()
+        with _at(SLOT_START + timedelta(minutes=14)):
+            coord._handle_market_update()
+        assert coord.async_publish.call_args.args[0] == set()
+
+        with _at(SLOT_START + timedelta(minutes=15)):
+            coord._handle_market_update()
+        assert coord.async_publish.call_args.args[0] == {TOPIC_SLOT}
+
+    def test_topic_listener_can_be_removed(self):
+        coord = _make_entry_coordinator(_make_market({}))
+        listener = MagicMock()
+        remove = coord.async_add_listener(listener, frozenset({TOPIC_COSTS}))
+
+        coord.async_publish({TOPIC_COSTS})
+        remove()
+        coord.async_publish({TOPIC_COSTS})
+
+        listener.assert_called_once()
+
+    def test_api_status_comes_from_market(self):
+        market = _make_market({})
+        coord = _make_entry_coordinator(market)
+        market.api_connected = False
+        assert coord.api_connected is False
+
+
+class TestEntryCoordinatorCosts:
+    def test_slot_is_priced_once_when_it_closes(self):
+        market = _make_market({"today": {}})
+        coord = _make_entry_coordinator(market)
+        coord.async_attach()
+        coord.async_publish.reset_mock()
+        pricing = MagicMock(
+            return_value={
+                "g11": {"energy": 0.5, "variable_fee": 0.1, "vat": 0.1, "total": 0.7},
+                "g12": None,
+            }
+        )
+        coord.async_set_pricing(pricing)
+
+        for second in range(0, 40, 10):
+            with _at(SLOT_START + timedelta(seconds=second)):
+                coord.async_add_energy(0.5)
+
+        pricing.assert_not_called()
+        coord.async_publish.assert_not_called()
+        assert coord.costs["g11"] == 0.0
+
+        with _at(SLOT_START + timedelta(minutes=15)):
+            coord.async_add_energy(0.1)
+
+        pricing.assert_called_once_with(SLOT_START)
+        assert coord.costs["g11"] == pytest.approx(1.4)
+        assert coord.costs["g12"] == 0.0
+        assert coord.cost_breakdown["g11"]["energy"] == pytest.approx(1.0)
+        coord.async_publish.assert_called_once()
+        topics = coord.async_publish.call_args.args[0]
+        assert {TOPIC_COSTS, cost_topic("g11")} <= topics
+        assert cost_topic("g12") not in topics
+        coord.ledger_store.async_delay_save.assert_called_once()
+        market.store.async_delay_save.assert_not_called()
+
+    def test_open_slot_is_priced_for_display(self):
+        market = _make_market({})
+        coord = _make_entry_coordinator(market)
+        coord.async_set_pricing(MagicMock(return_value={"g11": 0.5}))
+
+        with _at(SLOT_START):
+            coord.async_add_energy(2.0)
+
+        assert coord._build_data()["costs"]["g11"] == pytest.approx(1.0)
+        assert coord.costs["g11"] == 0.0
+
+    def test_market_update_closes_finished_slot(self):
+        market = _make_market({})
+        coord = _make_entry_coordinator(market)
+        coord.async_set_pricing(MagicMock(return_value={"g11": 0.5}))
+        with _at(SLOT_START):
+            coord.async_add_energy(2.0)
+
+        with _at(SLOT_START + timedelta(minutes=16)):
+            coord._handle_market_update()
+
+        assert coord.costs["g11"] == pytest.approx(1.0)
+        assert coord.journal_watermark == pytest.approx(SLOT_START.timestamp())
+
+    def test_unpriced_slot_is_not_carried_over(self):
+        market = _make_market({})
+        coord = _make_entry_coordinator(market)
+        with _at(SLOT_START):
+            coord.async_add_energy(2.0)
+        # Prices only become available in the next slot
+        coord.async_set_pricing(
+            lambda when: {"g11": None if when == SLOT_START else 0.5}
+        )
+
+        with _at(SLOT_START + timedelta(minutes=15)):
+            coord.async_add_energy(1.0)
+        coord._close_bucket()
+
+        assert coord.costs["g11"] == pytest.approx(0.5)
+        assert coord.unpriced_kwh == pytest.approx(2.0)
+        assert coord._bucket_kwh == 0.0
+
+    def test_entries_keep_separate_costs(self):
+        market = _make_market({})
+        first = _make_entry_coordinator(market, "entry_a")
+        second = _make_entry_coordinator(market, "entry_b")
+        first.async_set_pricing(MagicMock(return_value={"dynamic": 0.5}))
+
+        with _at(SLOT_START):
+            first.async_add_energy(1.0)
+        first._close_bucket()
+
+        assert first.costs["dynamic"] == 0.5
+        assert second.costs["dynamic"] == 0.0
+
+    def test_monthly_reset_is_saved(self):
+        market = _make_market({})
+        coord = _make_entry_coordinator(market)
+        coord.costs["g11"] = 12.5
+        coord.last_reset = datetime(2025, 1, 1, tzinfo=UTC)
+
+        with patch.object(
+            coord_module.dt_util, "now", return_value=datetime(2025, 2, 1, 0, 5)
+        ):
+            coord._check_monthly_reset()
+
+        assert coord.costs["g11"] == 0.0
+        coord.ledger_store.async_delay_save.assert_called_once()
+        saved = coord.ledger_store.async_delay_save.call_args.args[0]()
+        assert saved["costs"]["g11"] == 0.0
+        assert saved["last_reset"] == "2025-02-01T00:00:00"
+
+    def test_state_roundtrip(self):
+        market = _make_market({})
+        coord = _make_entry_coordinator(market)
+        coord.costs["g13"] = 3.25
+        coord.last_reset = datetime(2025, 1, 1, tzinfo=UTC)
+
+        restored = _make_entry_coordinator(market)
+        restored.restore(coord.as_dict())
+
+        assert restored.costs["g13"] == 3.25
+        assert restored.last_reset == datetime(2025, 1, 1, tzinfo=UTC)
+
+    def test_unpriced_energy_survives_restart(self):
+        market = _make_market({})
+        coord = _make_entry_coordinator(market)
+        coord.async_set_pricing(lambda when: {"g11": None})
+        with _at(SLOT_START):
+            coord.async_add_energy(2.0)
+        coord._close_bucket()
+
+        saved = coord.ledger_store.async_delay_save.call_args.args[0]()
+        restored = _make_entry_coordinator(market)
+        restored.restore(saved)
+
+        assert restored.unpriced_kwh == pytest.approx(2.0)
+        assert restored.journal_watermark == coord.journal_watermark
+
+
+class TestMarketPersistence:
+    @pytest.mark.asyncio
+    async def test_entry_restores_its_own_ledger(self):
+        market = _make_market({})
+        coord = _make_entry_coordinator(market, "entry_b")
+        coord.ledger_store.async_load = AsyncMock(return_value={"costs": {"g11": 2.0}})
+
+        await coord.async_load_ledger()
+        coord.async_attach()
+
+        assert coord.costs["g11"] == 2.0
+        assert market.has_entries
+
+    def test_legacy_costs_go_to_first_entry_only(self):
+        market = _make_market({})
+        market._legacy_entry_state = {"costs": {"dynamic": 4.0}}
+
+        first = _make_entry_coordinator(market, "entry_a")
+        second = _make_entry_coordinator(market, "entry_b")
+        first.async_attach()
+        second.async_attach()
+
+        assert first.costs["dynamic"] == 4.0
+        assert second.costs["dynamic"] == 0.0
+        market.hass.async_create_task.assert_called_once()
+        market.hass.async_create_task.call_args[0][0].close()
+
+    @pytest.mark.asyncio
+    async def test_claimed_legacy_costs_move_to_entry_store(self):
+        market = _make_market({})
+        entry_store = AsyncMock()
+
+        with patch.object(coord_module, "EntryLedgerStore", return_value=entry_store):
+            await market._async_hand_over_legacy("entry_a", {"costs": {"g11": 1}})
+
+        entry_store.async_save.assert_awaited_once_with({"costs": {"g11": 1}})
+        # The cache drops the costs only once the entry has them
+        market.store.async_delay_save.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_save_writes_only_the_entry_ledger(self):
+        market = _make_market({})
+        market.last_update_time = None
+        market._internal_data.update({"last_price_update": None})
+        first = _make_entry_coordinator(market, "entry_a")
+        second = _make_entry_coordinator(market, "entry_b")
+        first.async_attach()
+        second.async_attach()
+        first.costs["g12"] = 1.0
+
+        assert await first.async_save_ledger()
+        await market._save_cache()
+
+        saved = first.ledger_store.async_save.call_args[0][0]
+        assert saved["costs"]["g12"] == 1.0
+        second.ledger_store.async_save.assert_not_awaited()
+        cache = market.store.async_save.call_args[0][0]
+        assert "costs" not in cache
+
+    @pytest.mark.asyncio
+    async def test_detach_saves_entry_ledger(self):
+        market = _make_market({})
+        coord = _make_entry_coordinator(market)
+        coord.async_attach()
+        coord.costs["g11"] = 7.0
+
+        await coord.async_detach()
+
+        assert not market.has_entries
+        saved = coord.ledger_store.async_save.call_args[0][0]
+        assert saved["costs"]["g11"] == 7.0
+
+    @pytest.mark.asyncio
+    async def test_migrated_legacy_costs_wait_for_an_entry(self):
+        market = _make_market(None)
+        market.store.async_load = AsyncMock(return_value={"today": {"0": 0.1}})
+        legacy = {"costs": {"g11": 2}}
+        market.store.legacy_ledger = legacy
+
+        await market._load_cache()
+
+        assert market._legacy_entry_state == legacy
+        assert market.store.legacy_ledger is None
+        market.store.async_delay_save.assert_not_called()
+
+    def test_meter_ticks_are_coalesced(self):
+        market = _make_market({})
+        coord = _make_entry_coordinator(market)
+        coord.async_attach()
+        coord.async_set_pricing(MagicMock(return_value={"g11": 1.0}))
+
+        for quarter in range(5):
+            with _at(SLOT_START + quarter * timedelta(minutes=15)):
+                coord.async_add_energy(0.1)
+
+        assert coord.save_stats["dirty"] == 4
+        coord.ledger_store.async_save.assert_not_awaited()
+        data_func, delay = coord.ledger_store.async_delay_save.call_args[0]
+        assert delay == market.save_delay
+
+        saved = data_func()
+
+        assert saved["costs"]["g11"] == pytest.approx(0.4)
+        assert coord.save_stats == {"dirty": 0, "scheduled": 4, "written": 1}
+
+    def test_hourly_flush_only_when_dirty(self):
+        market = _make_market({})
+        coord = _make_entry_coordinator(market)
+        coord.async_attach()
+
+        market._handle_hourly_flush(datetime(2025, 1, 15, 13, tzinfo=UTC))
+        market.hass.async_create_task.assert_not_called()
+
+        coord.async_schedule_ledger_save()
+        market._handle_hourly_flush(datetime(2025, 1, 15, 14, tzinfo=UTC))
+        market.hass.async_create_task.assert_called_once()
+        market.hass.async_create_task.call_args[0][0].close()
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_pending_changes(self):
+        market = _make_market({})
+        coord = _make_entry_coordinator(market)
+        coord.async_attach()
+        await market.async_flush_cache()
+        market.store.async_save.assert_not_awaited()
+        coord.ledger_store.async_save.assert_not_awaited()
+
+        market.async_schedule_cache_save()
+        coord.async_schedule_ledger_save()
+        await market.async_flush_cache()
+
+        market.store.async_save.assert_awaited_once()
+        coord.ledger_store.async_save.assert_awaited_once()
+        assert market.save_stats["cache"]["dirty"] == 0
+        assert coord.save_stats["dirty"] == 0
+
+    @pytest.mark.asyncio
+    async def test_flush_compacts_each_entry_journal(self):
+        market = _make_market({})
+        first = _make_entry_coordinator(market, "entry_a")
+        second = _make_entry_coordinator(market, "entry_b")
+        first.async_attach()
+        second.async_attach()
+        # Only the first entry has settled slots its delayed save wrote
+        first.journal_watermark = SLOT_START.timestamp()
+
+        market._handle_hourly_flush(datetime(2025, 1, 15, 13, tzinfo=UTC))
+        market.hass.async_create_task.assert_called_once()
+        market.hass.async_create_task.call_args[0][0].close()
+        await market.async_flush_cache()
+
+        first.ledger_store.async_save.assert_awaited_once()
+        first.hass.async_add_executor_job.assert_awaited_once_with(
+            first.journal.compact, SLOT_START.timestamp()
+        )
+        second.ledger_store.async_save.assert_not_awaited()
+        second.hass.async_add_executor_job.assert_not_awaited()
+
+        await market.async_flush_cache()
+        first.ledger_store.async_save.assert_awaited_once()
+
+
+class TestSharedMarketCoordinator:
+    @pytest.mark.asyncio
+    async def test_single_market_for_all_entries(self):
+        hass = SimpleNamespace(data={})
+        market = _make_market({})
+        market.async_ensure_ready = AsyncMock()
+        hass.data[DATA_MARKET_COORDINATOR] = market
+
+        first = await async_get_market_coordinator(hass)
+        second = await async_get_market_coordinator(hass)
+
+        assert first is second is market
+
+    def test_market_is_not_bound_to_an_entry(self, tmp_path):
+        hass = MagicMock()
+        hass.config.path = lambda *parts: str(tmp_path.joinpath(*parts))
+
+        with patch.object(
+            coord_module.DataUpdateCoordinator, "__init__", return_value=None
+        ) as init:
+            EnergyHubDataCoordinator(hass)
+
+        assert init.call_args.kwargs["config_entry"] is None
+
+    @pytest.mark.asyncio
+    async def test_first_refresh_runs_once(self):
+        market = _make_market({})
+        market._ready = False
+        market._ready_lock = coord_module.asyncio.Lock()
+        market._cache_loaded = True
+        market.async_refresh = AsyncMock()
+
+        await market.async_ensure_ready()
+        await market.async_ensure_ready()
+
+        market.async_refresh.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_first_refresh_is_not_ready(self):
+        market = _make_market({})
+        market._ready = False
+        market._ready_lock = coord_module.asyncio.Lock()
+        market._cache_loaded = True
+        market.last_update_success = False
+        market.async_refresh = AsyncMock()
+
+        with pytest.raises(ConfigEntryNotReady):
+            await market.async_ensure_ready()
+        assert market._ready is False
+
+    @pytest.mark.asyncio
+    async def test_cached_data_starts_without_waiting(self):
+        market = _make_market({"load_actual": 1000})
+        market._ready = False
+        market._ready_lock = coord_module.asyncio.Lock()
+        market._cache_loaded = True
+        market.last_update_success = False
+        market.async_refresh = MagicMock()
+
+        with patch.object(coord_module.dt_util, "now", return_value=SLOT_START):
+            await market.async_ensure_ready()
+
+        assert market._ready is True
+        assert market.stale is True
+        assert market.data["load_actual"] == 1000
+        assert market._prices.today == SLOT_START.date()
+        market.hass.async_create_background_task.assert_called_once()
+        market.async_refresh.assert_called_once()
+
+    def test_stale_change_is_a_status_update(self):
+        market = _make_market({})
+        coord = _make_entry_coordinator(market)
+        with _at(SLOT_START):
+            coord.async_attach()
+            coord.async_publish.reset_mock()
+
+            market.stale = True
+            coord._handle_market_update()
+
+        assert coord.async_publish.call_args.args[0] == {TOPIC_STATUS}
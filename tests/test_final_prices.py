@@ -0,0 +1,117 @@
+"""Tests for the shared per-slot final price cache."""
+
+from datetime import date, datetime
+
+import pytest
+
+from custom_components.energy_hub_poland.coordinator import _enabled_tariffs
+from custom_components.energy_hub_poland.final_prices import FinalPrices
+from custom_components.energy_hub_poland.tariffs import (
+    compile_fee_schedules,
+    compile_tariff_tables,
+)
+from tests.common import SAMPLE_PRICES_TODAY, SAMPLE_PRICES_TOMORROW, WARSAW
+
+DAY = date(2025, 1, 15)
+
+CONFIG = {
+    "vat_rate": "23",
+    "network_variable_fee_dynamic": 0.1,
+    "g12_settings": {
+        "price_peak": 0.6,
+        "price_offpeak": 0.3,
+        "hours_peak": "6-13,15-22",
+        "network_variable_fee_g12_peak": 0.2,
+        "network_variable_fee_g12_offpeak": 0.05,
+    },
+}
+
+
+def _final_prices(tariffs=("dynamic", "g12")):
+    return FinalPrices(
+        tariffs, compile_tariff_tables(CONFIG), compile_fee_schedules(CONFIG)
+    )
+
+
+def _data():
+    return {
+        "today": dict(SAMPLE_PRICES_TODAY),
+        "today_quarters": {13 * 4 + 2: 1.0},
+        "today_avg": 0.53,
+        "tomorrow": dict(SAMPLE_PRICES_TOMORROW),
+    }
+
+
+class TestFinalPrices:
+    def test_dynamic_slots_include_fees_and_prefer_quarters(self):
+        final = _final_prices()
+        final.refresh(_data(), DAY)
+
+        quarter = datetime(2025, 1, 15, 13, 31, tzinfo=WARSAW)
+        hour = datetime(2025, 1, 15, 13, 5, tzinfo=WARSAW)
+        assert final.price_at("dynamic", quarter) == pytest.approx(1.1 * 1.23)
+        assert final.price_at("dynamic", hour) == pytest.approx(
+            (SAMPLE_PRICES_TODAY[13] + 0.1) * 1.23
+        )
+        tomorrow = datetime(2025, 1, 16, 0, tzinfo=WARSAW)
+        assert final.price_at("dynamic", tomorrow) == pytest.approx(
+            (SAMPLE_PRICES_TOMORROW[0] + 0.1) * 1.23
+        )
+
+    def test_fixed_tariff_slots_use_zone_totals(self):
+        final = _final_prices()
+        final.refresh(_data(), DAY)
+
+        peak = datetime(2025, 1, 15, 9, tzinfo=WARSAW)
+        offpeak = datetime(2025, 1, 15, 23, tzinfo=WARSAW)
+        assert final.price_at("g12", peak) == pytest.approx(0.8 * 1.23)
+        assert final.price_at("g12", offpeak) == pytest.approx(0.35 * 1.23)
+        assert set(final.prices_at(peak)) == {"dynamic", "g12"}
+
+    def test_uncached_lookups_raise(self):
+        final = _final_prices()
+        final.refresh(_data(), DAY)
+
+        with pytest.raises(KeyError):
+            final.price_at("dynamic", datetime(2025, 1, 17, 9, tzinfo=WARSAW))
+        with pytest.raises(KeyError):
+            final.price_at("g11", datetime(2025, 1, 15, 9, tzinfo=WARSAW))
+
+    def test_rebuilt_only_on_new_data_or_day(self):
+        final = _final_prices()
+        data = _data()
+
+        assert final.refresh(data, DAY)
+        assert not final.refresh(dict(data), DAY)
+        assert final.refresh({**data, "tomorrow": {0: 0.9}}, DAY)
+        assert final.refresh({**data, "tomorrow": {0: 0.9}}, date(2025, 1, 16))
+
+    def test_day_statistics(self):
+        final = _final_prices()
+        final.refresh(_data(), DAY)
+
+        stats = final.stats["today"]
+        assert stats["min"] == pytest.approx((0.30 + 0.1) * 1.23)
+        assert stats["avg"] == pytest.approx((0.53 + 0.1) * 1.23)
+        assert "max_price" not in stats
+        assert final.hourly["tomorrow"][0] == pytest.approx(
+            (SAMPLE_PRICES_TOMORROW[0] + 0.1) * 1.23
+        )
+
+    def test_series_covers_both_days(self):
+        final = _final_prices()
+        final.refresh(_data(), DAY)
+
+        starts, prices = final.series("dynamic")
+
+        assert len(starts) == len(prices) == 192
+        assert starts[0] == datetime(2025, 1, 15, tzinfo=WARSAW)
+        assert starts[96] == datetime(2025, 1, 16, tzinfo=WARSAW)
+        assert prices[96] == final.price_at("dynamic", starts[96])
+        assert final.series("g13") == ([], [])
+
+    def test_enabled_tariffs(self):
+        assert _enabled_tariffs({"operation_mode": "g12"}) == ["dynamic", "g12"]
+        assert _enabled_tariffs(
+            {"operation_mode": "comparison", "enabled_tariffs": ["g11", "dynamic"]}
+        ) == ["dynamic", "g11"]
@@ -3,17 +3,13 @@
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
-import holidays
-
 from custom_components.energy_hub_poland.helpers import (
+    ALL_HOURS_MASK,
+    hour_mask,
     is_peak_time,
     is_summer,
     parse_hour_ranges,
 )
-from custom_components.energy_hub_poland.tariffs import (
-    get_current_g12_price,
-    get_current_g12w_price,
-)
 
 # Use real Europe/Warsaw timezone so DST detection works properly
 WARSAW = ZoneInfo("Europe/Warsaw")
@@ -102,90 +98,33 @@ class TestIsPeakTime:
         dt = datetime(2025, 1, 15, 12, 0, 0)
         assert is_peak_time(dt, [(8, 11), (15, 22)]) is False
 
+    def test_range_crossing_midnight(self):
+        assert is_peak_time(datetime(2025, 1, 15, 23, 0, 0), [(22, 6)]) is True
+        assert is_peak_time(datetime(2025, 1, 15, 5, 0, 0), [(22, 6)]) is True
+        assert is_peak_time(datetime(2025, 1, 15, 6, 0, 0), [(22, 6)]) is False
 
-# ============================================================
-# get_seasonal_peak_hours_str
-# ============================================================
+    def test_accepts_hour_mask(self):
+        mask = hour_mask("8-11,15-22")
+        assert is_peak_time(datetime(2025, 1, 15, 16, 0, 0), mask) is True
+        assert is_peak_time(datetime(2025, 1, 15, 12, 0, 0), mask) is False
 
 
 # ============================================================
-# get_current_g12_price
+# hour_mask
 # ============================================================
 
 
-class TestGetCurrentG12Price:
-    def test_peak_hour_returns_peak_price(self):
-        dt = datetime(2025, 1, 15, 10, 0, 0, tzinfo=WARSAW)
-        settings = {
-            "hours_peak_winter": "8-14",
-            "price_peak": 0.80,
-            "price_offpeak": 0.50,
-        }
-        assert get_current_g12_price(dt, settings) == 0.80
+class TestHourMask:
+    def test_bits_match_hours(self):
+        mask = hour_mask("6-8,22-1")
+        assert [hour for hour in range(24) if mask >> hour & 1] == [0, 6, 7, 22, 23]
 
-    def test_offpeak_hour_returns_offpeak_price(self):
-        dt = datetime(2025, 1, 15, 22, 0, 0, tzinfo=WARSAW)
-        settings = {
-            "hours_peak_winter": "8-14",
-            "price_peak": 0.80,
-            "price_offpeak": 0.50,
-        }
-        assert get_current_g12_price(dt, settings) == 0.50
+    def test_full_and_empty_day(self):
+        assert hour_mask("0-24") == ALL_HOURS_MASK
+        assert hour_mask("5-5") == ALL_HOURS_MASK
+        assert hour_mask("") == 0
 
 
 # ============================================================
-# get_current_g12w_price
+# get_seasonal_peak_hours_str
 # ============================================================
-
-
-class TestGetCurrentG12wPrice:
-    def test_weekend_returns_offpeak(self):
-        # Saturday Jan 18, 2025
-        dt = datetime(2025, 1, 18, 10, 0, 0, tzinfo=WARSAW)
-        settings = {
-            "hours_peak_winter": "8-14",
-            "price_peak": 0.80,
-            "price_offpeak": 0.50,
-        }
-        assert get_current_g12w_price(dt, settings) == 0.50
-
-    def test_sunday_returns_offpeak(self):
-        dt = datetime(2025, 1, 19, 10, 0, 0, tzinfo=WARSAW)
-        settings = {
-            "hours_peak_winter": "8-14",
-            "price_peak": 0.80,
-            "price_offpeak": 0.50,
-        }
-        assert get_current_g12w_price(dt, settings) == 0.50
-
-    def test_polish_holiday_returns_offpeak(self):
-        # Nov 11 is Polish Independence Day (Tuesday in 2025)
-        dt = datetime(2025, 11, 11, 10, 0, 0, tzinfo=WARSAW)
-        pl_holidays = holidays.PL(years=2025)
-        assert dt.date() in pl_holidays  # sanity check
-        settings = {
-            "hours_peak_winter": "8-14",
-            "price_peak": 0.80,
-            "price_offpeak": 0.50,
-        }
-        assert get_current_g12w_price(dt, settings) == 0.50
-
-    def test_weekday_peak_returns_peak_price(self):
-        # Wednesday Jan 15, 2025
-        dt = datetime(2025, 1, 15, 10, 0, 0, tzinfo=WARSAW)
-        settings = {
-            "hours_peak_winter": "8-14",
-            "price_peak": 0.80,
-            "price_offpeak": 0.50,
-        }
-        assert get_current_g12w_price(dt, settings) == 0.80
-
-    def test_weekday_offpeak_returns_offpeak_price(self):
-        # Wednesday 22:00
-        dt = datetime(2025, 1, 15, 22, 0, 0, tzinfo=WARSAW)
-        settings = {
-            "hours_peak_winter": "8-14",
-            "price_peak": 0.80,
-            "price_offpeak": 0.50,
-        }
-        assert get_current_g12w_price(dt, settings) == 0.50
@@ -0,0 +1,66 @@
+"""Tests for the Polish statutory holiday calendar."""
+
+from datetime import date, datetime
+
+import holidays
+import pytest
+
+from custom_components.energy_hub_poland.holiday_calendar import (
+    RULES_FIRST_YEAR,
+    HolidayCalendar,
+    easter_sunday,
+    statutory_holidays,
+)
+from tests.common import WARSAW
+
+
+class TestEaster:
+    @pytest.mark.parametrize(
+        "expected",
+        [date(2024, 3, 31), date(2025, 4, 20), date(2038, 4, 25), date(2285, 3, 22)],
+    )
+    def test_known_dates(self, expected):
+        assert easter_sunday(expected.year) == expected
+
+
+class TestStatutoryHolidays:
+    @pytest.mark.parametrize("year", range(RULES_FIRST_YEAR, 2041))
+    def test_matches_holidays_library(self, year):
+        assert statutory_holidays(year) == frozenset(holidays.PL(years=year))
+
+    def test_moveable_feasts_2025(self):
+        days = statutory_holidays(2025)
+
+        assert date(2025, 4, 21) in days  # Easter Monday
+        assert date(2025, 6, 8) in days  # Pentecost
+        assert date(2025, 6, 19) in days  # Corpus Christi
+        assert date(2025, 12, 24) in days
+
+    def test_later_holidays_not_applied_before_their_year(self):
+        assert date(2010, 1, 6) not in statutory_holidays(2010)
+        assert date(2024, 12, 24) not in statutory_holidays(2024)
+
+
+class TestHolidayCalendar:
+    def test_lookup_accepts_dates_and_datetimes(self):
+        calendar = HolidayCalendar()
+
+        assert date(2025, 11, 11) in calendar
+        assert datetime(2025, 11, 11, 10, tzinfo=WARSAW) in calendar
+        assert date(2025, 11, 12) not in calendar
+        assert "2025-11-11" not in calendar
+
+    def test_year_is_computed_once(self):
+        calendar = HolidayCalendar()
+
+        assert date(2025, 1, 1) in calendar
+        ordinals = calendar._years[2025]
+        assert date(2025, 5, 3) in calendar
+        assert calendar._years[2025] is ordinals
+        assert set(calendar._years) == {2025}
+
+    def test_years_before_rules_use_library(self):
+        calendar = HolidayCalendar()
+
+        assert date(1985, 7, 22) in calendar  # Pre-1990 national day
+        assert date(1985, 5, 3) not in calendar
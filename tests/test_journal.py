@@ -0,0 +1,169 @@
+"""Tests for the write-ahead cost journal."""
+
+import os
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.energy_hub_poland.coordinator import (
+    EnergyHubDataCoordinator,
+    EnergyHubEntryCoordinator,
+)
+from custom_components.energy_hub_poland.journal import RECORD, CostJournal
+
+T0 = datetime(2025, 1, 15, 12, 0, tzinfo=UTC).timestamp()
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return CostJournal(str(tmp_path / "journal" / "entry.bin"))
+
+
+class TestCostJournal:
+    def test_remove_deletes_the_file(self, journal):
+        journal.append(T0, 52, 0.5)
+        journal.write(journal.take())
+
+        journal.remove()
+        journal.remove()
+
+        assert not os.path.exists(journal.path)
+
+    def test_records_are_buffered_until_written(self, journal):
+        journal.append(T0, 52, 0.5)
+        journal.append(T0 + 1, 52, 0.25)
+
+        assert journal.pending == 2
+        assert journal.read_since(0.0) == []
+
+        journal.write(journal.take())
+
+        assert journal.pending == 0
+        assert os.path.getsize(journal.path) == 2 * RECORD.size
+        assert journal.read_since(0.0) == [(T0, 52, 0.5), (T0 + 1, 52, 0.25)]
+
+    def test_timestamps_are_strictly_increasing(self, journal):
+        first = journal.append(T0, 52, 0.1)
+        second = journal.append(T0, 52, 0.1)
+
+        assert second > first
+
+    def test_read_skips_records_before_watermark(self, journal):
+        for offset in range(3):
+            journal.append(T0 + offset, 52, 0.1)
+        journal.write(journal.take())
+
+        assert [r[0] for r in journal.read_since(T0)] == [T0 + 1, T0 + 2]
+
+    def test_compact_keeps_only_the_tail(self, journal):
+        for offset in range(4):
+            journal.append(T0 + offset, 52, 0.1)
+        journal.write(journal.take())
+
+        journal.compact(T0 + 1)
+
+        assert os.path.getsize(journal.path) == 2 * RECORD.size
+        assert [r[0] for r in journal.read_since(0.0)] == [T0 + 2, T0 + 3]
+
+    def test_torn_record_is_ignored(self, journal):
+        journal.append(T0, 52, 0.1)
+        journal.write(journal.take())
+        with open(journal.path, "ab") as file:
+            file.write(b"\x00" * 5)
+
+        assert journal.read_since(0.0) == [(T0, 52, 0.1)]
+
+    def test_missing_file_is_empty(self, journal):
+        assert journal.read_since(0.0) == []
+        journal.compact(T0)
+
+
+class TestJournalRecovery:
+    def _entry_coordinator(self, journal):
+        market = EnergyHubDataCoordinator.__new__(EnergyHubDataCoordinator)
+        market.data = {}
+        market.api_connected = True
+        market.stale = False
+        market.save_stats = {"cache": {"dirty": 0, "scheduled": 0, "written": 0}}
+        market._entries = {}
+        entry = SimpleNamespace(entry_id="entry_a", data={}, options={})
+        coord = EnergyHubEntryCoordinator(MagicMock(), entry, market)
+        coord.hass = MagicMock()
+        coord.hass.async_add_executor_job = AsyncMock(
+            side_effect=lambda func, *args: func(*args)
+        )
+        coord.async_publish = MagicMock()
+        coord.async_schedule_ledger_save = MagicMock()
+        coord.journal = journal
+        coord.ledger_store = AsyncMock()
+        return coord
+
+    @pytest.mark.asyncio
+    async def test_tail_after_snapshot_is_replayed(self, journal):
+        for offset, delta in enumerate([1.0, 2.0, 4.0]):
+            journal.append(T0 + offset, 52, delta)
+        journal.write(journal.take())
+        coord = self._entry_coordinator(journal)
+        # The saved ledger already includes the first record
+        coord.restore({"costs": {"g11": 0.5}, "journal_watermark": T0})
+        pricing = MagicMock(return_value={"g11": 0.5})
+
+        await coord.async_load_journal()
+        coord.async_set_pricing(pricing)
+
+        assert coord.costs["g11"] == pytest.approx(0.5 + 6.0 * 0.5)
+        assert coord.journal_watermark == T0 + 2
+        assert pricing.call_args_list[0].args[0] == datetime.fromtimestamp(T0 + 1, UTC)
+        coord.async_schedule_ledger_save.assert_called_once()
+
+    def test_watermark_moves_when_slot_is_settled(self, journal):
+        coord = self._entry_coordinator(journal)
+        coord.async_set_pricing(MagicMock(return_value={"g11": 1.0}))
+
+        coord.async_add_energy(0.5)
+
+        assert journal.pending == 1
+        # The open slot is not in the ledger yet, so it must stay replayable
+        assert coord.as_dict()["journal_watermark"] == 0.0
+
+        coord._close_bucket()
+
+        assert coord.journal_watermark > 0
+        assert coord.as_dict()["journal_watermark"] == coord.journal_watermark
+
+    @pytest.mark.asyncio
+    async def test_hourly_flush_compacts_without_unload(self, journal):
+        coord = self._entry_coordinator(journal)
+        coord.async_set_pricing(MagicMock(return_value={"g11": 1.0}))
+        for offset in range(3):
+            journal.append(T0 + offset, 52, 0.5)
+        journal.write(journal.take())
+        coord.journal_watermark = T0 + 2
+        # The delayed save already wrote the snapshot including every record
+        coord._ledger_to_save()
+        market = coord.market
+        market._entries = {coord.entry_id: coord}
+
+        assert coord.needs_ledger_flush
+        await market.async_flush_cache()
+
+        assert os.path.getsize(journal.path) == 0
+        coord.ledger_store.async_save.assert_awaited_once()
+        assert not coord.needs_ledger_flush
+
+    @pytest.mark.asyncio
+    async def test_final_write_persists_open_slot(self, journal):
+        coord = self._entry_coordinator(journal)
+        coord.async_set_pricing(MagicMock(return_value={"g11": 1.0}))
+        coord.async_add_energy(0.5)
+
+        await coord.async_handle_final_write(MagicMock())
+
+        saved = coord.ledger_store.async_save.call_args[0][0]
+        assert saved["costs"]["g11"] == pytest.approx(0.5)
+        assert saved["journal_watermark"] == coord.journal_watermark > 0
+        # Every journaled record is in the saved snapshot
+        assert journal.pending == 0
+        assert os.path.getsize(journal.path) == 0
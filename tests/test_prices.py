@@ -0,0 +1,235 @@
+"""Tests for the quarter-hour price store."""
+
+from datetime import date, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.energy_hub_poland.coordinator import EnergyHubDataCoordinator
+from custom_components.energy_hub_poland.prices import (
+    WALL_QUARTERS_PER_DAY,
+    DayPrices,
+    PriceWindow,
+    parse_dtime,
+    price_at,
+)
+from tests.common import WARSAW
+
+DAY = date(2025, 1, 15)
+
+
+class TestParseDtime:
+    def test_period_end_maps_to_slot(self):
+        assert parse_dtime("2025-01-15 00:15:00") == (DAY, 0)
+        assert parse_dtime("2025-01-15 01:00:00") == (DAY, 3)
+        assert parse_dtime("2025-01-15 23:45") == (DAY, 94)
+
+    def test_midnight_closes_previous_day(self):
+        assert parse_dtime("2025-01-16 00:00:00") == (DAY, WALL_QUARTERS_PER_DAY - 1)
+
+    def test_invalid_values(self):
+        assert parse_dtime("garbage") is None
+        assert parse_dtime(None) is None
+
+
+class TestDayPrices:
+    def test_hourly_view_averages_quarters(self):
+        day = DayPrices(DAY)
+        for slot, value in enumerate([0.1, 0.2, 0.3, 0.4]):
+            day.set_slot(slot, value)
+        day.set_slot(4, 1.0)
+
+        assert day == {0: pytest.approx(0.25), 1: 1.0}
+        assert day.get_slot(5) is None
+        assert not day.is_complete
+
+    def test_views_are_cached_until_write(self):
+        day = DayPrices.from_hourly(DAY, {0: 0.5})
+        first = day.hourly()
+        assert day.hourly() is first
+
+        day.set_slot(0, 0.1)
+
+        assert day.hourly() is not first
+        assert day.quarter_hours()[0] == 0.1
+
+    def test_fill_hour_keeps_known_quarters(self):
+        day = DayPrices(DAY)
+        day.set_slot(0, 0.9)
+
+        day.fill_hour(0, 0.5, only_missing=True)
+
+        assert day.quarter_hours() == {0: 0.9, 1: 0.5, 2: 0.5, 3: 0.5}
+
+    def test_slots_roundtrip(self):
+        day = DayPrices.from_hourly(DAY, dict.fromkeys(range(24), 0.3))
+        day.set_slot(10, 0.7)
+
+        restored = DayPrices.from_slots(DAY, day.to_slots())
+
+        assert restored.is_complete
+        assert restored.quarter_hours() == day.quarter_hours()
+
+    def test_price_at_prefers_quarter_hour(self):
+        day = DayPrices.from_hourly(DAY, {13: 0.4})
+        day.set_slot(13 * 4 + 2, 0.9)
+        data = {"today": day.hourly(), "today_quarters": day.quarter_hours()}
+
+        assert price_at(data, datetime(2025, 1, 15, 13, 31, tzinfo=WARSAW)) == 0.9
+        assert price_at(data, datetime(2025, 1, 15, 13, 5, tzinfo=WARSAW)) == 0.4
+        assert (
+            price_at({"today": {13: 0.4}}, datetime(2025, 1, 15, 13, 31, tzinfo=WARSAW))
+            == 0.4
+        )
+
+    def test_price_at_other_day_uses_window(self):
+        window = PriceWindow(7)
+        yesterday = DayPrices.from_hourly(date(2025, 1, 14), {13: 0.6})
+        window.put(yesterday)
+        window.advance(DAY)
+        data = {"price_window": window, "today": {13: 0.4}}
+
+        when = datetime(2025, 1, 14, 13, 31, tzinfo=WARSAW)
+        assert price_at(data, when) == 0.6
+        assert price_at(data, datetime(2025, 1, 15, 13, 5, tzinfo=WARSAW)) == 0.4
+        assert price_at(data, datetime(2025, 1, 10, 13, tzinfo=WARSAW)) is None
+
+
+class TestParsePsePrices:
+    def _coordinator(self):
+        coord = EnergyHubDataCoordinator.__new__(EnergyHubDataCoordinator)
+        coord.hass = MagicMock()
+        coord.archive = MagicMock()
+        coord._archived = {}
+        coord._archiving = {}
+        coord.async_schedule_cache_save = MagicMock()
+        return coord
+
+    def test_actuals_override_forecasts_per_quarter(self):
+        coord = self._coordinator()
+        forecast = [
+            {"dtime": "2025-01-15 00:15:00", "cen_fcst": 100},
+            {"dtime": "2025-01-15 00:30:00", "cen_fcst": 200},
+        ]
+        rce = [{"dtime": "2025-01-15 00:15:00", "rce_pln": 500}]
+
+        days = coord._parse_pse_prices(rce, forecast)
+
+        assert days[DAY].quarter_hours() == {0: 0.5, 1: 0.2}
+        assert days[DAY][0] == pytest.approx(0.35)
+
+    @pytest.mark.asyncio
+    async def test_pge_fills_missing_quarters(self):
+        coord = self._coordinator()
+        coord._prices = PriceWindow(7)
+        coord._parsed_pse = None
+        coord._last_tomorrow_event_date = DAY
+        coord._rce_days = set()
+        coord._fetch_pge_prices = AsyncMock(return_value=dict.fromkeys(range(24), 0.3))
+        rce = [{"dtime": "2025-01-15 00:15:00", "rce_pln": 500}]
+
+        await coord._update_pse_prices(DAY, rce, None)
+
+        today = coord._prices.get(DAY)
+        assert today.is_complete
+        assert today.get_slot(0) == 0.5
+        assert today.get_slot(1) == 0.3
+
+    @pytest.mark.asyncio
+    async def test_tomorrow_event_waits_for_rce(self):
+        coord = self._coordinator()
+        coord._prices = PriceWindow(7)
+        coord._parsed_pse = None
+        coord._last_tomorrow_event_date = None
+        coord._rce_days = set()
+        coord._fetch_pge_prices = AsyncMock(return_value=dict.fromkeys(range(24), 0.3))
+        forecast = [{"dtime": "2025-01-16 00:15:00", "cen_fcst": 100}]
+
+        await coord._update_pse_prices(DAY, None, forecast)
+
+        assert coord._prices.get(date(2025, 1, 16)).is_complete
+        coord.hass.bus.async_fire.assert_not_called()
+
+        rce = [{"dtime": "2025-01-16 00:15:00", "rce_pln": 500}]
+        await coord._update_pse_prices(DAY, rce, forecast)
+        await coord._update_pse_prices(DAY, rce, forecast)
+
+        coord.hass.bus.async_fire.assert_called_once()
+        assert coord._last_tomorrow_event_date == date(2025, 1, 16)
+
+    def test_autumn_dst_day_keeps_repeated_hour(self):
+        coord = self._coordinator()
+        day = date(2025, 10, 26)
+        rce = [
+            {"dtime": "2025-10-26 02:15:00", "rce_pln": 100},
+            {"dtime": "2025-10-26 02:15:00", "rce_pln": 300},
+            {"dtime": "2025-10-26 03:15:00", "rce_pln": 500},
+        ]
+
+        prices = coord._parse_pse_prices(rce, None)[day]
+
+        assert prices.slots.count == 100
+        assert prices.quarter_hours() == {8: 0.1, 12: 0.3, 16: 0.5}
+        assert prices[2] == pytest.approx(0.2)
+        assert prices[3] == 0.5
+
+    def test_spring_dst_day_skips_missing_hour(self):
+        coord = self._coordinator()
+        day = date(2025, 3, 30)
+        rce = [
+            {"dtime": "2025-03-30 02:15:00", "rce_pln": 100},
+            {"dtime": "2025-03-30 03:15:00", "rce_pln": 500},
+        ]
+
+        prices = coord._parse_pse_prices(rce, None)[day]
+
+        assert prices.slots.count == 92
+        assert prices.quarter_hours() == {8: 0.5}
+        assert 2 not in prices
+
+
+class TestPriceWindow:
+    def test_rollover_only_moves_pointer(self):
+        window = PriceWindow(7)
+        today = DayPrices.from_hourly(DAY, {0: 0.3})
+        tomorrow = DayPrices.from_hourly(date(2025, 1, 16), {0: 0.4})
+        window.put(today)
+        window.put(tomorrow)
+        window.advance(DAY)
+
+        window.advance(date(2025, 1, 16))
+
+        assert window.relative(0) is tomorrow
+        assert window.relative(-1) is today
+        assert window.relative(1) is None
+
+    def test_days_outside_window_are_hidden(self):
+        window = PriceWindow(3)
+        old = DayPrices.from_hourly(DAY, {0: 0.3})
+        window.put(old)
+
+        window.advance(date(2025, 1, 17))
+
+        assert window.get(DAY) is None
+        assert window.days() == []
+
+    def test_reused_ring_position_replaces_old_day(self):
+        window = PriceWindow(3)
+        window.put(DayPrices.from_hourly(DAY, {0: 0.3}))
+        newer = DayPrices.from_hourly(date(2025, 1, 18), {0: 0.5})
+
+        window.put(newer)
+        window.advance(date(2025, 1, 17))
+
+        assert window.get(DAY) is None
+        assert window.days() == [newer]
+
+    def test_stats_are_cached_per_day(self):
+        day = DayPrices.from_hourly(DAY, {0: 0.5, 1: 0.1, 2: 0.9})
+
+        stats = day.stats()
+
+        assert stats == {"avg": 0.5, "min_hour": 1, "max_hour": 2, "max_price": 0.9}
+        assert day.stats() is stats
+        day.fill_hour(3, 1.5)
+        assert day.stats()["max_hour"] == 3
@@ -1,16 +1,25 @@
 """Tests for sensor logic (price sensors, cost sensors, energy delta)."""
 
-from datetime import timedelta, timezone
+from datetime import UTC, date, datetime, timedelta, timezone
 from types import SimpleNamespace
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from custom_components.energy_hub_poland.const import (
     CONF_PRICE_UNIT,
+    CONF_WINDOW_HOURS,
     SENSOR_TYPE_DAILY,
     SENSOR_TYPE_TOTAL_INCREASING,
     UNIT_KWH,
     UNIT_MWH,
 )
+from custom_components.energy_hub_poland.coordinator import (
+    TOPIC_PRICES,
+    TOPIC_SLOT,
+    TOPIC_STATUS,
+    cost_topic,
+    price_topic,
+)
+from custom_components.energy_hub_poland.final_prices import FinalPrices
 
 # Import sensor classes
 from custom_components.energy_hub_poland.sensor import (
@@ -19,7 +28,13 @@ from custom_components.energy_hub_poland.sensor import (
     EnergyConsumerEntity,
     LowestPriceHourSensor,
     MinMaxPriceSensor,
+    PriceWindowSensor,
+    TariffCostSensor,
+    setup_window_sensors,
 )
+from custom_components.energy_hub_poland.sensor import dt_util as sensor_dt_util
+from custom_components.energy_hub_poland.tariffs import compile_fee_schedules
+from custom_components.energy_hub_poland.windows import PriceWindows
 from tests.common import ENTRY_ID, SAMPLE_PRICES_TODAY
 
 CET = timezone(timedelta(hours=1))
@@ -34,6 +49,14 @@ def _make_entry(**data_overrides):
     )
 
 
+def _attach_final_prices(coord, config):
+    """Give a mocked entry coordinator its fee schedules and final prices."""
+    coord.data_version = 1
+    coord.fee_schedules = compile_fee_schedules(config)
+    coord.final_prices = FinalPrices(["dynamic"], {}, coord.fee_schedules)
+    coord.final_prices.refresh(coord.data or {}, date(2025, 1, 15))
+
+
 # ============================================================
 # DynamicPriceEntity._scale_price
 # ============================================================
@@ -45,8 +68,10 @@ class TestConvertPrice:
         coord = MagicMock()
         entity = CurrentPriceSensor.__new__(CurrentPriceSensor)
         entity.coordinator = coord
+        entity._memo = {}
         entity._config = {**entry.data, **entry.options}
         entity._price_unit = unit_type
+        entity._fees = compile_fee_schedules(entity._config)
         return entity
 
     def test_kwh_passthrough(self):
@@ -62,6 +87,14 @@ class TestConvertPrice:
         entity = self._make_entity(UNIT_KWH)
         assert entity._convert_price(None) is None
 
+    def test_total_price_only_reads_fee_schedules(self):
+        entity = self._make_entity(UNIT_KWH)
+        fees = dict(entity._fees)
+
+        assert entity._calculate_total_price(0.5, "g11") == 0.5
+        assert entity._calculate_total_price(0.5, "unknown") is None
+        assert entity._fees == fees
+
 
 # ============================================================
 # AveragePriceSensor
@@ -78,6 +111,8 @@ class TestAveragePriceSensor:
         sensor.coordinator = coord
         sensor._config = {**entry.data, **entry.options}
         sensor._price_unit = unit_type
+        _attach_final_prices(coord, sensor._config)
+        sensor._fees = coord.fee_schedules
         sensor._day = day
         return sensor
 
@@ -115,6 +150,7 @@ class TestLowestPriceHourSensor:
 
         sensor = LowestPriceHourSensor.__new__(LowestPriceHourSensor)
         sensor.coordinator = coord
+        sensor._memo = {}
         sensor._day = day
         return sensor
 
@@ -133,6 +169,7 @@ class TestLowestPriceHourSensor:
         coord.data = None
         sensor = LowestPriceHourSensor.__new__(LowestPriceHourSensor)
         sensor.coordinator = coord
+        sensor._memo = {}
         sensor._day = "today"
         assert sensor.native_value is None
 
@@ -141,6 +178,78 @@ class TestLowestPriceHourSensor:
         assert sensor.native_value is None
 
 
+# ============================================================
+# PriceWindowSensor
+# ============================================================
+
+
+class TestPriceWindowSensor:
+    def _make_sensor(self, kind="cheapest", hours=2, unit_type=UNIT_KWH):
+        coord = MagicMock()
+        coord.data = {"today": dict(SAMPLE_PRICES_TODAY)}
+        _attach_final_prices(coord, {"vat_rate": "0"})
+        coord.price_windows = PriceWindows(coord.final_prices)
+
+        sensor = PriceWindowSensor.__new__(PriceWindowSensor)
+        sensor.coordinator = coord
+        sensor._memo = {}
+        sensor._hours = hours
+        sensor._kind = kind
+        sensor._price_unit = unit_type
+        return sensor
+
+    def test_cheapest_window_start(self):
+        sensor = self._make_sensor()
+        morning = datetime(2025, 1, 14, 23, tzinfo=UTC)  # 00:00 in Poland
+
+        with patch.object(sensor_dt_util, "utcnow", return_value=morning):
+            start = sensor.native_value
+            attributes = sensor.extra_state_attributes
+
+        # Prices rise through the day: 0.30 at 00:00 and 0.32 at 01:00
+        assert start == morning
+        assert attributes["end"] == morning + timedelta(hours=2)
+        assert attributes["average_price"] == 0.31
+        assert attributes["hours"] == 2
+
+    def test_window_follows_the_current_slot(self):
+        sensor = self._make_sensor(hours=1)
+        morning = datetime(2025, 1, 14, 23, tzinfo=UTC)  # 00:00 in Poland
+
+        with patch.object(sensor_dt_util, "utcnow", return_value=morning):
+            assert sensor.native_value == morning
+        later = morning + timedelta(minutes=15)
+        with patch.object(sensor_dt_util, "utcnow", return_value=later):
+            assert sensor.native_value == later
+
+    def test_no_window_left(self):
+        sensor = self._make_sensor(kind="most_expensive", unit_type=UNIT_MWH)
+        evening = datetime(2025, 1, 15, 22, 30, tzinfo=UTC)
+
+        with patch.object(sensor_dt_util, "utcnow", return_value=evening):
+            assert sensor.native_value is None
+            assert sensor.extra_state_attributes == {}
+
+    def test_setup_only_offered_lengths(self):
+        coord, entry = MagicMock(), _make_entry()
+
+        sensors = setup_window_sensors(
+            coord, entry, {CONF_WINDOW_HOURS: ["1", "6", "7"]}
+        )
+
+        assert [sensor._attr_unique_id for sensor in sensors] == [
+            f"cheapest_window_1h_{ENTRY_ID}",
+            f"most_expensive_window_1h_{ENTRY_ID}",
+            f"cheapest_window_6h_{ENTRY_ID}",
+            f"most_expensive_window_6h_{ENTRY_ID}",
+        ]
+        assert sensors[0].coordinator_context == {
+            TOPIC_STATUS,
+            TOPIC_PRICES,
+            TOPIC_SLOT,
+        }
+
+
 # ============================================================
 # MinMaxPriceSensor
 # ============================================================
@@ -154,8 +263,11 @@ class TestMinMaxPriceSensor:
 
         sensor = MinMaxPriceSensor.__new__(MinMaxPriceSensor)
         sensor.coordinator = coord
+        sensor._memo = {}
         sensor._config = {**entry.data, **entry.options}
         sensor._price_unit = unit_type
+        _attach_final_prices(coord, sensor._config)
+        sensor._fees = coord.fee_schedules
         sensor._day = day
         sensor._mode = mode
         return sensor
@@ -193,6 +305,16 @@ class TestMinMaxPriceSensor:
         assert "00:00" in attrs["hours"]
         assert "01:00" in attrs["hours"]
 
+    def test_attributes_memoized_per_data_version(self):
+        sensor = self._make_sensor({0: 0.50, 1: 0.30}, mode="min")
+        first = sensor.extra_state_attributes
+
+        sensor.coordinator.data = {"today": {0: 0.10, 1: 0.30}}
+        assert sensor.extra_state_attributes is first
+
+        sensor.coordinator.data_version += 1
+        assert sensor.extra_state_attributes == {"hour": "00:00"}
+
     def test_attributes_empty_data(self):
         sensor = self._make_sensor(None, mode="min")
         assert sensor.extra_state_attributes == {"prices": {}}
@@ -255,3 +377,27 @@ class TestGetEnergyDelta:
         delta = entity._get_energy_delta(0.0)
         # current < last → energy_delta = current = 0.0
         assert delta == 0.0
+
+
+# ============================================================
+# Update topics
+# ============================================================
+
+
+class TestUpdateTopics:
+    def test_entities_subscribe_to_their_inputs(self):
+        coord, entry = MagicMock(), _make_entry()
+
+        g12 = CurrentPriceSensor(coord, entry, "g12")
+        dynamic = CurrentPriceSensor(coord, entry, "dynamic")
+        average = AveragePriceSensor(coord, entry, "today")
+        cost = TariffCostSensor(coord, entry, "g13")
+
+        assert g12.coordinator_context == {TOPIC_STATUS, price_topic("g12")}
+        assert dynamic.coordinator_context == {
+            TOPIC_STATUS,
+            TOPIC_PRICES,
+            price_topic("dynamic"),
+        }
+        assert average.coordinator_context == {TOPIC_STATUS, TOPIC_PRICES}
+        assert cost.coordinator_context == {TOPIC_STATUS, cost_topic("g13")}
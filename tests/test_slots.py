@@ -0,0 +1,65 @@
+"""Tests for the Warsaw quarter-hour slot calendar."""
+
+from datetime import UTC, date, datetime
+
+from custom_components.energy_hub_poland.slots import SLOT_CALENDAR, SlotCalendar
+
+
+class TestDaySlots:
+    def test_regular_day_has_96_slots(self):
+        day = SLOT_CALENDAR.day(date(2025, 1, 15))
+
+        assert day.count == 96
+        assert day.start == datetime(2025, 1, 14, 23, 0, tzinfo=UTC)
+        assert day.hour_slots[13] == (52, 53, 54, 55)
+
+    def test_spring_dst_day_has_92_slots(self):
+        day = SLOT_CALENDAR.day(date(2025, 3, 30))
+
+        assert day.count == 92
+        assert day.hour_slots[2] == ()
+        assert day.slot_for_wall(8) is None
+        assert day.slot_for_wall(12) == 8
+
+    def test_autumn_dst_day_has_100_slots(self):
+        day = SLOT_CALENDAR.day(date(2025, 10, 26))
+
+        assert day.count == 100
+        assert day.hour_slots[2] == (8, 9, 10, 11, 12, 13, 14, 15)
+        assert day.slot_for_wall(8) == 8
+        assert day.slot_for_wall(8, fold=1) == 12
+        assert day.slot_for_wall(12) == 16
+
+    def test_slot_start_roundtrip(self):
+        day = SLOT_CALENDAR.day(date(2025, 10, 26))
+
+        for slot in (0, 11, 12, 99):
+            assert day.slot_at(day.slot_start(slot)) == slot
+        assert day.slot_start(day.count) == day.end
+
+
+class TestSlotCalendar:
+    def test_locate_current_slot(self):
+        calendar = SlotCalendar()
+        # 13:31 in Poland
+        day, slot = calendar.locate(datetime(2025, 1, 15, 12, 31, tzinfo=UTC))
+
+        assert day.day == date(2025, 1, 15)
+        assert slot == 54
+
+    def test_locate_moves_to_next_day(self):
+        calendar = SlotCalendar()
+        calendar.locate(datetime(2025, 1, 15, 22, 59, tzinfo=UTC))
+
+        day, slot = calendar.locate(datetime(2025, 1, 15, 23, 0, tzinfo=UTC))
+
+        assert day.day == date(2025, 1, 16)
+        assert slot == 0
+
+    def test_locate_in_repeated_hour(self):
+        calendar = SlotCalendar()
+        # 02:15 CET, the second time the clock shows 02:15 that night
+        day, slot = calendar.locate(datetime(2025, 10, 26, 1, 15, tzinfo=UTC))
+
+        assert slot == 13
+        assert day.wall[slot] == 9
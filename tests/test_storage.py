@@ -0,0 +1,89 @@
+"""Tests for the split price cache and cost ledger stores."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.energy_hub_poland import async_remove_entry
+from custom_components.energy_hub_poland.const import JOURNAL_DIRECTORY
+from custom_components.energy_hub_poland.storage import (
+    CACHE_STORAGE_VERSION,
+    LEDGER_STORAGE_KEY,
+    EntryLedgerStore,
+    PriceCacheStore,
+    split_legacy_cache,
+)
+
+LEGACY = {
+    "today": {"0": 0.1},
+    "today_date": "2025-01-15",
+    "load_actual": 1000,
+    "costs": {"g11": 1.5},
+    "cost_breakdown": {"g11": {"total": 1.5}},
+    "last_reset": "2025-01-01T00:00:00",
+}
+
+
+class TestSplitLegacyCache:
+    def test_costs_go_to_ledger(self):
+        cache, ledger = split_legacy_cache(LEGACY)
+
+        assert cache == {
+            "today": {"0": 0.1},
+            "today_date": "2025-01-15",
+            "load_actual": 1000,
+        }
+        assert ledger == {
+            "costs": {"g11": 1.5},
+            "cost_breakdown": {"g11": {"total": 1.5}},
+            "last_reset": "2025-01-01T00:00:00",
+        }
+
+    def test_no_costs_no_ledger(self):
+        cache, ledger = split_legacy_cache({"today": {}, "costs": {}})
+
+        assert cache == {"today": {}}
+        assert ledger is None
+
+
+class TestStores:
+    def test_entry_ledgers_are_namespaced(self):
+        cache = PriceCacheStore(MagicMock())
+        first = EntryLedgerStore(MagicMock(), "entry_a")
+        second = EntryLedgerStore(MagicMock(), "entry_b")
+
+        assert len({cache.key, first.key, second.key}) == 3
+        assert first.key == f"{LEDGER_STORAGE_KEY}.entry_a"
+        assert cache.version == CACHE_STORAGE_VERSION
+
+    @pytest.mark.asyncio
+    async def test_migration_keeps_costs_aside(self):
+        store = PriceCacheStore(MagicMock())
+
+        migrated = await store._async_migrate_func(1, 1, dict(LEGACY))
+
+        assert "costs" not in migrated
+        assert store.legacy_ledger["costs"]["g11"] == 1.5
+
+
+class TestRemoveEntry:
+    @pytest.mark.asyncio
+    async def test_ledger_and_journal_are_deleted(self, tmp_path):
+        hass = MagicMock()
+        hass.config.path = lambda *parts: str(tmp_path.joinpath(*parts))
+        hass.async_add_executor_job = AsyncMock(
+            side_effect=lambda func, *args: func(*args)
+        )
+        journal = tmp_path / ".storage" / JOURNAL_DIRECTORY / "entry_a.bin"
+        journal.parent.mkdir(parents=True)
+        journal.write_bytes(b"x")
+        store = AsyncMock()
+
+        with patch(
+            "custom_components.energy_hub_poland.EntryLedgerStore", return_value=store
+        ) as store_cls:
+            await async_remove_entry(hass, MagicMock(entry_id="entry_a"))
+
+        assert store_cls.call_args.args[1] == "entry_a"
+        store.async_remove.assert_awaited_once()
+        assert not journal.exists()
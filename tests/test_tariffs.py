@@ -0,0 +1,253 @@
+"""Tests for the compiled tariff tables and fee schedules."""
+
+import timeit
+from datetime import date, datetime, timedelta
+
+import holidays
+import pytest
+
+from custom_components.energy_hub_poland.helpers import parse_hour_ranges
+from custom_components.energy_hub_poland.tariffs import (
+    DAY_HOLIDAY,
+    DAY_SATURDAY,
+    DAY_SUNDAY,
+    DAY_WORKDAY,
+    ZONE_OFFPEAK,
+    ZONE_PEAK,
+    ZONE_PEAK_2,
+    FeeSchedule,
+    TariffTable,
+    compile_fee_schedules,
+    compile_tariff_tables,
+    day_type,
+    table_index,
+)
+from tests.common import WARSAW
+
+SETTINGS = {
+    "g11": {"price_peak": 0.9},
+    "g12": {
+        "price_peak": 0.8,
+        "price_offpeak": 0.5,
+        "hours_peak_winter": "6-13,15-22",
+        "hours_peak_summer": "22-6",
+    },
+    "g12w": {"price_peak": 0.8, "price_offpeak": 0.5, "hours_peak": "8-14"},
+    "g12n": {"price_peak": 0.8, "price_offpeak": 0.5},
+    "g13": {"price_peak_1": 1.0, "price_peak_2": 1.2, "price_offpeak": 0.4},
+}
+
+# Frozen copy of the per-call lookup the compiled tables replaced; kept only
+# as the reference for the tables and the benchmark below.
+_HOLIDAYS = holidays.PL()
+
+
+def _is_summer(dt):
+    return 4 <= dt.month <= 9
+
+
+def _is_peak_time(dt, peak_hours):
+    for start, end in peak_hours:
+        if start < end:
+            if start <= dt.hour < end:
+                return True
+        elif dt.hour >= start or dt.hour < end:
+            return True
+    return False
+
+
+def _g11_price(dt, settings):
+    return settings.get("price_peak")
+
+
+def _g12_price(dt, settings):
+    if _is_summer(dt):
+        hours_str = settings.get("hours_peak_summer") or settings.get("hours_peak", "")
+    else:
+        hours_str = settings.get("hours_peak_winter") or settings.get("hours_peak", "")
+
+    if _is_peak_time(dt, parse_hour_ranges(hours_str)):
+        return settings.get("price_peak")
+    return settings.get("price_offpeak")
+
+
+def _g12w_price(dt, settings):
+    if dt.weekday() >= 5 or dt.date() in _HOLIDAYS:
+        return settings.get("price_offpeak")
+    return _g12_price(dt, settings)
+
+
+def _g12n_price(dt, settings):
+    if dt.weekday() == 6 or dt.date() in _HOLIDAYS:
+        return settings.get("price_offpeak")
+    if (1 <= dt.hour < 5) or (13 <= dt.hour < 15):
+        return settings.get("price_offpeak")
+    return settings.get("price_peak")
+
+
+def _g13_price(dt, settings):
+    if dt.weekday() >= 5 or dt.date() in _HOLIDAYS:
+        return settings.get("price_offpeak")
+
+    if _is_summer(dt):
+        p1_hours = parse_hour_ranges(settings.get("hours_peak_1_summer", "7-13"))
+        p2_hours = parse_hour_ranges(settings.get("hours_peak_2_summer", "19-22"))
+    else:
+        p1_hours = parse_hour_ranges(settings.get("hours_peak_1_winter", "7-13"))
+        p2_hours = parse_hour_ranges(settings.get("hours_peak_2_winter", "16-21"))
+
+    if _is_peak_time(dt, p1_hours):
+        return settings.get("price_peak_1")
+    if _is_peak_time(dt, p2_hours):
+        return settings.get("price_peak_2")
+    return settings.get("price_offpeak")
+
+
+REFERENCE = {
+    "g11": _g11_price,
+    "g12": _g12_price,
+    "g12w": _g12w_price,
+    "g12n": _g12n_price,
+    "g13": _g13_price,
+}
+
+# Workday, Saturday, Sunday and a holiday, in winter and summer
+DAYS = [
+    date(2025, 1, 15),
+    date(2025, 1, 18),
+    date(2025, 1, 19),
+    date(2025, 11, 11),
+    date(2025, 7, 16),
+    date(2025, 7, 19),
+    date(2025, 7, 20),
+    date(2025, 8, 15),
+]
+
+
+def _quarters(day):
+    start = datetime(day.year, day.month, day.day, tzinfo=WARSAW)
+    return [start + timedelta(minutes=15 * q) for q in range(96)]
+
+
+class TestDayType:
+    def test_day_types(self):
+        assert day_type(date(2025, 1, 15)) == DAY_WORKDAY
+        assert day_type(date(2025, 1, 18)) == DAY_SATURDAY
+        assert day_type(date(2025, 1, 19)) == DAY_SUNDAY
+        assert day_type(date(2025, 11, 11)) == DAY_HOLIDAY
+
+
+class TestTariffTable:
+    @pytest.mark.parametrize("tariff", list(REFERENCE))
+    def test_matches_reference_lookup(self, tariff):
+        settings = SETTINGS[tariff]
+        table = TariffTable(tariff, settings)
+
+        for day in DAYS:
+            for dt in _quarters(day):
+                assert table.price_at(dt) == REFERENCE[tariff](dt, settings), dt
+
+    def test_g13_zones(self):
+        table = TariffTable("g13", SETTINGS["g13"])
+
+        assert table.zone_at(datetime(2025, 1, 15, 8, tzinfo=WARSAW)) == ZONE_PEAK
+        assert table.zone_at(datetime(2025, 1, 15, 17, tzinfo=WARSAW)) == ZONE_PEAK_2
+        assert table.zone_at(datetime(2025, 1, 15, 23, tzinfo=WARSAW)) == ZONE_OFFPEAK
+        assert table.zone_at(datetime(2025, 1, 18, 8, tzinfo=WARSAW)) == ZONE_OFFPEAK
+
+    def test_zones_do_not_depend_on_prices(self):
+        settings = {"price_peak": 0.6, "price_offpeak": 0.6, "hours_peak": "8-14"}
+        table = TariffTable("g12", settings)
+
+        assert table.zone_at(datetime(2025, 1, 15, 9, tzinfo=WARSAW)) == ZONE_PEAK
+        assert table.zone_at(datetime(2025, 1, 15, 20, tzinfo=WARSAW)) == ZONE_OFFPEAK
+
+    def test_compiled_from_entry_config(self):
+        tables = compile_tariff_tables({"g11_settings": {"price_peak": 0.9}})
+
+        assert set(tables) == {"g11", "g12", "g12w", "g12n", "g13"}
+        assert tables["g11"].price_at(datetime(2025, 1, 15, tzinfo=WARSAW)) == 0.9
+        assert tables["g12"].price_at(datetime(2025, 1, 15, tzinfo=WARSAW)) is None
+
+
+class TestFeeSchedule:
+    def test_equal_zone_prices_keep_zone_fees(self):
+        config = {
+            "vat_rate": "23",
+            "g12_settings": {
+                "price_peak": 0.5,
+                "price_offpeak": 0.5,
+                "network_variable_fee_g12_peak": 0.3,
+                "network_variable_fee_g12_offpeak": 0.1,
+            },
+        }
+        schedule = FeeSchedule("g12", config)
+
+        assert schedule.total(0.5, ZONE_PEAK) == pytest.approx(0.8 * 1.23)
+        assert schedule.total(0.5, ZONE_OFFPEAK) == pytest.approx(0.6 * 1.23)
+        assert schedule.by_zone[ZONE_OFFPEAK] == pytest.approx(
+            {"energy": 0.5, "variable_fee": 0.1, "vat": 0.6 * 0.23, "total": 0.738}
+        )
+
+    def test_g13_second_peak_has_own_fee(self):
+        config = {
+            "g13_settings": {
+                "price_peak_1": 0.7,
+                "price_peak_2": 0.7,
+                "network_variable_fee_g13_peak1": 0.2,
+                "network_variable_fee_g13_peak2": 0.4,
+            }
+        }
+        schedule = FeeSchedule("g13", config)
+
+        assert schedule.by_zone[ZONE_PEAK]["total"] == pytest.approx(0.9)
+        assert schedule.by_zone[ZONE_PEAK_2]["total"] == pytest.approx(1.1)
+        assert ZONE_OFFPEAK not in schedule.by_zone
+
+    def test_fee_fallbacks(self):
+        config = {
+            "network_variable_fee": 0.05,
+            "network_variable_fee_dynamic": 0.2,
+            "g11_settings": {"network_variable_fee_g11": 0.0},
+            "vat_rate": "invalid",
+        }
+        schedules = compile_fee_schedules(config)
+
+        assert set(schedules) == {"dynamic", "g11", "g12", "g12w", "g12n", "g13"}
+        assert schedules["dynamic"].total(0.4) == pytest.approx(0.6)
+        # A zero tariff fee falls back to the global one
+        assert schedules["g11"].total(0.4) == pytest.approx(0.45)
+        assert schedules["g12"].components(0.4, ZONE_OFFPEAK)["vat"] == 0.0
+
+
+@pytest.mark.benchmark
+class TestTariffBenchmark:
+    def test_compiled_lookup_is_faster(self, record_property):
+        times = [dt for day in DAYS for dt in _quarters(day)]
+        tables = [TariffTable(tariff, SETTINGS[tariff]) for tariff in REFERENCE]
+        functions = [(func, SETTINGS[tariff]) for tariff, func in REFERENCE.items()]
+
+        def reference():
+            for dt in times:
+                for func, settings in functions:
+                    func(dt, settings)
+
+        def compiled():
+            # As in the sensors: one index per instant, shared by all tariffs
+            for dt in times:
+                index = table_index(dt)
+                for table in tables:
+                    table.prices[index]
+
+        lookups = len(times) * len(REFERENCE)
+        reference_cost = min(timeit.repeat(reference, number=5, repeat=3)) / 5
+        compiled_cost = min(timeit.repeat(compiled, number=5, repeat=3)) / 5
+        reference_us = reference_cost / lookups * 1e6
+        compiled_us = compiled_cost / lookups * 1e6
+        record_property("reference_us_per_lookup", round(reference_us, 3))
+        record_property("compiled_us_per_lookup", round(compiled_us, 3))
+
+        assert compiled_cost < reference_cost, (
+            f"per lookup: reference {reference_us:.3f} us, "
+            f"compiled {compiled_us:.3f} us"
+        )
@@ -0,0 +1,125 @@
+"""Tests for the cheapest/most expensive price window engine."""
+
+from datetime import UTC, date, datetime, timedelta
+
+import pytest
+
+from custom_components.energy_hub_poland.final_prices import FinalPrices
+from custom_components.energy_hub_poland.tariffs import (
+    compile_fee_schedules,
+    compile_tariff_tables,
+)
+from custom_components.energy_hub_poland.windows import (
+    WINDOW_CHEAPEST,
+    WINDOW_MOST_EXPENSIVE,
+    PriceWindows,
+    window_response,
+)
+from tests.common import WARSAW
+
+DAY = date(2025, 1, 15)
+# Without fees and VAT final prices equal the market prices
+CONFIG = {"vat_rate": "0"}
+
+TODAY = dict.fromkeys(range(24), 0.5) | {3: 0.1, 4: 0.1, 18: 0.9, 19: 0.9}
+# Cheapest around midnight: 23:00 today and 00:00-01:00 tomorrow
+TOMORROW = dict.fromkeys(range(24), 0.5) | {0: 0.05, 1: 0.05, 20: 1.2}
+
+
+def _windows(today=TODAY, tomorrow=TOMORROW):
+    fees = compile_fee_schedules(CONFIG)
+    final = FinalPrices(["dynamic"], compile_tariff_tables(CONFIG), fees)
+    final.refresh({"today": dict(today), "tomorrow": dict(tomorrow)}, DAY)
+    return final, PriceWindows(final)
+
+
+def _local(day, hour, minute=0):
+    return datetime(2025, 1, day, hour, minute, tzinfo=WARSAW)
+
+
+class TestPriceWindows:
+    def test_cheapest_window_crosses_midnight(self):
+        today = TODAY | {23: 0.05}
+        _final, windows = _windows(today=today)
+
+        window = windows.find(3, WINDOW_CHEAPEST, _local(15, 12))
+
+        assert window["start"] == _local(15, 23)
+        assert window["end"] == _local(16, 2)
+        assert window["average_price"] == pytest.approx(0.05)
+
+    def test_only_windows_from_current_slot(self):
+        _final, windows = _windows(tomorrow=dict.fromkeys(range(24), 0.5))
+
+        early = windows.find(2, WINDOW_CHEAPEST, _local(15, 0))
+        late = windows.find(2, WINDOW_CHEAPEST, _local(15, 3, 20))
+
+        assert early["start"] == _local(15, 3)
+        # The 03:00 window has started; the best one left starts at 03:15
+        assert late["start"] == _local(15, 3, 15)
+
+    def test_most_expensive_window(self):
+        _final, windows = _windows()
+
+        window = windows.find(1, WINDOW_MOST_EXPENSIVE, _local(15, 12))
+
+        assert window["start"] == _local(16, 20)
+        assert window["average_price"] == pytest.approx(1.2)
+
+    def test_quarter_hour_lengths(self):
+        _final, windows = _windows()
+
+        window = windows.find(0.5, WINDOW_MOST_EXPENSIVE, _local(15, 0))
+
+        assert window["end"] - window["start"] == timedelta(minutes=30)
+        assert window["start"] == _local(16, 20)
+
+    def test_windows_skip_missing_prices(self):
+        _final, windows = _windows(tomorrow={})
+
+        assert windows.find(2, WINDOW_MOST_EXPENSIVE, _local(15, 0))["start"] == (
+            _local(15, 18)
+        )
+        assert windows.find(2, WINDOW_CHEAPEST, _local(15, 23)) is None
+        assert windows.find(0, WINDOW_CHEAPEST, _local(15, 0)) is None
+
+    def test_recomputed_only_when_prices_change(self):
+        final, windows = _windows()
+        windows.find(3, WINDOW_CHEAPEST, _local(15, 0))
+        best = windows._best[(12, WINDOW_CHEAPEST)]
+
+        windows.find(3, WINDOW_CHEAPEST, _local(15, 10))
+        assert windows._best[(12, WINDOW_CHEAPEST)] is best
+
+        final.refresh({"today": TODAY | {10: 0.0}, "tomorrow": dict(TOMORROW)}, DAY)
+        window = windows.find(1, WINDOW_CHEAPEST, _local(15, 0))
+
+        assert window["start"] == _local(15, 10)
+        assert (12, WINDOW_CHEAPEST) not in windows._best
+
+    def test_unknown_kind(self):
+        _final, windows = _windows()
+
+        with pytest.raises(ValueError):
+            windows.find(1, "median", _local(15, 0))
+
+
+class TestWindowResponse:
+    def test_serializes_window(self):
+        start = datetime(2025, 1, 15, 22, tzinfo=UTC)
+        response = window_response(
+            {
+                "start": start,
+                "end": start + timedelta(hours=3),
+                "average_price": 0.123456,
+            }
+        )
+
+        assert response == {
+            "start": "2025-01-15T22:00:00+00:00",
+            "end": "2025-01-16T01:00:00+00:00",
+            "average_price": 0.1235,
+        }
+
+    def test_no_window(self):
+        assert window_response(None)["start"] is None